@@ -0,0 +1,199 @@
+"""
+In-process prefix index of beers for autocomplete.
+
+Words of beer, brewery and style names are kept in a sorted list, a prefix lookup is a binary search,
+so queries are answered from memory without touching the database.
+
+Index is built at startup (`core.asgi`, `core.wsgi`) in a background thread, or on first use if it is not ready yet,
+and updated incrementally by `beers.signals` in the process which changed a beer.
+Other processes (workers) notice the change by the generation of the catalogue cache (`beers.cache`)
+and rebuild their index in a background thread, queries are answered from the previous index in the meantime.
+"""
+import bisect
+import heapq
+import threading
+import time
+from collections.abc import Iterable
+from typing import TypedDict
+
+from django.db import connection
+
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
+from beers.models import Beer
+from core.shared.cache import get_cache_generation
+
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+# catalogue generation is stored in the shared cache (Redis), it is not read on every keystroke
+GENERATION_CHECK_INTERVAL_SECONDS = 1
+
+
+class AutocompleteEntry(TypedDict):
+    id: int
+    name: str
+    brewery: str | None
+    style: str | None
+
+
+def tokenize(*texts: str | None) -> set[str]:
+    return {word for text in texts if text for word in text.lower().split()}
+
+
+class BeerPrefixIndex:
+
+    def __init__(self):
+        self._entries: dict[int, AutocompleteEntry] = {}
+        # sorted (token, beer id) pairs
+        self._tokens: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+        self.generation: int | None = None
+        self._generation_checked_at = 0.0
+        self._rebuilding = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_built(self) -> bool:
+        return self.generation is not None
+
+    @staticmethod
+    def get_entries(beer_ids: Iterable[int] | None = None) -> list[AutocompleteEntry]:
+        beers = Beer.objects.all()
+        if beer_ids is not None:
+            beers = beers.filter(pk__in=beer_ids)
+
+        return [
+            AutocompleteEntry(id=beer_id, name=name, brewery=brewery, style=style)
+            for beer_id, name, brewery, style in beers.values_list('pk', 'name', 'brewery__name', 'style__name')
+        ]
+
+    @staticmethod
+    def get_entry_tokens(entry: AutocompleteEntry) -> set[str]:
+        return tokenize(entry['name'], entry['brewery'], entry['style'])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries, self._tokens = {}, []
+            self.generation = None
+
+    def build(self) -> None:
+        # generation is read first, changes made while the index is loading cause another rebuild
+        generation = get_cache_generation(CATALOGUE_CACHE_NAMESPACE)
+        entries = {entry['id']: entry for entry in self.get_entries()}
+        tokens = sorted(
+            (token, beer_id)
+            for beer_id, entry in entries.items()
+            for token in self.get_entry_tokens(entry)
+        )
+
+        with self._lock:
+            self._entries, self._tokens = entries, tokens
+            self.generation = generation
+            self._generation_checked_at = time.monotonic()
+
+    def build_in_background(self) -> None:
+        """Rebuilds the index in a daemon thread, unless it is being rebuilt already."""
+
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        threading.Thread(target=self._rebuild, name='beers-autocomplete-build', daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            self.build()
+        finally:
+            self._rebuilding = False
+            # thread has its own database connection, it would not be closed by the request cycle
+            connection.close()
+
+    def update(self, beer_ids: Iterable[int]) -> None:
+        """Reloads given beers, beers which no longer exist are removed from the index."""
+
+        if not self.is_built:
+            return
+
+        beer_ids = set(beer_ids)
+        entries = {entry['id']: entry for entry in self.get_entries(beer_ids)}
+
+        with self._lock:
+            for beer_id in beer_ids:
+                self._remove(beer_id)
+
+            for beer_id, entry in entries.items():
+                self._entries[beer_id] = entry
+                for token in self.get_entry_tokens(entry):
+                    bisect.insort(self._tokens, (token, beer_id))
+
+            # catalogue generation was bumped by this change, the index is up-to-date with it
+            self.generation = get_cache_generation(CATALOGUE_CACHE_NAMESPACE)
+
+    def is_stale(self) -> bool:
+        if not self.is_built:
+            return True
+
+        if time.monotonic() - self._generation_checked_at < GENERATION_CHECK_INTERVAL_SECONDS:
+            return False
+
+        self._generation_checked_at = time.monotonic()
+        return self.generation != get_cache_generation(CATALOGUE_CACHE_NAMESPACE)
+
+    def _remove(self, beer_id: int) -> None:
+        entry = self._entries.pop(beer_id, None)
+        if entry is None:
+            return
+
+        for token in self.get_entry_tokens(entry):
+            index = bisect.bisect_left(self._tokens, (token, beer_id))
+            if index < len(self._tokens) and self._tokens[index] == (token, beer_id):
+                del self._tokens[index]
+
+    def _match_prefix(self, prefix: str) -> set[int]:
+        index = bisect.bisect_left(self._tokens, (prefix,))
+        matched = set()
+
+        # tokens are walked in place, slicing would copy the whole tail of the list on every query
+        while index < len(self._tokens) and self._tokens[index][0].startswith(prefix):
+            matched.add(self._tokens[index][1])
+            index += 1
+
+        return matched
+
+    def search(self, query: str, limit: int = AUTOCOMPLETE_DEFAULT_LIMIT) -> list[AutocompleteEntry]:
+        """
+        Returns beers having a word starting with every word of the query.
+        Beers whose name starts with the query come first, then alphabetically by name.
+        """
+
+        terms = sorted(tokenize(query), key=len, reverse=True)
+        if not terms:
+            return []
+
+        if not self.is_built:
+            self.build()
+        elif self.is_stale():
+            self.build_in_background()
+
+        with self._lock:
+            # the longest term is the most selective one
+            matched = self._match_prefix(terms[0])
+            for term in terms[1:]:
+                if not matched:
+                    break
+                matched &= self._match_prefix(term)
+
+            entries = [self._entries[beer_id] for beer_id in matched]
+
+        query = query.strip().lower()
+        return heapq.nsmallest(
+            limit,
+            entries,
+            key=lambda entry: (not entry['name'].lower().startswith(query), entry['name'].lower(), entry['id'])
+        )
+
+
+beers_autocomplete_index = BeerPrefixIndex()
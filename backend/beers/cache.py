@@ -0,0 +1,8 @@
+from core.shared.cache import bump_cache_generation_on_commit
+
+# beers, breweries, hops and styles are nested in each other's responses, they share a single generation
+CATALOGUE_CACHE_NAMESPACE = 'catalogue'
+
+
+def invalidate_catalogue_cache() -> None:
+    bump_cache_generation_on_commit(CATALOGUE_CACHE_NAMESPACE)
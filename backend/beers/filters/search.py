@@ -0,0 +1,28 @@
+from django.db.models import QuerySet, Q
+from rest_framework.filters import SearchFilter
+
+from beers.search import search_beers
+
+
+class BeerSearchFilter(SearchFilter):
+    """
+    `?search=` backed by the search document of beers (`beers.search`), instead of `icontains` on joined columns.
+
+    Views may set `search_beer_prefix` (path to the beer, e.g. `'beer__'`) and implement
+    `get_extra_search_conditions(query)` to match rows by their own fields as well.
+    """
+
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        query = ' '.join(self.get_search_terms(request))
+        if not query:
+            return queryset
+
+        get_extra_search_conditions = getattr(view, 'get_extra_search_conditions', None)
+        extra_conditions: Q | None = get_extra_search_conditions(query) if get_extra_search_conditions else None
+
+        return search_beers(
+            queryset,
+            query,
+            prefix=getattr(view, 'search_beer_prefix', ''),
+            extra_conditions=extra_conditions,
+        )
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from core.shared.operations import PostgresAddIndex
+
+
+def fill_search_documents(apps, schema_editor):
+    Beer = apps.get_model('beers', 'Beer')
+
+    beers = Beer.objects.select_related('brewery', 'style').prefetch_related('hops')
+    to_update = []
+
+    for beer in beers.iterator(chunk_size=500):
+        names = [
+            beer.name,
+            beer.brewery.name if beer.brewery else None,
+            beer.style.name if beer.style else None,
+            *sorted(hop.name for hop in beer.hops.all()),
+        ]
+        beer.search_document = ' '.join(name.strip() for name in names if name and name.strip())
+        to_update.append(beer)
+
+    Beer.objects.bulk_update(to_update, ['search_document'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0007_alter_hop_options_alter_hop_country'),
+    ]
+
+    operations = [
+        # no-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='beer',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        PostgresAddIndex(
+            model_name='beer',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector('search_document', config='simple'),
+                name='beer_search_document_fts'
+            ),
+        ),
+        PostgresAddIndex(
+            model_name='beer',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_document'],
+                name='beer_search_document_trgm',
+                opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
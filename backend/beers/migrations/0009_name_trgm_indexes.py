@@ -0,0 +1,44 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from core.shared.operations import PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0008_beer_search_document'),
+    ]
+
+    operations = [
+        # pg_trgm extension is created by 0008_beer_search_document
+        PostgresAddIndex(
+            model_name='beer',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'),
+                name='beer_name_trgm'
+            ),
+        ),
+        PostgresAddIndex(
+            model_name='beerstyle',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'),
+                name='beer_style_name_trgm'
+            ),
+        ),
+        PostgresAddIndex(
+            model_name='brewery',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'),
+                name='brewery_name_trgm'
+            ),
+        ),
+        PostgresAddIndex(
+            model_name='hop',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'),
+                name='hop_name_trgm'
+            ),
+        ),
+    ]
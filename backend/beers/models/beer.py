@@ -1,7 +1,10 @@
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.crypto import get_random_string
 from django.utils.text import slugify
 
@@ -59,9 +62,26 @@ class Beer(models.Model):
         related_name='beers',
         blank=True
     )
+    # names of the beer, its brewery, style and hops, kept up to date by `beers.signals`
+    search_document = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                SearchVector('search_document', config='simple'),
+                name='beer_search_document_fts',
+            ),
+            GinIndex(
+                fields=['search_document'],
+                opclasses=['gin_trgm_ops'],
+                name='beer_search_document_trgm',
+            ),
+            # `icontains` filters of `BeerFilterSet` compare `UPPER(name)`, the index covers the same expression
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='beer_name_trgm'),
+        ]
+
     def __str__(self) -> str:
         to_str = f"{self.name} {self.percentage}% {self.volume_ml}ml"
         if self.brewery:
@@ -1,5 +1,7 @@
 from django.contrib.postgres.fields import DecimalRangeField, IntegerRangeField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 
@@ -45,6 +47,9 @@ class BeerStyle(models.Model):
     class Meta:
         verbose_name = _("Beer Style")
         verbose_name_plural = _("Beer Styles")
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='beer_style_name_trgm'),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.text import slugify
@@ -46,6 +48,9 @@ class Brewery(models.Model):
     class Meta:
         verbose_name = _('Brewery')
         verbose_name_plural = _('Breweries')
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='brewery_name_trgm'),
+        ]
 
     def __str__(self) -> str:
         return f"Browar {self.name}"
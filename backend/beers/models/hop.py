@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 
@@ -13,6 +15,9 @@ class Hop(models.Model):
     class Meta:
         verbose_name = _('Hop')
         verbose_name_plural = _('Hops')
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='hop_name_trgm'),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,108 @@
+"""
+Full-text and trigram search of beers.
+
+Every beer holds a denormalized `search_document` with names of the beer, its brewery, style and hops,
+so a single column (covered by GIN indexes on PostgreSQL) is searched instead of four joined ones.
+
+PostgreSQL: words are matched with a full-text query, typos and partial words with `pg_trgm` word similarity,
+results are ranked by both. Other databases (SQLite in tests) fall back to `icontains` on every search term.
+"""
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import QuerySet, Q, F
+
+from beers.models import Beer
+
+SEARCH_CONFIG = 'simple'
+
+
+def is_full_text_search_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def build_search_document(*names: str | None) -> str:
+    return ' '.join(name.strip() for name in names if name and name.strip())
+
+
+def get_search_documents(beer_ids: Iterable[int]) -> dict[int, str]:
+    """Builds search documents of given beers with two queries."""
+
+    beers = Beer.objects.filter(pk__in=beer_ids).values_list('pk', 'name', 'brewery__name', 'style__name')
+    hops = Beer.hops.through.objects.filter(beer_id__in=beer_ids).values_list('beer_id', 'hop__name')
+
+    hops_names = defaultdict(list)
+    for beer_id, hop_name in hops:
+        hops_names[beer_id].append(hop_name)
+
+    return {
+        beer_id: build_search_document(name, brewery_name, style_name, *sorted(hops_names[beer_id]))
+        for beer_id, name, brewery_name, style_name in beers
+    }
+
+
+def refresh_search_documents(beer_ids: Iterable[int]) -> int:
+    """Updates outdated search documents of given beers. Returns number of updated beers."""
+
+    beer_ids = set(beer_ids)
+    if not beer_ids:
+        return 0
+
+    documents = get_search_documents(beer_ids)
+    current = dict(Beer.objects.filter(pk__in=documents).values_list('pk', 'search_document'))
+
+    # `updated_at` is not touched, search document is not a part of the API
+    to_update = [
+        Beer(pk=beer_id, search_document=document)
+        for beer_id, document in documents.items()
+        if current.get(beer_id) != document
+    ]
+    return Beer.objects.bulk_update(to_update, ['search_document'])
+
+
+def search_beers(
+    queryset: QuerySet[Beer],
+    query: str,
+    prefix: str = '',
+    extra_conditions: Q | None = None,
+) -> QuerySet:
+    """
+    Filters queryset of beers (or of models related to beers, e.g. ratings, using `prefix='beer__'`)
+    by the search query. Rows matching `extra_conditions` are included as well.
+    On PostgreSQL, results are annotated with `search_rank` and ordered by it.
+    """
+
+    query = query.strip()
+    if not query:
+        return queryset
+
+    field = f'{prefix}search_document'
+
+    if not is_full_text_search_supported():
+        conditions = Q()
+        for term in query.split():
+            conditions &= Q(**{f'{field}__icontains': term})
+        return queryset.filter(conditions | (extra_conditions or Q(pk__in=[])))
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    # same expression as the one of `beer_search_document_fts` index
+    search_vector = SearchVector(field, config=SEARCH_CONFIG)
+
+    return queryset.annotate(
+        search_vector=search_vector,
+        search_similarity=TrigramWordSimilarity(query, field),
+    ).filter(
+        Q(search_vector=search_query) |
+        # `%>` operator (`pg_trgm.word_similarity_threshold`) uses `beer_search_document_trgm` index
+        Q(**{f'{field}__trigram_word_similar': query}) |
+        (extra_conditions or Q(pk__in=[]))
+    ).annotate(
+        search_rank=SearchRank(search_vector, search_query) + F('search_similarity'),
+    ).order_by('-search_rank', *queryset.query.order_by)
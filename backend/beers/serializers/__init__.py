@@ -17,3 +17,6 @@ from .brewery import (
 from .hop import (
     HopSerializer, EmbeddedHopsSerializer
 )
+from .autocomplete import (
+    BeerAutocompleteQueryParamsSerializer, BeerAutocompleteSerializer
+)
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from beers.autocomplete import AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT
+
+
+class BeerAutocompleteQueryParamsSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, trim_whitespace=True, allow_blank=True)
+    limit = serializers.IntegerField(min_value=1, max_value=AUTOCOMPLETE_MAX_LIMIT, default=AUTOCOMPLETE_DEFAULT_LIMIT)
+
+
+class BeerAutocompleteSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    brewery = serializers.CharField(allow_null=True)
+    style = serializers.CharField(allow_null=True)
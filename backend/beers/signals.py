@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from beers.autocomplete import beers_autocomplete_index
+from beers.cache import invalidate_catalogue_cache
+from beers.models import Beer, Brewery, Hop, BeerStyle
+from beers.search import refresh_search_documents
+
+
+@receiver(post_save, sender=Beer)
+@receiver(post_delete, sender=Beer)
+@receiver(post_save, sender=Brewery)
+@receiver(post_delete, sender=Brewery)
+@receiver(post_save, sender=Hop)
+@receiver(post_delete, sender=Hop)
+@receiver(post_save, sender=BeerStyle)
+@receiver(post_delete, sender=BeerStyle)
+def invalidate_catalogue_cache_on_change(sender, **kwargs):
+    invalidate_catalogue_cache()
+
+
+@receiver(m2m_changed, sender=Beer.hops.through)
+def invalidate_catalogue_cache_on_hops_change(sender, action: str, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_catalogue_cache()
+
+
+@receiver(post_save, sender=Beer)
+def refresh_search_document_on_beer_save(sender, instance: Beer, **kwargs):
+    refresh_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=Brewery)
+@receiver(post_save, sender=Hop)
+@receiver(post_save, sender=BeerStyle)
+def refresh_search_documents_on_name_change(sender, instance, created: bool, **kwargs):
+    # beers with outdated documents only are updated, other changes cost a single query
+    if not created:
+        refresh_search_documents(instance.beers.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Brewery)
+@receiver(pre_delete, sender=Hop)
+@receiver(pre_delete, sender=BeerStyle)
+def collect_beers_before_delete(sender, instance, **kwargs):
+    # relations are gone after the delete, affected beers have to be remembered beforehand
+    instance._search_beer_ids = list(instance.beers.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Brewery)
+@receiver(post_delete, sender=Hop)
+@receiver(post_delete, sender=BeerStyle)
+def refresh_search_documents_on_delete(sender, instance, **kwargs):
+    refresh_search_documents(getattr(instance, '_search_beer_ids', []))
+
+
+@receiver(m2m_changed, sender=Beer.hops.through)
+def refresh_search_documents_on_hops_change(sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    # forward relation: `beer.hops.add(...)`, instance is the beer
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_search_documents([instance.pk])
+        return
+
+    # reverse relation: `hop.beers.add(...)`, pk_set holds ids of beers, it is empty on `clear()`
+    if action == 'pre_clear':
+        instance._search_beer_ids = list(instance.beers.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        refresh_search_documents(getattr(instance, '_search_beer_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        refresh_search_documents(pk_set or [])
+
+
+@receiver(m2m_changed, sender=Beer.hops.through)
+def touch_beers_on_hops_change(sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    # hops are a part of the representation of beers, validators of conditional requests rely on `updated_at`
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        beer_ids = [instance.pk]
+    elif action == 'post_clear':
+        # collected by `refresh_search_documents_on_hops_change` before relations were cleared
+        beer_ids = getattr(instance, '_search_beer_ids', [])
+    else:
+        beer_ids = pk_set or []
+
+    Beer.objects.filter(pk__in=beer_ids).update(updated_at=timezone.now())
+
+
+def update_autocomplete_index_on_commit(beer_ids: list[int]) -> None:
+    # registered after `invalidate_catalogue_cache_on_change`, catalogue generation is already bumped when it runs
+    transaction.on_commit(lambda: beers_autocomplete_index.update(beer_ids), robust=True)
+
+
+@receiver(post_save, sender=Beer)
+@receiver(post_delete, sender=Beer)
+def update_autocomplete_index_on_beer_change(sender, instance: Beer, **kwargs):
+    update_autocomplete_index_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Brewery)
+@receiver(post_save, sender=BeerStyle)
+def update_autocomplete_index_on_name_change(sender, instance, created: bool, **kwargs):
+    if not created:
+        update_autocomplete_index_on_commit(list(instance.beers.values_list('pk', flat=True)))
+
+
+@receiver(post_delete, sender=Brewery)
+@receiver(post_delete, sender=BeerStyle)
+def update_autocomplete_index_on_delete(sender, instance, **kwargs):
+    update_autocomplete_index_on_commit(getattr(instance, '_search_beer_ids', []))
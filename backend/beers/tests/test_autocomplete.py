@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework import status
+
+from beers.autocomplete import beers_autocomplete_index
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
+from beers.models import Beer, Brewery
+from core.shared.cache import bump_cache_generation
+from core.shared.unit_tests import APITestCase
+
+
+class BeerAutocompleteTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.brewery = Brewery.objects.create(name='Pinta')
+        cls.atak = Beer.objects.create(name='Atak Chmielu', brewery=cls.brewery, percentage=6.1, volume_ml=500)
+        cls.hoppy = Beer.objects.create(name='Hoppy Lager', brewery=cls.brewery, percentage=5, volume_ml=500)
+        cls.zissou = Beer.objects.create(name='Zissou APA', percentage=5, volume_ml=500)
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        beers_autocomplete_index.clear()
+
+    def autocomplete(self, query: str, **params) -> list[int]:
+        response = self.client.get('/api/beers/autocomplete/', {'q': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [beer['id'] for beer in response.json()]
+
+    def test_autocomplete_by_prefix(self):
+        self.assertEqual(self.autocomplete('at'), [self.atak.id])
+        self.assertEqual(self.autocomplete('PIN'), [self.atak.id, self.hoppy.id])
+        self.assertEqual(self.autocomplete('pinta hop'), [self.hoppy.id])
+        self.assertEqual(self.autocomplete('pinta zis'), [])
+        self.assertEqual(self.autocomplete(''), [])
+
+    def test_autocomplete_orders_name_matches_first(self):
+        beer = Beer.objects.create(name='Pinta Pils', percentage=5, volume_ml=500)
+
+        self.assertEqual(self.autocomplete('pinta'), [beer.id, self.atak.id, self.hoppy.id])
+        self.assertEqual(self.autocomplete('pinta', limit=1), [beer.id])
+
+    def test_autocomplete_does_not_query_database(self):
+        self.autocomplete('at')
+
+        with self.assertNumQueries(0):
+            self.autocomplete('hop')
+
+    def test_index_is_updated_on_change(self):
+        self.autocomplete('at')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            beer = Beer.objects.create(name='Atak Tropików', percentage=5, volume_ml=500)
+        self.assertEqual(self.autocomplete('atak'), [self.atak.id, beer.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            beer.name = 'Tropiki'
+            beer.save()
+        self.assertEqual(self.autocomplete('atak'), [self.atak.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.brewery.name = 'Browar Pinta'
+            self.brewery.save()
+        self.assertEqual(self.autocomplete('browar'), [self.atak.id, self.hoppy.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.atak.delete()
+        self.assertEqual(self.autocomplete('browar'), [self.hoppy.id])
+
+    def test_index_is_rebuilt_when_changed_by_other_process(self):
+        self.autocomplete('at')
+        # changes made by other workers are not seen by local signals
+        Beer.objects.filter(pk=self.zissou.pk).update(name='Atak Zissou')
+        bump_cache_generation(CATALOGUE_CACHE_NAMESPACE)
+
+        with (
+            mock.patch('beers.autocomplete.GENERATION_CHECK_INTERVAL_SECONDS', 0),
+            mock.patch.object(beers_autocomplete_index, 'build_in_background') as build_in_background,
+        ):
+            # previous index answers queries until it is rebuilt off the request path
+            self.assertEqual(self.autocomplete('atak'), [self.atak.id])
+        build_in_background.assert_called_once_with()
+
+        beers_autocomplete_index.build()
+        self.assertEqual(self.autocomplete('atak'), [self.atak.id, self.zissou.id])
+
+    def test_index_is_rebuilt_once_at_a_time(self):
+        with (
+            mock.patch.object(beers_autocomplete_index, '_rebuilding', False),
+            mock.patch('beers.autocomplete.threading.Thread') as thread,
+        ):
+            beers_autocomplete_index.build_in_background()
+            beers_autocomplete_index.build_in_background()
+        thread.assert_called_once()
+
+    def test_invalid_limit(self):
+        response = self.client.get('/api/beers/autocomplete/', {'q': 'at', 'limit': 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
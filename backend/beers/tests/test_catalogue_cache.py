@@ -0,0 +1,96 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
+from beers.models import Beer, Brewery
+from core.shared.cache import get_cache_metrics
+from users.models import User
+
+
+class CatalogueCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.brewery = Brewery.objects.create(name='Pinta')
+        cls.beer = Beer.objects.create(name='Atak Chmielu', brewery=cls.brewery, percentage=6.1, volume_ml=500)
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        cache.clear()
+
+    def test_list_is_served_from_cache(self):
+        response = self.client.get('/api/beers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get('/api/beers/')
+
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response['X-Cache'], 'HIT')
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(get_cache_metrics(CATALOGUE_CACHE_NAMESPACE)['hits'], 1)
+
+    def test_cached_list_not_modified(self):
+        etag = self.client.get('/api/breweries/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/breweries/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_query_params_are_normalized(self):
+        self.client.get('/api/beers/?name=atak&page=1')
+
+        response = self.client.get('/api/beers/?page=1&name=atak')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        response = self.client.get('/api/beers/?page=1&name=maniac')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_cache_is_invalidated_on_change(self):
+        self.client.get('/api/beers/')
+        self.client.get('/api/breweries/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.brewery.name = 'Pinta Brewery'
+            self.brewery.save()
+
+        response = self.client.get('/api/beers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['brewery']['name'], 'Pinta Brewery')
+
+        response = self.client.get('/api/breweries/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beer.delete()
+        self.assertEqual(self.client.get('/api/beers/').json()['results'], [])
+
+    def test_cache_is_invalidated_on_commit(self):
+        generation = get_cache_metrics(CATALOGUE_CACHE_NAMESPACE)['generation']
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.brewery.name = 'Pinta Brewery'
+            self.brewery.save()
+            # responses cached before the commit would keep the old data under the new generation
+            self.assertEqual(get_cache_metrics(CATALOGUE_CACHE_NAMESPACE)['generation'], generation)
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_cache_metrics(CATALOGUE_CACHE_NAMESPACE)['generation'], generation)
+
+    def test_cache_metrics(self):
+        self.client.get('/api/breweries/')
+        self.client.get('/api/breweries/')
+
+        admin = User.objects.create_superuser(username='admin', password='!@#$%')
+        self.client.force_authenticate(admin)
+
+        response = self.client.get('/api/statistics/cache/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[CATALOGUE_CACHE_NAMESPACE]['hits'], 1)
+        self.assertEqual(response.data[CATALOGUE_CACHE_NAMESPACE]['misses'], 1)
+        self.assertEqual(set(response.data['rating_autosave']), {'received', 'written', 'absorbed'})
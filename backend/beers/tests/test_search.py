@@ -0,0 +1,85 @@
+from django.test import TestCase
+from rest_framework import status
+
+from beers.models import Beer, Brewery, Hop
+from beers.search import search_beers, refresh_search_documents
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+from rooms.models import Room
+
+
+class SearchDocumentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.brewery = Brewery.objects.create(name='Pinta')
+        cls.hop = Hop.objects.create(name='Simcoe', country='USA')
+        cls.beer = Beer.objects.create(name='Atak Chmielu', brewery=cls.brewery, percentage=6.1, volume_ml=500)
+
+    def get_document(self) -> str:
+        return Beer.objects.values_list('search_document', flat=True).get(pk=self.beer.pk)
+
+    def test_document_is_built_on_save(self):
+        self.assertEqual(self.get_document(), 'Atak Chmielu Pinta')
+
+    def test_document_follows_hops(self):
+        self.beer.hops.add(self.hop)
+        self.assertEqual(self.get_document(), 'Atak Chmielu Pinta Simcoe')
+
+        self.hop.name = 'Citra'
+        self.hop.save()
+        self.assertEqual(self.get_document(), 'Atak Chmielu Pinta Citra')
+
+        self.hop.beers.clear()
+        self.assertEqual(self.get_document(), 'Atak Chmielu Pinta')
+
+    def test_document_follows_brewery(self):
+        self.brewery.name = 'Browar Pinta'
+        self.brewery.save()
+        self.assertEqual(self.get_document(), 'Atak Chmielu Browar Pinta')
+
+        self.brewery.delete()
+        self.assertEqual(self.get_document(), 'Atak Chmielu')
+
+    def test_refresh_updates_outdated_documents_only(self):
+        Beer.objects.filter(pk=self.beer.pk).update(search_document='')
+
+        self.assertEqual(refresh_search_documents([self.beer.pk]), 1)
+        self.assertEqual(refresh_search_documents([self.beer.pk]), 0)
+        self.assertEqual(self.get_document(), 'Atak Chmielu Pinta')
+
+    def test_search_matches_all_terms(self):
+        other = Beer.objects.create(name='Atak Tr0pików', percentage=5, volume_ml=500)
+
+        self.assertCountEqual(search_beers(Beer.objects.all(), 'atak'), [self.beer, other])
+        self.assertCountEqual(search_beers(Beer.objects.all(), 'atak pinta'), [self.beer])
+        self.assertCountEqual(search_beers(Beer.objects.all(), '  '), [self.beer, other])
+
+
+class SearchAPITests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        brewery = Brewery.objects.create(name='Pinta')
+        cls.beer = Beer.objects.create(name='Atak Chmielu', brewery=brewery, percentage=6.1, volume_ml=500)
+        cls.other_beer = Beer.objects.create(name='Zissou APA', percentage=5, volume_ml=500)
+        cls.room = Room.objects.create(name='degustacja', host=cls.user)
+        cls.rating = Rating.objects.create(added_by=cls.user, beer=cls.beer, note=8)
+        cls.room_rating = Rating.objects.create(added_by=cls.user, beer=cls.other_beer, room=cls.room, note=6)
+
+    def test_search_beers(self):
+        response = self.client.get('/api/beers/', {'search': 'pinta'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([beer['id'] for beer in response.json()['results']], [self.beer.id])
+
+    def test_search_ratings(self):
+        self._require_login_and_auth()
+
+        response = self.client.get('/api/ratings/', {'search': 'chmielu'})
+        self.assertEqual([rating['id'] for rating in response.json()['results']], [self.rating.id])
+
+        # ratings are matched by the name of their room as well
+        response = self.client.get('/api/ratings/', {'search': 'degust'})
+        self.assertEqual([rating['id'] for rating in response.json()['results']], [self.room_rating.id])
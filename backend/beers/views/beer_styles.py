@@ -4,18 +4,23 @@ from rest_framework import viewsets, mixins
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
 from beers.filters.beer_styles import BeerStylesFilterSet
 from beers.models import BeerStyle
 from beers.serializers import (
     BeerStyleListSerializer,
     BeerStyleDetailSerializer
 )
+from core.shared.cache import CachedListMixin
+from core.shared.conditional import ConditionalResponseMixin
 from core.shared.pagination import page_number_pagination_factory
 
 BeerStylesPagination = page_number_pagination_factory(page_size=100)
 
 
 class BeerStylesViewSet(
+    CachedListMixin,
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
@@ -26,6 +31,7 @@ class BeerStylesViewSet(
     GET     /api/styles/<int:id>/   - retrieve beer style
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = CATALOGUE_CACHE_NAMESPACE
     pagination_class = BeerStylesPagination
     filter_backends = [SearchFilter, DjangoFilterBackend]
     filterset_class = BeerStylesFilterSet
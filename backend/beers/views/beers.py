@@ -1,22 +1,42 @@
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Aggregate, Max, Count
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, mixins
-from rest_framework.filters import SearchFilter, OrderingFilter
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from beers.autocomplete import beers_autocomplete_index
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
 from beers.filters.beers import BeerFilterSet
+from beers.filters.search import BeerSearchFilter
 from beers.models import Beer
 from beers.serializers import (
     BeerSerializer,
     BeerCreateSerializer,
     DetailedBeerSerializer,
+    BeerAutocompleteQueryParamsSerializer,
+    BeerAutocompleteSerializer,
+)
+from core.shared.cache import CachedListMixin
+from core.shared.conditional import ConditionalResponseMixin
+from core.shared.pagination import (
+    page_number_pagination_factory,
+    cursor_pagination_factory,
+    cursor_opt_in_pagination_factory,
 )
-from core.shared.pagination import page_number_pagination_factory
 
-BeersPagination = page_number_pagination_factory(page_size=30)
+BeersPagination = cursor_opt_in_pagination_factory(
+    page_number_pagination_factory(page_size=30, approximate_count=True),
+    cursor_pagination_factory(ordering='-id', page_size=30),
+)
 
 
 class BeersViewSet(
+    CachedListMixin,
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -25,15 +45,19 @@ class BeersViewSet(
     """
     GET     /api/beers/             - list all beers
 
+    GET     /api/beers/?cursor=     - list with cursor pagination, follow `next` links
+
     POST    /api/beers/             - create beer
 
     GET     /api/beers/<int:id>/    - retrieve beer
+
+    GET     /api/beers/autocomplete/?q= - suggest beers by name, brewery or style
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = CATALOGUE_CACHE_NAMESPACE
     pagination_class = BeersPagination
-    filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
+    filter_backends = [BeerSearchFilter, OrderingFilter, DjangoFilterBackend]
     filterset_class = BeerFilterSet
-    search_fields = ('name', 'brewery__name', 'style__name')
     ordering_fields = ('id', 'created_at', 'percentage')
 
     def get_queryset(self) -> QuerySet[Beer]:
@@ -43,6 +67,38 @@ class BeersViewSet(
             'hops'
         ).order_by('-id')
 
+    def get_conditional_aggregates(self) -> dict[str, Aggregate]:
+        return {
+            **super().get_conditional_aggregates(),
+            'brewery_last_modified': Max('brewery__updated_at'),
+            'style_last_modified': Max('style__updated_at'),
+            'hops_last_modified': Max('hops__updated_at'),
+            'hops_count': Count('hops'),
+        }
+
+    @extend_schema(
+        parameters=[BeerAutocompleteQueryParamsSerializer],
+        responses=BeerAutocompleteSerializer(many=True)
+    )
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request: Request) -> Response:
+        """
+        Suggests beers having words starting with every word of the query.
+        Served from the in-memory prefix index (`beers.autocomplete`), not from the database.
+
+        Query parameters:
+            - `q`       - search phrase
+            - `limit`   - max number of results (default 10, max 50)
+        """
+        serializer = BeerAutocompleteQueryParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        results = beers_autocomplete_index.search(
+            serializer.validated_data['q'],
+            limit=serializer.validated_data['limit']
+        )
+        return Response(results, status=status.HTTP_200_OK)
+
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return DetailedBeerSerializer
@@ -2,15 +2,20 @@ from django.db.models import QuerySet
 from rest_framework import filters, mixins, viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
 from beers.filters.breweries import BreweriesFilterSet
 from beers.models import Brewery
 from beers.serializers import BrewerySerializer
+from core.shared.cache import CachedListMixin
+from core.shared.conditional import ConditionalResponseMixin
 from core.shared.pagination import page_number_pagination_factory
 
 BreweriesPagination = page_number_pagination_factory(page_size=100)
 
 
 class BreweriesViewSet(
+    CachedListMixin,
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet,
@@ -20,6 +25,7 @@ class BreweriesViewSet(
     GET     /api/breweries/<int:id>/    - retrieve brewery
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = CATALOGUE_CACHE_NAMESPACE
     pagination_class = BreweriesPagination
     serializer_class = BrewerySerializer
     filter_backends = [filters.SearchFilter]
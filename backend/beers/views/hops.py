@@ -3,15 +3,20 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, mixins, filters
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
 from beers.filters.hops import HopsFilterSet
 from beers.models import Hop
 from beers.serializers import HopSerializer
+from core.shared.cache import CachedListMixin
+from core.shared.conditional import ConditionalResponseMixin
 from core.shared.pagination import page_number_pagination_factory
 
 HopsPagination = page_number_pagination_factory(page_size=100)
 
 
 class HopsViewSet(
+    CachedListMixin,
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet,
@@ -22,6 +27,7 @@ class HopsViewSet(
     GET     /api/hops/<int:id>/     - retrieve hop
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = CATALOGUE_CACHE_NAMESPACE
     pagination_class = HopsPagination
     serializer_class = HopSerializer
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
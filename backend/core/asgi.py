@@ -8,6 +8,7 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 
 from core.shared.websockets import CORSAllowedOriginValidator
 
+from beers.autocomplete import beers_autocomplete_index
 from rooms import routing
 from rooms.middleware import SesameTokenAuthMiddleware
 
@@ -23,3 +24,5 @@ application = ProtocolTypeRouter({
         )
     )
 })
+
+beers_autocomplete_index.build_in_background()
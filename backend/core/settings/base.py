@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     # django utils
     'django_extensions',
     'django_filters',
@@ -89,6 +90,8 @@ MIDDLEWARE = [
     # 'users.middleware.AccessCookieToAuthorizationHeaderMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # enabled in development only (`QUERY_INSPECTOR_ENABLED`, defaults to `DEBUG`)
+    'core.shared.queries.QueryInspectorMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
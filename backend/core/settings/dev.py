@@ -63,6 +63,9 @@ CACHES = {
     }
 }
 
+# events for resuming room websockets are shared by all processes, see `rooms.replay`
+ROOM_REPLAY_BUFFER_BACKEND = 'cache'
+
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
@@ -147,6 +147,9 @@ CACHES = {
     }
 }
 
+# events for resuming room websockets are shared by all processes, see `rooms.replay`
+ROOM_REPLAY_BUFFER_BACKEND = 'cache'
+
 # Django Channels config
 # https://channels.readthedocs.io/en/stable/deploying.html#setting-up-a-channel-backend
 
@@ -0,0 +1,150 @@
+"""
+Response cache of read-heavy list endpoints.
+
+Responses are cached in `CACHES['default']` under a key built from the namespace,
+its current generation, host and normalized query parameters (page included).
+Generation is bumped on every change of the underlying models (see `bump_cache_generation_on_commit`),
+which invalidates all cached responses of the namespace at once, without deleting any keys.
+"""
+import hashlib
+from typing import Any
+from urllib.parse import urlencode
+
+from django.core.cache import cache, caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+RESPONSE_CACHE_PREFIX = 'response_cache'
+RESPONSE_CACHE_TIMEOUT_SECONDS = 10 * 60
+
+CACHE_HIT = 'HIT'
+CACHE_MISS = 'MISS'
+
+# validators set by `ConditionalResponseMixin`, cached together with the data
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def get_cache_generation_key(namespace: str) -> str:
+    return f'{RESPONSE_CACHE_PREFIX}:{namespace}:generation'
+
+
+def get_cache_metrics_key(namespace: str, metric: str) -> str:
+    return f'{RESPONSE_CACHE_PREFIX}:{namespace}:metrics:{metric}'
+
+
+def get_cache_generation(namespace: str) -> int:
+    return cache.get_or_set(get_cache_generation_key(namespace), 1, timeout=None)
+
+
+def bump_cache_generation(namespace: str) -> None:
+    increment(get_cache_generation_key(namespace))
+
+
+def bump_cache_generation_on_commit(namespace: str) -> None:
+    """
+    Bump the generation once the current transaction is committed.
+    Bumped earlier, responses with the old data could be cached again by a concurrent request
+    under the new generation, and served until they expire.
+    """
+    transaction.on_commit(lambda: bump_cache_generation(namespace), robust=True)
+
+
+def increment(key: str) -> int:
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # missing key, `add` keeps the value set concurrently by someone else
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key)
+
+
+def delete_if_equal(key: str, value: int) -> bool:
+    """
+    Deletes the key only if it still holds the given value, e.g. a token of a lock held by the caller.
+    Atomic on Redis (integers are stored there as they are, so they can be compared by a script),
+    other backends (local memory in tests and development) compare and delete in two steps.
+    """
+    backend = caches[DEFAULT_CACHE_ALIAS]
+
+    if isinstance(backend, RedisCache):
+        client = backend._cache.get_client(key, write=True)
+        return bool(client.eval(COMPARE_AND_DELETE_SCRIPT, 1, backend.make_and_validate_key(key), value))
+
+    if backend.get(key) == value:
+        return backend.delete(key)
+    return False
+
+
+def get_cache_metrics(namespace: str) -> dict[str, int]:
+    hits_key = get_cache_metrics_key(namespace, 'hits')
+    misses_key = get_cache_metrics_key(namespace, 'misses')
+
+    metrics = cache.get_many([hits_key, misses_key])
+    return {
+        'hits': metrics.get(hits_key, 0),
+        'misses': metrics.get(misses_key, 0),
+        'generation': get_cache_generation(namespace),
+    }
+
+
+def normalize_query_params(request: Request) -> str:
+    """Query string with sorted parameters and values, so that `?a=1&b=2` and `?b=2&a=1` share a key."""
+    return urlencode(sorted(
+        (param, value)
+        for param, values in request.query_params.lists()
+        for value in values
+    ))
+
+
+class CachedListMixin:
+    """
+    Caches responses of the `list` action. Meant for public, rarely written endpoints,
+    which responses do not depend on the current user.
+
+    Set `cache_namespace` and bump its generation whenever data of the endpoint changes.
+    Validators of conditional requests are cached as well, cached responses are answered with 304 if they match.
+    """
+    cache_namespace: str = None
+    cache_timeout: int = RESPONSE_CACHE_TIMEOUT_SECONDS
+
+    def get_list_cache_key(self, request: Request) -> str:
+        params = normalize_query_params(request)
+        digest = hashlib.sha256(f'{request.get_host()}?{params}'.encode()).hexdigest()
+        generation = get_cache_generation(self.cache_namespace)
+        return f'{RESPONSE_CACHE_PREFIX}:{self.cache_namespace}:{generation}:{self.basename}:{digest}'
+
+    def list(self, request: Request, *args: Any, **kwargs: Any):
+        key = self.get_list_cache_key(request)
+
+        if (cached := cache.get(key)) is not None:
+            increment(get_cache_metrics_key(self.cache_namespace, 'hits'))
+            data, headers = cached
+            headers = {**headers, 'X-Cache': CACHE_HIT}
+
+            if (etag := headers.get('ETag')) and (not_modified := get_conditional_response(request, etag=etag)):
+                for header, value in headers.items():
+                    not_modified[header] = value
+                return not_modified
+
+            return Response(data, headers=headers)
+
+        increment(get_cache_metrics_key(self.cache_namespace, 'misses'))
+        response = super().list(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            headers = {header: response[header] for header in CACHED_HEADERS if header in response}
+            cache.set(key, (response.data, headers), timeout=self.cache_timeout)
+
+        response['X-Cache'] = CACHE_MISS
+        return response
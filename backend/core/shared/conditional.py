@@ -0,0 +1,87 @@
+"""
+Conditional GET support (ETag / Last-Modified) for list and retrieve actions of viewsets.
+
+Validators are computed with a single aggregate query over the filtered queryset
+(`Max('updated_at')` and `Count('pk')` by default), so that a matching `If-None-Match`
+is answered with 304 Not Modified before anything is fetched or serialized.
+"""
+import hashlib
+import json
+import datetime
+from typing import Any, Callable
+
+from django.db.models import Max, Count, QuerySet, Aggregate
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.request import Request
+
+from core.shared.cache import normalize_query_params
+
+
+class ConditionalResponseMixin:
+    """
+    Adds `ETag` and `Last-Modified` headers to responses of `list` and `retrieve` actions.
+
+    Override `get_conditional_aggregates` to include aggregates of related models,
+    which are part of the representation (e.g. `Max('brewery__updated_at')`).
+    """
+    last_modified_field = 'updated_at'
+
+    def get_conditional_aggregates(self) -> dict[str, Aggregate]:
+        return {
+            'last_modified': Max(self.last_modified_field),
+            # deletions do not change the latest modification time, they change the count
+            'count': Count('pk', distinct=True),
+        }
+
+    def get_conditional_queryset(self) -> QuerySet:
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        return queryset.order_by()
+
+    def get_validators(self, request: Request) -> tuple[str | None, datetime.datetime | None]:
+        aggregates = self.get_conditional_queryset().aggregate(**self.get_conditional_aggregates())
+
+        # missing object, let the action respond with 404
+        if self.action == 'retrieve' and not aggregates['count']:
+            return None, None
+
+        fingerprint = json.dumps([
+            self.action,
+            request.get_host(),
+            normalize_query_params(request),
+            request.user.pk,
+            aggregates,
+        ], default=str, sort_keys=True)
+
+        etag = f'W/"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+        return etag, aggregates['last_modified']
+
+    def get_conditional_response(self, handler: Callable, request: Request, *args: Any, **kwargs: Any):
+        etag, last_modified = self.get_validators(request)
+
+        # only ETag is evaluated, `If-Modified-Since` alone would not notice deleted objects
+        if etag and (not_modified := get_conditional_response(request, etag=etag)):
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response: HttpResponseBase = handler(request, *args, **kwargs)
+
+        if etag and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+
+        return response
+
+    def list(self, request: Request, *args: Any, **kwargs: Any):
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any):
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
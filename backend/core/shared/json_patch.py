@@ -0,0 +1,115 @@
+"""
+Minimal JSON Patch (RFC 6902) support - `add`, `remove` and `replace` operations.
+
+`make_patch` produces operations which turn one JSON document into another,
+`apply_patch` applies them (clients do the same on their copy of the document).
+Lists are compared element by element after their common prefix and suffix are skipped,
+so that appending or removing an item does not resend the whole list.
+"""
+import copy
+from typing import Any
+
+JSONPatch = list[dict[str, Any]]
+
+
+def escape_pointer_token(token: Any) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def unescape_pointer_token(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(source: Any, target: Any, path: str = '') -> JSONPatch:
+    if source == target:
+        return []
+
+    if isinstance(source, dict) and isinstance(target, dict):
+        return _make_dict_patch(source, target, path)
+
+    if isinstance(source, list) and isinstance(target, list):
+        return _make_list_patch(source, target, path)
+
+    return [{'op': 'replace', 'path': path, 'value': target}]
+
+
+def _make_dict_patch(source: dict, target: dict, path: str) -> JSONPatch:
+    operations = []
+
+    for key in source:
+        if key not in target:
+            operations.append({'op': 'remove', 'path': f'{path}/{escape_pointer_token(key)}'})
+
+    for key, value in target.items():
+        key_path = f'{path}/{escape_pointer_token(key)}'
+        if key not in source:
+            operations.append({'op': 'add', 'path': key_path, 'value': value})
+        else:
+            operations.extend(make_patch(source[key], value, key_path))
+
+    return operations
+
+
+def _make_list_patch(source: list, target: list, path: str) -> JSONPatch:
+    prefix = 0
+    while prefix < min(len(source), len(target)) and source[prefix] == target[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while (
+        suffix < min(len(source), len(target)) - prefix
+        and source[-suffix - 1] == target[-suffix - 1]
+    ):
+        suffix += 1
+
+    changed_source = source[prefix:len(source) - suffix]
+    changed_target = target[prefix:len(target) - suffix]
+
+    operations = []
+    common = min(len(changed_source), len(changed_target))
+    for index in range(common):
+        operations.extend(make_patch(changed_source[index], changed_target[index], f'{path}/{prefix + index}'))
+
+    # extra items are removed from the end, so that indexes of the preceding ones do not shift
+    for index in reversed(range(common, len(changed_source))):
+        operations.append({'op': 'remove', 'path': f'{path}/{prefix + index}'})
+
+    for index in range(common, len(changed_target)):
+        operations.append({'op': 'add', 'path': f'{path}/{prefix + index}', 'value': changed_target[index]})
+
+    return operations
+
+
+def apply_patch(document: Any, operations: JSONPatch) -> Any:
+    """Returns patched copy of the document, the original one is not modified."""
+
+    document = copy.deepcopy(document)
+
+    for operation in operations:
+        tokens = [unescape_pointer_token(token) for token in operation['path'].split('/')[1:]]
+        value = copy.deepcopy(operation.get('value'))
+
+        if not tokens:
+            # whole document is replaced
+            document = value
+            continue
+
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        key = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == '-' else int(key)
+            if operation['op'] == 'add':
+                parent.insert(index, value)
+            elif operation['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = value
+        elif operation['op'] == 'remove':
+            del parent[key]
+        else:
+            parent[key] = value
+
+    return document
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """
+    Adds index only on PostgreSQL (e.g. `GinIndex` on full-text or trigram expressions).
+    Project state is changed on every database, so models and migrations stay in sync
+    while SQLite databases (tests, local development) are migrated without the index.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -1,13 +1,149 @@
+import hashlib
+from functools import partial
 from typing import Type
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
+from django.db import connections
+from django.db.models import Model, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+
+from core.shared.cache import get_cache_generation
+
+APPROXIMATE_COUNT_CACHE_PREFIX = 'pagination:count'
+APPROXIMATE_COUNT_CACHE_TIMEOUT_SECONDS = 60
+
+# planner statistics are imprecise for small tables, these are counted exactly
+ESTIMATED_COUNT_MIN_ROWS = 10_000
+
+
+def get_estimated_count(model: Type[Model], using: str = 'default') -> int | None:
+    """Returns number of rows of the model's table estimated by PostgreSQL (`pg_class.reltuples`)."""
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+
+    # -1 if the table has never been vacuumed or analyzed
+    if row is None or row[0] < ESTIMATED_COUNT_MIN_ROWS:
+        return None
+
+    return int(row[0])
+
+
+def get_count_cache_key(queryset: QuerySet, namespace: str | None = None) -> str:
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f'{sql}:{params!r}'.encode()).hexdigest()
+
+    if namespace is None:
+        return f'{APPROXIMATE_COUNT_CACHE_PREFIX}:{digest}'
+
+    # counts of response cached lists are invalidated together with the responses
+    return f'{APPROXIMATE_COUNT_CACHE_PREFIX}:{namespace}:{get_cache_generation(namespace)}:{digest}'
+
+
+class ApproximatePage(Page):
+
+    def __init__(self, object_list, number: int, paginator: Paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator which does not run `COUNT(*)` on every request.
+    Unfiltered querysets of large tables are counted from planner statistics,
+    counts of filtered ones are cached for `APPROXIMATE_COUNT_CACHE_TIMEOUT_SECONDS`.
+
+    Pages are not bounded by an approximate count - one extra row is fetched to tell if the next page exists.
+    """
+
+    count_is_exact = True
+
+    def __init__(self, *args, cache_namespace: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_namespace = cache_namespace
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        if not queryset.query.where:
+            estimated_count = get_estimated_count(queryset.model, using=queryset.db)
+            if estimated_count is not None:
+                self.count_is_exact = False
+                return estimated_count
+
+        cache_key = get_count_cache_key(queryset, self.cache_namespace)
+        cached_count = cache.get(cache_key)
+        if cached_count is not None:
+            # rows could be added or removed since the count was cached
+            self.count_is_exact = False
+            return cached_count
+
+        count = queryset.count()
+        cache.set(cache_key, count, timeout=APPROXIMATE_COUNT_CACHE_TIMEOUT_SECONDS)
+        return count
+
+    def validate_number(self, number) -> int:
+        # count has to be resolved first, it tells whether the number of pages can be trusted
+        if self.count is not None and self.count_is_exact:
+            return super().validate_number(number)
+
+        # pages past the approximate number of pages may still exist, emptiness is checked in `page`
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+
+        return number
+
+    def page(self, number) -> Page:
+        number = self.validate_number(number)
+
+        if self.count_is_exact:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if not objects and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        return ApproximatePage(objects[:self.per_page], number, self, has_next=len(objects) > self.per_page)
 
 
 def page_number_pagination_factory(
     page_size: int = None,
     max_page_size: int = None,
-    page_size_query_param: str = "page_size"
+    page_size_query_param: str = "page_size",
+    approximate_count: bool = False,
 ) -> Type[PageNumberPagination]:
+    """
+    With `approximate_count`, counts come from `ApproximateCountPaginator`
+    and responses report whether the count is exact (`count_is_exact`).
+    """
+
     class PaginationClass(PageNumberPagination):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
@@ -15,6 +151,35 @@ def page_number_pagination_factory(
             self.max_page_size = max_page_size
             self.page_size_query_param = page_size_query_param
 
+        def paginate_queryset(self, queryset, request, view=None):
+            if approximate_count:
+                # namespace of `CachedListMixin` views
+                self.django_paginator_class = partial(
+                    ApproximateCountPaginator,
+                    cache_namespace=getattr(view, 'cache_namespace', None)
+                )
+
+            return super().paginate_queryset(queryset, request, view)
+
+        def get_paginated_response(self, data):
+            response = super().get_paginated_response(data)
+
+            if approximate_count:
+                response.data['count_is_exact'] = self.page.paginator.count_is_exact
+
+            return response
+
+        def get_paginated_response_schema(self, schema):
+            response_schema = super().get_paginated_response_schema(schema)
+
+            if approximate_count:
+                response_schema['properties']['count_is_exact'] = {
+                    'type': 'boolean',
+                    'example': True,
+                }
+
+            return response_schema
+
     return PaginationClass
 
 
@@ -23,8 +188,8 @@ def limit_offset_pagination_factory(
     max_limit: int = None,
     limit_query_param: str = "limit",
     offset_query_param: str = "offset"
-) -> Type[PageNumberPagination]:
-    class PaginationClass(PageNumberPagination):
+) -> Type[LimitOffsetPagination]:
+    class PaginationClass(LimitOffsetPagination):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.default_limit = default_limit
@@ -33,3 +198,88 @@ def limit_offset_pagination_factory(
             self.offset_query_param = offset_query_param
 
     return PaginationClass
+
+
+def cursor_pagination_factory(
+    ordering: str | tuple[str, ...] = ('-created_at', '-id'),
+    page_size: int = None,
+    max_page_size: int = None,
+    page_size_query_param: str = "page_size",
+    cursor_query_param: str = "cursor",
+) -> Type[CursorPagination]:
+    """
+    Keyset pagination - pages are filtered by the position of the last item (`WHERE created_at < ...`)
+    instead of `OFFSET`, and no `COUNT(*)` is run, so deep pages cost the same as the first one.
+
+    Ordering is fixed (`?ordering=` is ignored), it should be backed by an index and end with an unique field.
+    """
+
+    class PaginationClass(CursorPagination):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.ordering = ordering
+            self.page_size = page_size
+            self.max_page_size = max_page_size
+            self.page_size_query_param = page_size_query_param
+            self.cursor_query_param = cursor_query_param
+
+        def get_ordering(self, request, queryset, view) -> tuple[str, ...]:
+            # ordering filter of the view would be used otherwise
+            return (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+
+    return PaginationClass
+
+
+def cursor_opt_in_pagination_factory(
+    pagination_class: Type[BasePagination],
+    cursor_pagination_class: Type[CursorPagination],
+) -> Type[BasePagination]:
+    """
+    Uses `pagination_class` by default and `cursor_pagination_class` when the cursor query parameter
+    is present - existing clients keep page numbers, others opt in with `?cursor=` (empty for the first page)
+    and follow `next` / `previous` links.
+    """
+
+    class PaginationClass(BasePagination):
+        def __init__(self):
+            self.default_paginator = pagination_class()
+            self.cursor_paginator = cursor_pagination_class()
+            self.paginator = self.default_paginator
+
+        @property
+        def display_page_controls(self) -> bool:
+            return self.paginator.display_page_controls
+
+        def is_cursor_requested(self, request) -> bool:
+            return self.cursor_paginator.cursor_query_param in request.query_params
+
+        def paginate_queryset(self, queryset, request, view=None):
+            if self.is_cursor_requested(request):
+                self.paginator = self.cursor_paginator
+            else:
+                self.paginator = self.default_paginator
+
+            return self.paginator.paginate_queryset(queryset, request, view)
+
+        def get_paginated_response(self, data):
+            return self.paginator.get_paginated_response(data)
+
+        def get_paginated_response_schema(self, schema):
+            return self.default_paginator.get_paginated_response_schema(schema)
+
+        def to_html(self):
+            return self.paginator.to_html()
+
+        def get_results(self, data):
+            return self.paginator.get_results(data)
+
+        def get_schema_operation_parameters(self, view):
+            parameters = self.default_paginator.get_schema_operation_parameters(view)
+            names = {parameter['name'] for parameter in parameters}
+
+            return parameters + [
+                parameter for parameter in self.cursor_paginator.get_schema_operation_parameters(view)
+                if parameter['name'] not in names
+            ]
+
+    return PaginationClass
@@ -0,0 +1,124 @@
+"""
+Inspection of database queries: recording, fingerprinting and detection of N+1 patterns.
+
+Queries are recorded with `connection.execute_wrapper`, which works regardless of `DEBUG`.
+SQL is fingerprinted by replacing literals with placeholders, so that queries differing only
+by parameters (e.g. `WHERE room_id = 1`, `WHERE room_id = 2`) share a fingerprint.
+A fingerprint repeated `N_PLUS_ONE_THRESHOLD` times within a single request is reported as N+1.
+
+Used by `QueryInspectorMiddleware` (development) and `QueryBudgetMixin` (tests, see `core.shared.unit_tests`).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql: str) -> str:
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    duration: float
+    alias: str
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint_sql(self.sql)
+
+
+@dataclass
+class QueryRecorder:
+    """Context manager recording queries executed on all databases in the current thread."""
+
+    queries: list[RecordedQuery] = field(default_factory=list)
+
+    def __enter__(self) -> 'QueryRecorder':
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._wrapper(alias)))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def _wrapper(self, alias: str):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append(RecordedQuery(sql=sql, duration=time.perf_counter() - start, alias=alias))
+
+        return wrapper
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def get_repeated_queries(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """Returns fingerprints executed at least `threshold` times, most frequent first."""
+
+        counter = Counter(query.fingerprint for query in self.queries)
+        return [(fingerprint, count) for fingerprint, count in counter.most_common() if count >= threshold]
+
+
+class QueryInspectorMiddleware:
+    """
+    Records queries of every request and logs suspected N+1 patterns and requests exceeding the query budget.
+    Adds `X-Query-Count` and `X-Query-Duration` (ms) headers to responses.
+
+    Enabled with `QUERY_INSPECTOR_ENABLED` setting (defaults to `DEBUG`),
+    `QUERY_INSPECTOR_BUDGET` sets max number of queries per request (none by default).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', settings.DEBUG):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.budget: int | None = getattr(settings, 'QUERY_INSPECTOR_BUDGET', None)
+        self.threshold: int = getattr(settings, 'QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        response['X-Query-Count'] = str(len(recorder))
+        response['X-Query-Duration'] = f'{recorder.duration * 1000:.1f}'
+
+        for fingerprint, count in recorder.get_repeated_queries(self.threshold):
+            logger.warning('Possible N+1 in %s %s: %d x %s', request.method, request.path, count, fingerprint)
+
+        if self.budget is not None and len(recorder) > self.budget:
+            logger.warning(
+                '%s %s executed %d queries, budget is %d', request.method, request.path, len(recorder), self.budget
+            )
+
+        return response
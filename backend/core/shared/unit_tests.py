@@ -1,15 +1,53 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.test import APIClient
 
+from core.shared.queries import QueryRecorder, N_PLUS_ONE_THRESHOLD
+
 User = get_user_model()
 
 
-class APITestCase(TestCase):
+class QueryBudgetMixin:
+    """
+    Fails tests exceeding a query budget or repeating the same query (N+1).
+
+    Budgets of endpoints may be declared once per test case, e.g. `query_budgets = {'rooms-list': 3}`,
+    and referred to by name: `with self.assertQueryBudget('rooms-list'): ...`.
+    """
+    query_budgets: dict[str, int] = {}
+    n_plus_one_threshold = N_PLUS_ONE_THRESHOLD
+
+    @contextmanager
+    def assertQueryBudget(self, budget: int | str) -> Iterator[QueryRecorder]:
+        if isinstance(budget, str):
+            budget = self.query_budgets[budget]
+
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        repeated = recorder.get_repeated_queries(self.n_plus_one_threshold)
+        if repeated:
+            self.fail('Possible N+1 queries:\n' + '\n'.join(
+                f'{count} x {fingerprint}' for fingerprint, count in repeated
+            ))
+
+        if len(recorder) > budget:
+            self.fail(f'{len(recorder)} queries executed, budget is {budget}:\n' + '\n'.join(
+                f'{index}. {query.sql}' for index, query in enumerate(recorder.queries, start=1)
+            ))
+
+
+class APITestCase(QueryBudgetMixin, TestCase):
     USER_NAME = 'Test'
     USER_PASSWORD = '!@#$%'
 
     def setUp(self):
+        # cached responses and counts must not leak between tests
+        cache.clear()
         self.client = APIClient()
 
     @classmethod
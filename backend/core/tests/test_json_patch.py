@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from core.shared.json_patch import make_patch, apply_patch
+
+
+class JSONPatchTests(SimpleTestCase):
+
+    def assertPatchApplies(self, source, target):
+        operations = make_patch(source, target)
+        self.assertEqual(apply_patch(source, operations), target)
+        return operations
+
+    def test_equal_documents(self):
+        self.assertEqual(make_patch({'users': [{'id': 1}]}, {'users': [{'id': 1}]}), [])
+
+    def test_dict_changes(self):
+        operations = self.assertPatchApplies(
+            {'name': 'room', 'state': 'WAITING', 'slots': 4},
+            {'name': 'room', 'state': 'STARTING', 'host': 'user'},
+        )
+        self.assertCountEqual(operations, [
+            {'op': 'replace', 'path': '/state', 'value': 'STARTING'},
+            {'op': 'remove', 'path': '/slots'},
+            {'op': 'add', 'path': '/host', 'value': 'user'},
+        ])
+
+    def test_appended_item_is_sent_alone(self):
+        users = [{'id': index, 'username': f'user{index}'} for index in range(5)]
+        operations = self.assertPatchApplies(users, [*users, {'id': 5, 'username': 'user5'}])
+        self.assertEqual(operations, [{'op': 'add', 'path': '/5', 'value': {'id': 5, 'username': 'user5'}}])
+
+    def test_list_changes(self):
+        items = list(range(10))
+        self.assertPatchApplies(items, items[:3] + items[5:])
+        self.assertPatchApplies(items, items[:3] + [20, 21, 22] + items[4:])
+        self.assertPatchApplies(items, list(reversed(items)))
+        self.assertPatchApplies(items, [])
+        self.assertPatchApplies([], items)
+        self.assertPatchApplies([1, 1, 1], [1, 1])
+
+    def test_nested_changes_and_escaping(self):
+        operations = self.assertPatchApplies(
+            {'beers': [{'id': 1, 'style/name': 'IPA', 'brewery': {'name': 'A'}}]},
+            {'beers': [{'id': 1, 'style/name': 'APA', 'brewery': {'name': 'B'}}]},
+        )
+        self.assertEqual(operations, [
+            {'op': 'replace', 'path': '/beers/0/style~1name', 'value': 'APA'},
+            {'op': 'replace', 'path': '/beers/0/brewery/name', 'value': 'B'},
+        ])
+
+    def test_source_is_not_modified(self):
+        source = {'users': [1, 2]}
+        apply_patch(source, make_patch(source, {'users': [1, 2, 3]}))
+        self.assertEqual(source, {'users': [1, 2]})
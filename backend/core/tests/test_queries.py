@@ -0,0 +1,69 @@
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from core.shared.queries import fingerprint_sql, QueryRecorder
+from core.shared.unit_tests import APITestCase
+from rooms.models import Room
+
+
+class QueryInspectionTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.rooms = [Room.objects.create(name=f'room{index}', host=cls.user) for index in range(5)]
+
+    def test_fingerprint_ignores_parameters(self):
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM rooms_room WHERE id = 1 AND name = 'a''b'"),
+            fingerprint_sql("SELECT * FROM rooms_room WHERE id = 25 AND name = 'c'"),
+        )
+        self.assertEqual(
+            fingerprint_sql('SELECT * FROM rooms_room WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM rooms_room WHERE id IN (...)',
+        )
+
+    def test_recorder_finds_repeated_queries(self):
+        with QueryRecorder() as recorder:
+            for room in Room.objects.all():
+                room.users.count()
+
+        self.assertEqual(len(recorder), 6)
+        [(fingerprint, count)] = recorder.get_repeated_queries()
+        self.assertEqual(count, 5)
+        self.assertIn('COUNT(*)', fingerprint)
+
+    def test_budget_fails_on_n_plus_one(self):
+        with self.assertRaisesMessage(AssertionError, 'Possible N+1 queries'):
+            with self.assertQueryBudget(100):
+                [room.users_count for room in Room.objects.all()]
+
+        with self.assertQueryBudget(1):
+            [room.users_count for room in Room.objects.with_counts()]
+
+    def test_budget_fails_when_exceeded(self):
+        self.query_budgets = {'rooms-list': 1}
+
+        with self.assertRaisesMessage(AssertionError, '2 queries executed, budget is 1'):
+            with self.assertQueryBudget('rooms-list'):
+                Room.objects.count()
+                Room.objects.count()
+
+    @override_settings(QUERY_INSPECTOR_ENABLED=True, QUERY_INSPECTOR_N_PLUS_ONE_THRESHOLD=1)
+    def test_middleware_reports_queries(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertLogs('core.shared.queries', level='WARNING') as logs:
+            response = client.get('/api/rooms/')
+
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn('X-Query-Duration', response)
+        self.assertIn('GET /api/rooms/', logs.output[0])
+
+    def test_middleware_is_disabled_by_default(self):
+        self._require_login_and_auth()
+
+        response = self.client.get('/api/rooms/')
+
+        self.assertNotIn('X-Query-Count', response)
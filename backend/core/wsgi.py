@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings.base')
 
 application = get_wsgi_application()
+
+# imported once the application (and models) are loaded
+from beers.autocomplete import beers_autocomplete_index  # noqa: E402
+
+beers_autocomplete_index.build_in_background()
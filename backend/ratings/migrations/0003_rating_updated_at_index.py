@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rating',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
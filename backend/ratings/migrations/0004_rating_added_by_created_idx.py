@@ -0,0 +1,17 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0003_rating_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['added_by', '-created_at', '-id'], name='rating_added_by_created_idx'),
+        ),
+    ]
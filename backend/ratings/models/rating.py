@@ -33,9 +33,16 @@ class Rating(models.Model):
         MaxValueValidator(10),
     ], null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # used to find ratings modified since the previous refresh of statistics rollups
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     is_published = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # keyset (cursor) pagination of user's ratings
+            models.Index(fields=['added_by', '-created_at', '-id'], name='rating_added_by_created_idx'),
+        ]
+
     def __str__(self) -> str:
         to_str = f'{self.beer.name} - {self.note or "?"} by {self.added_by}'
         if self.room is not None:
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from rest_framework import status
+
+from beers.models import Beer
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+
+
+class ApproximateCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        Rating.objects.bulk_create([Rating(added_by=cls.user, beer=cls.beer, note=note) for note in range(1, 6)])
+
+    def setUp(self):
+        super().setUp()
+        self._require_login_and_auth()
+
+    def test_filtered_count_is_cached(self):
+        response = self.client.get('/api/ratings/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 5)
+        self.assertTrue(response.json()['count_is_exact'])
+
+        Rating.objects.create(added_by=self.user, beer=self.beer, note=10)
+
+        response = self.client.get('/api/ratings/?page=1')
+        self.assertEqual(response.json()['count'], 5)
+        self.assertFalse(response.json()['count_is_exact'])
+        self.assertEqual(len(response.json()['results']), 6)
+
+    def test_pages_are_not_bounded_by_approximate_count(self):
+        self.client.get('/api/ratings/?page_size=5')
+        Rating.objects.create(added_by=self.user, beer=self.beer, note=10)
+
+        response = self.client.get('/api/ratings/?page_size=5')
+        self.assertFalse(response.json()['count_is_exact'])
+        self.assertIsNotNone(response.json()['next'])
+
+        response = self.client.get(response.json()['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertIsNone(response.json()['next'])
+
+        response = self.client.get('/api/ratings/?page_size=5&page=3')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filters_are_counted_separately(self):
+        self.client.get('/api/ratings/')
+
+        response = self.client.get('/api/ratings/?note__gte=3')
+
+        self.assertEqual(response.json()['count'], 3)
+        self.assertTrue(response.json()['count_is_exact'])
+
+    def test_unfiltered_count_is_estimated(self):
+        with mock.patch('core.shared.pagination.get_estimated_count', return_value=25_000) as get_estimated_count:
+            response = self.client.get('/api/beers/')
+
+        get_estimated_count.assert_called_once()
+        self.assertEqual(response.json()['count'], 25_000)
+        self.assertFalse(response.json()['count_is_exact'])
+
+    def test_cached_count_follows_catalogue_changes(self):
+        self.assertEqual(self.client.get('/api/beers/').json()['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Beer.objects.create(name='Zissou APA', percentage=5, volume_ml=500)
+
+        response = self.client.get('/api/beers/')
+        self.assertEqual(response.json()['count'], 2)
+        self.assertTrue(response.json()['count_is_exact'])
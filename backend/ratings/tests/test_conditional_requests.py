@@ -0,0 +1,84 @@
+from rest_framework import status
+
+from beers.models import Beer, Hop
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+
+
+class RatingsConditionalRequestsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        cls.rating = Rating.objects.create(added_by=cls.user, beer=cls.beer, note=7)
+
+    def setUp(self):
+        super().setUp()
+        self._require_login_and_auth()
+
+    def test_list_not_modified(self):
+        response = self.client.get('/api/ratings/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+
+        # single aggregate query, nothing is fetched nor serialized
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_list_modified(self):
+        etag = self.client.get('/api/ratings/')['ETag']
+
+        self.rating.note = 8
+        self.rating.save()
+        response = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+
+        self.beer.name = 'Atak Chmielu 2.0'
+        self.beer.save()
+        response = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        Rating.objects.create(added_by=self.user, beer=self.beer, note=1).delete()
+        Rating.objects.filter(id=self.rating.id).delete()
+        response = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_modified_by_hops_of_beer(self):
+        citra, mosaic = Hop.objects.create(name='Citra'), Hop.objects.create(name='Mosaic')
+        self.beer.hops.add(citra)
+        etag = self.client.get('/api/ratings/')['ETag']
+
+        # count of hops stays the same
+        self.beer.hops.set([mosaic])
+        response = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        mosaic.beers.clear()
+        response = self.client.get('/api/ratings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query_params(self):
+        etag = self.client.get('/api/ratings/')['ETag']
+
+        response = self.client.get('/api/ratings/?page=1', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_not_modified(self):
+        url = f'/api/ratings/{self.rating.id}/'
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/api/ratings/1000/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
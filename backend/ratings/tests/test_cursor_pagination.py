@@ -0,0 +1,64 @@
+from rest_framework import status
+
+from beers.models import Beer
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+from rooms.models import Room
+
+
+class CursorPaginationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        cls.ratings = [Rating.objects.create(added_by=cls.user, beer=cls.beer, note=note) for note in range(1, 8)]
+
+    def setUp(self):
+        super().setUp()
+        self._require_login_and_auth()
+
+    def collect_pages(self, url: str) -> list[int]:
+        ids = []
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.json())
+
+            ids.extend(item['id'] for item in response.json()['results'])
+            url = response.json()['next']
+
+        return ids
+
+    def test_ratings_cursor_pagination(self):
+        ids = self.collect_pages('/api/ratings/?cursor=&page_size=3')
+
+        self.assertEqual(ids, [rating.id for rating in reversed(self.ratings)])
+
+    def test_cursor_page_does_not_count(self):
+        response = self.client.get('/api/ratings/?cursor=&page_size=3')
+        next_url = response.json()['next']
+
+        # a single query fetching the page (and the conditional request aggregate)
+        with self.assertNumQueries(2):
+            response = self.client.get(next_url)
+
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertIsNotNone(response.json()['previous'])
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get('/api/ratings/?page_size=3')
+
+        self.assertEqual(response.json()['count'], len(self.ratings))
+        self.assertIn('page=2', response.json()['next'])
+
+    def test_rooms_and_beers_cursor_pagination(self):
+        rooms = [Room.objects.create(name=f'room{index}', host=self.user) for index in range(3)]
+        beers = [Beer.objects.create(name=f'Beer {index}', percentage=5, volume_ml=500) for index in range(3)]
+
+        self.assertEqual(self.collect_pages('/api/rooms/?cursor=&page_size=2'), [room.id for room in rooms])
+        self.assertEqual(
+            self.collect_pages('/api/beers/?cursor=&page_size=2'),
+            [beer.id for beer in reversed(beers)] + [self.beer.id]
+        )
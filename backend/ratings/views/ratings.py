@@ -1,10 +1,16 @@
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Aggregate, Max, Q, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, viewsets
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
-from core.shared.pagination import page_number_pagination_factory
+from beers.filters.search import BeerSearchFilter
+from core.shared.conditional import ConditionalResponseMixin
+from core.shared.pagination import (
+    page_number_pagination_factory,
+    cursor_pagination_factory,
+    cursor_opt_in_pagination_factory,
+)
 from ratings.filters import RatingsFilterSet
 from ratings.models import Rating
 from ratings.permissons import CanDeleteRatingPermission
@@ -14,11 +20,22 @@ from ratings.serializers import (
     RatingUpdateSerializer,
     RatingCreateSerializer
 )
+from rooms.models import Room
+
+
+def get_rooms_prefetch() -> Prefetch:
+    # rooms embedded in ratings are serialized with counts (`RoomListSerializer`)
+    return Prefetch('room', queryset=Room.objects.with_counts().select_related('host'))
 
-RatingsPagination = page_number_pagination_factory(page_size=50)
+
+RatingsPagination = cursor_opt_in_pagination_factory(
+    page_number_pagination_factory(page_size=50, approximate_count=True),
+    cursor_pagination_factory(ordering=('-created_at', '-id'), page_size=50),
+)
 
 
 class RatingsViewSet(
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -29,6 +46,8 @@ class RatingsViewSet(
     """
     GET     /api/ratings/                     - list all current user's ratings
 
+    GET     /api/ratings/?cursor=             - list with cursor pagination, follow `next` links
+
     POST    /api/ratings/                     - create new rating
 
     GET     /api/ratings/<int:id>/            - retrieve rating
@@ -39,13 +58,10 @@ class RatingsViewSet(
     """
     permission_classes = [IsAuthenticated, CanDeleteRatingPermission]
     pagination_class = RatingsPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BeerSearchFilter, OrderingFilter]
     filterset_class = RatingsFilterSet
     http_method_names = ('get', 'post', 'patch', 'delete')
-    search_fields = (
-        'beer__name', 'beer__brewery__name',
-        'room__name', 'added_by__username'
-    )
+    search_beer_prefix = 'beer__'
     ordering_fields = ('id', 'created_at', 'updated_at')
     lookup_field = 'id'
 
@@ -56,20 +72,35 @@ class RatingsViewSet(
         if self.action == 'list':
             return Rating.objects.filter(
                 added_by=self.request.user
-            ).select_related('added_by', 'beer').order_by('-created_at')
+            ).select_related(
+                'added_by', 'beer', 'beer__brewery', 'beer__style'
+            ).prefetch_related(
+                get_rooms_prefetch()
+            ).order_by('-created_at')
 
         if self.action == 'retrieve':
             return Rating.objects.filter(
                 added_by=self.request.user
             ).select_related(
-                'added_by', 'beer', 'room', 'room__host',
+                'added_by', 'beer',
                 'beer__brewery', 'beer__style'
             ).prefetch_related(
-                'beer__hops'
+                'beer__hops', get_rooms_prefetch()
             ).order_by('-created_at')
 
         return Rating.objects.filter(added_by=self.request.user).order_by('-created_at')
 
+    def get_conditional_aggregates(self) -> dict[str, Aggregate]:
+        return {
+            **super().get_conditional_aggregates(),
+            'beers_last_modified': Max('beer__updated_at'),
+            'rooms_last_modified': Max('room__updated_at'),
+        }
+
+    def get_extra_search_conditions(self, query: str) -> Q:
+        # ratings are limited to the ones of the user already, room name is matched by its trigram index
+        return Q(room__name__icontains=query)
+
     def get_serializer_class(self):
         if self.action == 'list':
             return RatingListSerializer
@@ -1,19 +1,10 @@
 from django.contrib import admin
-from django.db.models import (
-    Avg,
-    QuerySet,
-    Count,
-    Subquery,
-    OuterRef,
-    IntegerField,
-    FloatField
-)
+from django.db.models import QuerySet, Subquery, OuterRef
 from django.http import HttpRequest
 from import_export.admin import ImportExportActionModelAdmin
 from ordered_model.admin import OrderedModelAdmin
 
-from ratings.models import Rating
-from .models import Room, UserInRoom, BeerInRoom
+from .models import Room, UserInRoom, BeerInRoom, RoomBeerResult, RoomReport
 
 
 @admin.register(Room)
@@ -37,17 +28,14 @@ class BeerInRoomAdmin(OrderedModelAdmin, ImportExportActionModelAdmin):
     def get_queryset(self, request: HttpRequest) -> QuerySet[BeerInRoom]:
         queryset = super().get_queryset(request)
 
-        rating_subquery = Rating.objects.filter(
+        result_subquery = RoomBeerResult.objects.filter(
             beer=OuterRef('beer'),
             room=OuterRef('room')
-        ).values('beer', 'room').annotate(
-            average_note=Avg('note', output_field=FloatField()),
-            notes_count=Count('note', output_field=IntegerField())
-        ).values('average_note', 'notes_count')
+        )
 
         return queryset.annotate(
-            notes_count=Subquery(rating_subquery.values('notes_count')[:1]),
-            average_note=Subquery(rating_subquery.values('average_note')[:1])
+            notes_count=Subquery(result_subquery.values('notes_count')[:1]),
+            average_note=Subquery(result_subquery.values('average_note')[:1])
         )
 
     def notes_count(self, obj) -> int:
@@ -57,6 +45,29 @@ class BeerInRoomAdmin(OrderedModelAdmin, ImportExportActionModelAdmin):
         return obj.average_note
 
 
+@admin.register(RoomBeerResult)
+class RoomBeerResultAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'room', 'beer', 'notes_count', 'average_note',
+        'min_note', 'max_note', 'is_frozen'
+    )
+    list_select_related = ('room', 'beer')
+    list_filter = ('is_frozen',)
+    search_fields = ('beer__name', 'room__name')
+    readonly_fields = (
+        'notes_count', 'notes_sum', 'average_note', 'min_note', 'max_note',
+        'notes_distribution', 'created_at', 'updated_at'
+    )
+
+
+@admin.register(RoomReport)
+class RoomReportAdmin(admin.ModelAdmin):
+    list_display = ('id', 'room', 'user', 'checksum', 'size', 'created_at')
+    list_select_related = ('room', 'user')
+    search_fields = ('user__username', 'room__name')
+    readonly_fields = ('checksum', 'size', 'created_at')
+
+
 @admin.register(UserInRoom)
 class UserInRoomAdmin(ImportExportActionModelAdmin):
     list_display = ('id', 'room', 'user', 'joined_at', 'last_active')
@@ -1,69 +1,51 @@
-from datetime import timedelta
+from datetime import datetime
 
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
-from django.db.models import QuerySet, Subquery, OuterRef
-from django.db.models.aggregates import Avg
-from django.db.models.fields import FloatField
+from django.db.models import Subquery, OuterRef
 from django.utils import timezone
 
 from beers.models import Beer
-from beers.serializers import BeerRepresentationalSerializer, BeerWithResultsSerializer
+from beers.serializers import BeerWithResultsSerializer
 from ratings.models import Rating
 from ratings.serializers import RatingSerializer
-from rooms.models import Room, UserInRoom, BeerInRoom
+from rooms.heartbeats import heartbeats
+from rooms.models import Room, BeerInRoom, RoomBeerResult
+from rooms.results import (
+    refresh_room_beer_result,
+    refresh_late_room_beer_result,
+    delete_room_reports_on_commit,
+)
 from rooms.serializers import RoomSerializer
-from users.serializers.user import UserSerializer
+from rooms.state import (
+    ROOM, USERS, BEERS,
+    get_room, get_room_users, get_room_beers,
+    set_room_section,
+)
+from rooms.sync import RoomSyncLockTimeout, commit_room_sync, get_room_delta
 
 User = get_user_model()
 
-INACTIVE_TIMEOUT_SECONDS = 60
 
-
-def filter_inactive_users_in_room(room: Room) -> QuerySet[UserInRoom]:
-    return UserInRoom.objects.filter(
-        last_active__lte=timezone.now() - timedelta(seconds=INACTIVE_TIMEOUT_SECONDS),
-        room=room
-    )
-
-
-def try_remove_inactive_users_in_room(room: Room) -> None:
-    inactive_users_in_room = filter_inactive_users_in_room(room)
-    if not inactive_users_in_room.exists():
-        return
-
-    users_to_remove = inactive_users_in_room.values_list('user', flat=True)
-    room.users.remove(*users_to_remove)
-
-
-@transaction.atomic
 def get_users_in_room(room_name: str):
-    try:
-        room = Room.objects.get(name=room_name)
-    except Room.DoesNotExist:
-        return []
-
-    try_remove_inactive_users_in_room(room)
-
-    # users have been updated, only active users are inside the room now
-    active_users = room.users.all()
-    serialized = UserSerializer(active_users, many=True).data
-    return serialized
+    # inactive users are removed in the background, see `rooms.queue.schedules`
+    return get_room_users(room_name)
 
 
 def bump_users_last_active_field(room_name: str, user: User) -> None:
     if user.is_anonymous:
         return
 
-    try:
-        user_room = UserInRoom.objects.get(room__name=room_name, user=user)
-    except ObjectDoesNotExist:
-        return
+    heartbeats.record(room_name=room_name, user_id=user.id)
+
+    if heartbeats.should_flush():
+        heartbeats.flush()
 
-    user_room.last_active = timezone.now()
-    user_room.save(update_fields=['last_active'])
+
+def flush_users_last_active_fields() -> int:
+    return heartbeats.flush()
 
 
 @transaction.atomic
@@ -89,9 +71,21 @@ def save_user_form(room_name: str, user: User, beer_id: str, data: dict):
             clean_data['note'] = None
 
     # update existing rating
-    if user_ratings.exists():
-        user_ratings.update(**clean_data)
+    previous_notes = set(user_ratings.values_list('note', flat=True))
+    if previous_notes:
+        # queryset update does not touch `auto_now` fields
+        user_ratings.update(**{**clean_data, 'updated_at': timezone.now()})
         rating = user_ratings.first()
+
+        # queryset update does not send signals, results have to be refreshed explicitly
+        if previous_notes != {rating.note}:
+            refresh_room_beer_result(rating.room_id, rating.beer_id)
+
+        # user's own ratings are part of the report (see `delete_outdated_room_report`),
+        # state of the room comes from the cache, running rooms do not query anything else
+        if (room := get_room(room_name)) and room['state'] == Room.State.FINISHED:
+            delete_room_reports_on_commit(rating.room_id, user.id)
+
         return RatingSerializer(instance=rating).data
 
     try:
@@ -102,7 +96,22 @@ def save_user_form(room_name: str, user: User, beer_id: str, data: dict):
 
     # create new rating if it's missing
     new_rating = Rating.objects.create(**clean_data, added_by=user, room=room, beer=beer)
-    return RatingSerializer(instace=new_rating).data
+    return RatingSerializer(instance=new_rating).data
+
+
+@transaction.atomic
+def save_autosaved_user_form(room_name: str, user: User, beer_id: str, data: dict, submitted_at: datetime):
+    """
+    Saves rating form coalesced by `rooms.autosave`, which was submitted at `submitted_at` (first unsaved change).
+    If the room has been finished in the meantime, its frozen results are refreshed with the form.
+    """
+    rating = save_user_form(room_name=room_name, user=user, beer_id=beer_id, data=data)
+
+    # state of the room comes from the cache, running rooms do not query anything else
+    if rating and (room := get_room(room_name)) and room['state'] == Room.State.FINISHED:
+        refresh_late_room_beer_result(room_name, beer_id, submitted_at)
+
+    return rating
 
 
 def get_user_form_data(room_name: str, user: User, beer_id: str):
@@ -130,29 +139,16 @@ def get_user_form_data(room_name: str, user: User, beer_id: str):
 
 
 def get_beers_in_room(room_name: str):
-    try:
-        room = Room.objects.get(name=room_name)
-    except ObjectDoesNotExist:
-        return []
-
-    beers = room.beers.order_by('rooms_through__order')
-    serialized = BeerRepresentationalSerializer(beers, many=True).data
-    return serialized
+    return get_room_beers(room_name)
 
 
 def get_current_room(room_name: str):
-    try:
-        room = Room.objects.get(name=room_name)
-    except ObjectDoesNotExist:
-        return
-
-    serialized = RoomSerializer(room).data
-    return serialized
+    return get_room(room_name)
 
 
 def change_room_state_to(state: str, room_name: str):
     try:
-        room = Room.objects.get(name=room_name)
+        room = Room.objects.with_counts().get(name=room_name)
     except ObjectDoesNotExist:
         return
 
@@ -161,6 +157,7 @@ def change_room_state_to(state: str, room_name: str):
         return RoomSerializer(room).data
 
     serializer.save()
+    set_room_section(room_name, ROOM, serializer.data)
     return serializer.data
 
 
@@ -186,33 +183,59 @@ def get_final_user_beer_ratings(room_name: str, user: User):
 
 
 def get_final_beers_ratings(room_name: str):
-    beers_in_room = BeerInRoom.objects.filter(room__name=room_name).only('beer', 'room', 'order')
-    if not beers_in_room.exists():
-        return []
-
-    # find average rating for each beer in the room
-    rating_subquery = Rating.objects.filter(
+    # average ratings are precomputed, see `rooms.results`
+    result_subquery = RoomBeerResult.objects.filter(
         beer=OuterRef('beer'), room=OuterRef('room')
-    ).values('beer', 'room').annotate(
-        average_rating=Avg('note', output_field=FloatField()),
-    )
+    ).values('average_note')[:1]
 
-    beers_with_ratings = beers_in_room.annotate(
-        average_rating=Subquery(
-            rating_subquery.values('average_rating')[:1]
-        )
+    beers_with_ratings = BeerInRoom.objects.filter(
+        room__name=room_name
+    ).select_related(
+        'beer__brewery', 'beer__style'
+    ).annotate(
+        average_rating=Subquery(result_subquery)
     ).order_by('order')
 
     serializer = BeerWithResultsSerializer(beers_with_ratings, many=True)
     return serializer.data
 
 
+def get_session_snapshot(room_name: str, user: User) -> dict:
+    """
+    Everything a client needs after (re)connecting to the room, in a single call.
+    Room, users and beers come from the room state cache (loaded on a miss), ratings of the user with one query.
+    Version of the room sync log is included, so that the client can opt in to delta sync (see `rooms.sync`),
+    it is `None` if the log could not be updated.
+    """
+    sections = {
+        ROOM: get_room(room_name),
+        USERS: get_room_users(room_name),
+        BEERS: get_room_beers(room_name),
+    }
+    try:
+        version = commit_room_sync(room_name, sections)['version']
+    except RoomSyncLockTimeout:
+        version = None
+
+    return {
+        **sections,
+        'ratings': get_final_user_beer_ratings(room_name, user) or [],
+        'version': version,
+    }
+
+
 async_get_users_in_room = database_sync_to_async(get_users_in_room)
 async_bump_users_last_active_field = database_sync_to_async(bump_users_last_active_field)
+async_flush_users_last_active_fields = database_sync_to_async(flush_users_last_active_fields)
 async_save_user_form = database_sync_to_async(save_user_form)
+async_save_autosaved_user_form = database_sync_to_async(save_autosaved_user_form)
 async_get_user_form_data = database_sync_to_async(get_user_form_data)
 async_get_beers_in_room = database_sync_to_async(get_beers_in_room)
 async_get_current_room = database_sync_to_async(get_current_room)
 async_change_room_state_to = database_sync_to_async(change_room_state_to)
 async_get_final_user_beer_ratings = database_sync_to_async(get_final_user_beer_ratings)
 async_get_final_beers_ratings = database_sync_to_async(get_final_beers_ratings)
+# these wait for the lock of the room sync log, they do not block the thread shared by other database calls
+async_get_session_snapshot = database_sync_to_async(get_session_snapshot, thread_sensitive=False)
+async_commit_room_sync = database_sync_to_async(commit_room_sync, thread_sensitive=False)
+async_get_room_delta = database_sync_to_async(get_room_delta, thread_sensitive=False)
@@ -0,0 +1,127 @@
+"""
+Debounced, coalesced autosave of rating forms.
+
+Frontend saves the rating form every few seconds and on every change.
+Saves of the same (user, room, beer) are merged in memory and written once,
+after a quiet period without new saves, when the user switches to another beer,
+requests form data or disconnects.
+
+Members flush their forms when they receive the new state of the room, which may happen after
+the room was finished and its results frozen - forms submitted before that are still included in results.
+Counters of this process are exposed by the cache metrics endpoint (`stats.views.cache`).
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from rooms.async_db import async_save_autosaved_user_form
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+RATING_AUTOSAVE_QUIET_PERIOD_SECONDS = 2
+
+
+@dataclass
+class AutosaveCounters:
+    received: int = 0
+    written: int = 0
+
+    @property
+    def absorbed(self) -> int:
+        """Number of saves merged into other saves, which did not hit the database."""
+        return self.received - self.written
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            'received': self.received,
+            'written': self.written,
+            'absorbed': self.absorbed,
+        }
+
+
+rating_autosave_counters = AutosaveCounters()
+
+
+class RatingFormAutosave:
+    """Coalesces rating form saves of a user in a room. One instance per websocket connection."""
+
+    def __init__(
+        self,
+        room_name: str,
+        user: User,
+        quiet_period_seconds: float = RATING_AUTOSAVE_QUIET_PERIOD_SECONDS,
+        counters: AutosaveCounters = rating_autosave_counters,
+    ):
+        self.room_name = room_name
+        self.user = user
+        self.quiet_period_seconds = quiet_period_seconds
+        self.counters = counters
+        self._pending: dict[str, dict] = {}
+        self._submitted_at: dict[str, datetime] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> dict[str, dict]:
+        return self._pending
+
+    async def submit(self, beer_id: int | str, data: dict) -> None:
+        beer_id = str(beer_id)
+        self.counters.received += 1
+
+        # user switched to another beer, previous one is saved right away
+        for other_beer_id in [key for key in self._pending if key != beer_id]:
+            await self.flush(other_beer_id)
+
+        self._pending.setdefault(beer_id, {}).update(data)
+        # time of the first change which has not been written yet
+        self._submitted_at.setdefault(beer_id, timezone.now())
+        self._schedule(beer_id)
+
+    async def flush(self, beer_id: int | str) -> None:
+        beer_id = str(beer_id)
+
+        if timer := self._timers.pop(beer_id, None):
+            timer.cancel()
+
+        data = self._pending.pop(beer_id, None)
+        submitted_at = self._submitted_at.pop(beer_id, None)
+        if data is None:
+            return
+
+        self.counters.written += 1
+        await async_save_autosaved_user_form(
+            room_name=self.room_name,
+            user=self.user,
+            beer_id=beer_id,
+            data=data,
+            submitted_at=submitted_at
+        )
+
+    async def flush_all(self) -> None:
+        for beer_id in list(self._pending):
+            await self.flush(beer_id)
+
+        logger.debug('Rating form autosave counters: %s', self.counters.as_dict())
+
+    def _schedule(self, beer_id: str) -> None:
+        if timer := self._timers.pop(beer_id, None):
+            timer.cancel()
+
+        self._timers[beer_id] = asyncio.create_task(self._flush_after_quiet_period(beer_id))
+
+    async def _flush_after_quiet_period(self, beer_id: str) -> None:
+        await asyncio.sleep(self.quiet_period_seconds)
+
+        # timer has fired, it must not be cancelled by the flush itself
+        self._timers.pop(beer_id, None)
+
+        try:
+            await self.flush(beer_id)
+        except Exception:
+            logger.exception('Could not save rating form of beer %s in room %s', beer_id, self.room_name)
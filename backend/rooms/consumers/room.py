@@ -1,17 +1,25 @@
 import logging
 from typing import Any
+from urllib.parse import parse_qs
 
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from channels.layers import BaseChannelLayer
 from django.conf import settings
 from django.utils import timezone
 
 from rooms.async_db import (
     async_get_users_in_room, async_get_beers_in_room,
     async_get_user_form_data, async_bump_users_last_active_field,
-    async_save_user_form, async_get_current_room,
+    async_get_current_room,
     async_change_room_state_to, async_get_final_beers_ratings,
-    async_get_final_user_beer_ratings
+    async_get_final_user_beer_ratings, async_flush_users_last_active_fields,
+    async_get_session_snapshot, async_commit_room_sync, async_get_room_delta,
 )
+from rooms.autosave import RatingFormAutosave
+from rooms.replay import replay_buffer
+from rooms.state import USERS, BEERS, ROOM
+from rooms.sync import RoomSyncLockTimeout
 
 logger = logging.getLogger(__name__)
 
@@ -20,29 +28,50 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
     room_name: str
     room_group_name: str
     private_group_name: str
+    rating_autosave: RatingFormAutosave
+    # version of the room sync log the client is at, `None` until the client opts in to delta sync
+    sync_version: int | None = None
 
     commands = {
         # two sided actions: client -> server -> client
+        'user_leave': 'user_leave',
+    }
+
+    inline_commands = {
+        # actions with side effects are executed once, by the consumer which received them,
+        # results are broadcast to the room by the handlers
+        'user_active': 'user_active',
+        'change_room_state': 'change_room_state',
+    }
+
+    broadcast_commands = {
+        # two sided actions: client -> server -> all clients in the room,
+        # payload is built and encoded once by the sender, receivers only forward it
         'get_new_message': 'get_new_message',
         'get_users': 'get_users',
         'get_beers': 'get_beers',
-        'load_beers': 'load_beers',
-        'get_final_ratings': 'get_final_ratings',
-        'user_leave': 'user_leave',
-        # one sided actions: client -> server
-        'user_active': 'user_active',
+        'load_beers': 'get_beers',
         'get_room_state': 'get_room_state',
-        'change_room_state': 'change_room_state',
+        'get_final_ratings': 'get_final_ratings',
     }
 
     private_commands = {
+        # handled by the consumer which received them, replies are sent to the same socket only
         # two sided actions: client -> server -> client
         'get_form_data': 'get_form_data',
         'get_user_ratings': 'get_user_ratings',
+        'sync_room': 'sync_room',
         # one sided actions: client -> server
         'user_form_save': 'user_form_save',
     }
 
+    synced_commands = {
+        # full payloads of these commands are replaced with patches for clients which opted in to delta sync
+        'set_users': USERS,
+        'set_beers': BEERS,
+        'set_room_state': ROOM,
+    }
+
     async def connect(self):
         if not (current_user := self.scope.get('user')) or current_user.is_anonymous:
             # reject unauthenticated users
@@ -50,9 +79,11 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             return
 
         self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = 'room_%s' % self.room_name
+        self.room_group_name = self.get_room_group_name(self.room_name)
 
-        self.private_group_name = f'room_user_{current_user.username}'
+        self.private_group_name = self.get_private_group_name(self.room_name, current_user.id)
+
+        self.rating_autosave = RatingFormAutosave(room_name=self.room_name, user=current_user)
 
         # public room
         await self.channel_layer.group_add(
@@ -60,7 +91,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             self.channel_name
         )
 
-        # private room - user specific
+        # private room - user specific, for pushes from outside of the consumer (e.g. background tasks)
         await self.channel_layer.group_add(
             self.private_group_name,
             self.channel_name
@@ -68,20 +99,37 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
 
         await self.accept()
 
-        # notify others that current user joined
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {'type': 'user_join', 'data': current_user.username},
-        )
+        # reconnecting client receives only events it has missed, if they are still in the replay buffer
+        if (since := self.get_since_seq()) is not None:
+            missed_events = await sync_to_async(replay_buffer.get_since)(self.room_name, since)
+        else:
+            missed_events = None
 
-        # fetch users in room on join
-        await self.channel_layer.group_send(
-            self.room_group_name, {'type': 'get_users'},
-        )
+        if missed_events is not None:
+            for text_data in missed_events:
+                await self.send(text_data=text_data)
 
-        # get room state on join
+            users = await async_get_users_in_room(room_name=self.room_name)
+        else:
+            # everything the client needs is sent to the joining socket only,
+            # `seq` of the last event broadcast to the room is included so that the client can resume later on
+            seq = await sync_to_async(replay_buffer.current_seq)(self.room_name)
+            snapshot = await async_get_session_snapshot(room_name=self.room_name, user=current_user)
+            await self.send_json({
+                'command': 'session_snapshot',
+                'data': snapshot,
+                'seq': seq,
+            })
+            users = snapshot['users']
+
+        # others are notified with the joining user only, they do not have to fetch users and room state again
         await self.channel_layer.group_send(
-            self.room_group_name, {'type': 'get_room_state'},
+            self.room_group_name,
+            {
+                'type': 'user_join',
+                'data': current_user.username,
+                'user': next((user for user in users if user['id'] == current_user.id), None),
+            },
         )
 
     async def receive_json(self, content: dict, **kwargs: Any):
@@ -95,14 +143,12 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         if not command:
             return
 
-        if command in self.private_commands:
-            await self.channel_layer.group_send(
-                self.private_group_name,
-                {
-                    'type': self.private_commands[command],
-                    'data': data_content,
-                }
-            )
+        if handler_name := self.private_commands.get(command) or self.inline_commands.get(command):
+            # no channel layer round-trip, the command is handled right away
+            handler = getattr(self, handler_name)
+            await handler({'data': data_content})
+        elif command in self.broadcast_commands:
+            await self.broadcast_command(command, data_content)
         elif command in self.commands:
             await self.channel_layer.group_send(
                 self.room_group_name,
@@ -129,6 +175,10 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             {'type': 'user_disconnect', 'data': user.username},
         )
 
+        # persist buffered heartbeats and rating forms, so that nothing is lost
+        await async_flush_users_last_active_fields()
+        await self.rating_autosave.flush_all()
+
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
@@ -146,72 +196,228 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         }
         await super().send_json(content, close=close)
 
+    async def broadcast_command(self, command: str, data: Any = None):
+        """
+        Builds payload of a broadcast command and sends it to the whole room as encoded text,
+        so that the database is queried and the payload is serialized only once per command,
+        not once per each member of the room.
+        """
+        handler = getattr(self, self.broadcast_commands[command])
+        content = await handler(data)
+
+        if content['command'] in self.synced_commands:
+            await self.broadcast_synced(self.channel_layer, self.room_name, content)
+        else:
+            await self.broadcast(self.channel_layer, self.room_group_name, content, room_name=self.room_name)
+
+    @classmethod
+    async def broadcast(
+        cls,
+        channel_layer: BaseChannelLayer,
+        group_name: str,
+        content: dict,
+        event_type: str = 'send_serialized',
+        room_name: str | None = None
+    ):
+        """
+        Encodes content once and sends it to the group as text, which is forwarded by `send_serialized`
+        (or another handler given by `event_type`, which has to send `event['text']` as well).
+        Events broadcast to a room (`room_name` given) are kept for replay after a reconnect.
+        Can be used outside of consumers (e.g. in background tasks) to push updates to the room.
+        """
+        content = {
+            'timestamp': timezone.now().isoformat(),
+            **content
+        }
+        if room_name is not None:
+            _, text_data = await cls.encode_replayable(room_name, content)
+        else:
+            text_data = await cls.encode_json(content)
+
+        await channel_layer.group_send(
+            group_name,
+            {'type': event_type, 'text': text_data},
+        )
+
+    @classmethod
+    async def broadcast_synced(
+        cls,
+        channel_layer: BaseChannelLayer,
+        room_name: str,
+        content: dict,
+        event_type: str = 'send_synced'
+    ):
+        """
+        Records new data of a room section in the sync log and broadcasts both the full payload
+        and the patch against the previous version, each encoded once.
+        Receivers pick one of them depending on the version their client is at, see `send_synced`.
+        Can be used outside of consumers (e.g. in background tasks) to push updates to the room.
+        """
+        section = cls.synced_commands[content['command']]
+        try:
+            delta = await async_commit_room_sync(room_name=room_name, sections={section: content['data']})
+        except RoomSyncLockTimeout:
+            # full payload only, synced clients notice they are behind on the next patch and sync again
+            logger.warning('Could not record %s in sync log of room %s', content['command'], room_name)
+            await cls.broadcast(channel_layer, cls.get_room_group_name(room_name), content, room_name=room_name)
+            return
+
+        timestamp = timezone.now().isoformat()
+        seq, text_data = await cls.encode_replayable(room_name, {'timestamp': timestamp, **content})
+        # empty patch is never sent, clients at the base version are already up to date
+        patch_text_data = delta['ops'] and await cls.encode_json({
+            'timestamp': timestamp,
+            'seq': seq,
+            'command': 'sync_room',
+            'data': delta,
+        })
+        await channel_layer.group_send(
+            cls.get_room_group_name(room_name),
+            {
+                'type': event_type,
+                'text': text_data,
+                'patch_text': patch_text_data,
+                'base_version': delta['base_version'],
+                'version': delta['version'],
+            },
+        )
+
+    @classmethod
+    async def encode_replayable(cls, room_name: str, content: dict) -> tuple[int, str]:
+        """Numbers an event of the room and keeps it, encoded, in the replay buffer (see `rooms.replay`)."""
+
+        seq = await sync_to_async(replay_buffer.next_seq)(room_name)
+        text_data = await cls.encode_json({**content, 'seq': seq})
+        await sync_to_async(replay_buffer.store)(room_name, seq, text_data)
+        return seq, text_data
+
+    def get_since_seq(self) -> int | None:
+        """Sequence number of the last event received by the client before reconnecting (`?since=<seq>`)."""
+
+        query_params = parse_qs(self.scope.get('query_string', b'').decode())
+        try:
+            return int(query_params['since'][0])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def get_room_group_name(room_name: str) -> str:
+        return f'room_{room_name}'
+
+    @staticmethod
+    def get_private_group_name(room_name: str, user_id: int) -> str:
+        # usernames may contain characters not allowed in group names (`@`, `+`)
+        return f'room_{room_name}_user_{user_id}'
+
+    async def send_serialized(self, event: dict):
+        """Forwards already encoded payload of a broadcast command to the client."""
+
+        await self.send(text_data=event['text'])
+
+    async def send_room_state(self, event: dict):
+        """Forwards room state changed by another member, pending rating forms are saved first."""
+
+        # results of the next stage must include forms saved by every member, not only by the one who changed it
+        await self.rating_autosave.flush_all()
+        await self.send_synced(event)
+
+    async def send_synced(self, event: dict):
+        """
+        Forwards update of a room section - full payload to clients which did not opt in to delta sync,
+        patch to clients which are at its base version, patches they have missed to the ones behind.
+        """
+        if self.sync_version is None:
+            await self.send_serialized(event)
+            return
+
+        if event['version'] <= self.sync_version:
+            # nothing has changed since the version the client is at
+            return
+
+        if event['base_version'] == self.sync_version:
+            self.sync_version = event['version']
+            await self.send(text_data=event['patch_text'])
+            return
+
+        await self.sync_room({'data': self.sync_version})
+
     """
-    Event handlers:
+    Broadcast payload builders:
     - get_new_message
     - get_users
-    - get_beers
-    - load_beers
-    - get_form_data
-    - user_active
-    - user_form_save
+    - get_beers (load_beers)
     - get_room_state
-    - change_room_state
     - get_final_ratings
-    - get_user_ratings
-    - user_join
-    - user_disconnect
-    - user_leave
-    - invalid_command
     """
 
-    async def get_new_message(self, event: dict):
+    async def get_new_message(self, data: Any) -> dict:
         """
         Receive message => Broadcast it to others and update client
         'get_new_message' => 'set_new_message'
         """
         user = self.scope['user']
-        message = event.get('data')
         content = {
-            'message': message,
+            'message': data,
             'user': str(user),
         }
-        await self.send_json(
-            {
-                'command': 'set_new_message',
-                'data': content,
-            }
-        )
+        return {
+            'command': 'set_new_message',
+            'data': content,
+        }
 
-    async def get_users(self, event: dict):
+    async def get_users(self, data: Any) -> dict:
         """
         Receive get_users command => Broadcast list of users and update client
         'get_users' => 'set_users'
         """
         users = await async_get_users_in_room(room_name=self.room_name)
-        await self.send_json(
-            {
-                'command': 'set_users',
-                'data': users,
-            }
-        )
+        return {
+            'command': 'set_users',
+            'data': users,
+        }
 
-    async def get_beers(self, event: dict):
+    async def get_beers(self, data: Any) -> dict:
         beers = await async_get_beers_in_room(room_name=self.room_name)
-        await self.send_json(
-            {
-                'command': 'set_beers',
-                'data': beers,
-            }
-        )
+        return {
+            'command': 'set_beers',
+            'data': beers,
+        }
 
-    async def load_beers(self, event: dict):
-        """Alias for `get_beers` command handler."""
+    async def get_room_state(self, data: Any) -> dict:
+        room = await async_get_current_room(room_name=self.room_name)
+        return {
+            'command': 'set_room_state',
+            'data': room,
+        }
 
-        await self.get_beers(event)
+    async def get_final_ratings(self, data: Any) -> dict:
+        final = await async_get_final_beers_ratings(room_name=self.room_name)
+        return {
+            'command': 'set_final_results',
+            'data': final,
+        }
+
+    """
+    Event handlers:
+    - send_serialized
+    - send_room_state
+    - send_synced
+    - get_form_data
+    - user_active
+    - user_form_save
+    - change_room_state
+    - get_user_ratings
+    - sync_room
+    - user_join
+    - user_disconnect
+    - user_leave
+    - invalid_command
+    """
 
     async def get_form_data(self, event: dict):
         beer_id = event.get('data')
+        # form data must not be read before pending saves are written
+        await self.rating_autosave.flush_all()
         form_data = await async_get_user_form_data(
             room_name=self.room_name,
             user=self.scope['user'],
@@ -228,7 +434,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
     async def user_active(self, event: dict):
         """
         Client reports that they are active by sending command 'user_active'
-        Server updates last_active field.
+        Server records the heartbeat, last_active field is updated in bulk (see `rooms.heartbeats`).
         """
         user = self.scope['user']
         await async_bump_users_last_active_field(
@@ -237,51 +443,73 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         )
 
     async def user_form_save(self, event: dict):
-        user = self.scope['user']
+        """
+        Client saves rating form of a beer.
+        Rapid successive saves are merged and written once (see `rooms.autosave`).
+        """
         received_data = event.get('data')
-        beer_id = received_data.get('beer_id')
-        await async_save_user_form(
-            room_name=self.room_name,
-            user=user,
-            beer_id=beer_id,
-            data=received_data
-        )
+        if not received_data or not (beer_id := received_data.get('beer_id')):
+            return
 
-    async def get_room_state(self, event: dict):
-        room = await async_get_current_room(room_name=self.room_name)
-        await self.send_json(
-            {
-                'command': 'set_room_state',
-                'data': room,
-            }
-        )
+        await self.rating_autosave.submit(beer_id=beer_id, data=received_data)
 
     async def change_room_state(self, event: dict):
+        """
+        Changes state of the room once and broadcasts the updated room to all members.
+        'change_room_state' => 'set_room_state'
+        """
         state = event.get('data')
+        # results must include pending rating form saves
+        await self.rating_autosave.flush_all()
         updated_room = await async_change_room_state_to(state=state, room_name=self.room_name)
-        await self.send_json(
+        await self.broadcast_synced(
+            self.channel_layer,
+            self.room_name,
             {
                 'command': 'set_room_state',
                 'data': updated_room,
-            }
+            },
+            event_type='send_room_state'
         )
 
-    async def get_final_ratings(self, event: dict):
-        final = await async_get_final_beers_ratings(room_name=self.room_name)
+    async def get_user_ratings(self, event: dict):
+        user = self.scope['user']
+        await self.rating_autosave.flush_all()
+        final = await async_get_final_user_beer_ratings(room_name=self.room_name, user=user)
         await self.send_json(
             {
-                'command': 'set_final_results',
+                'command': 'set_user_results',
                 'data': final,
             }
         )
 
-    async def get_user_ratings(self, event: dict):
-        user = self.scope['user']
-        final = await async_get_final_user_beer_ratings(room_name=self.room_name, user=user)
+    async def sync_room(self, event: dict):
+        """
+        Client opts in to delta sync with the last version it has acknowledged,
+        patches since that version are sent back, or a full snapshot if the client is too far behind.
+        Snapshot without a version (sync log is locked) keeps the client on full payloads.
+        'sync_room' => 'sync_room'
+        """
+        since = event.get('data')
+        delta = await async_get_room_delta(
+            room_name=self.room_name,
+            since=since if isinstance(since, int) else None
+        )
+        self.sync_version = delta['version']
         await self.send_json(
             {
-                'command': 'set_user_results',
-                'data': final,
+                'command': 'sync_room',
+                'data': delta,
+            }
+        )
+
+    async def report_ready(self, event: dict):
+        """Server action to notify the user that their report was generated in the background"""
+
+        await self.send_json(
+            {
+                'command': 'report_ready',
+                'data': event['data'],
             }
         )
 
@@ -297,6 +525,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             {
                 'command': 'user_join',
                 'data': username,
+                'user': event.get('user'),
             }
         )
 
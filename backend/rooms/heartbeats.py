@@ -0,0 +1,69 @@
+"""
+Write-behind buffer for `UserInRoom.last_active` heartbeats.
+
+Every websocket message (and `user_active` ping) marks its sender as active.
+Instead of updating the database each time, last seen times are recorded in memory
+and written with a single `bulk_update` once per flush interval (and on disconnect).
+
+Flush interval has to stay well below `INACTIVE_TIMEOUT_SECONDS`, after which the inactive users sweeper
+(`rooms.queue.schedules`) removes users, so that nobody is removed because of a heartbeat waiting in the buffer.
+"""
+import threading
+import time
+from datetime import datetime
+
+from django.utils import timezone
+
+from rooms.models import UserInRoom
+
+HEARTBEATS_FLUSH_INTERVAL_SECONDS = 15
+
+INACTIVE_TIMEOUT_SECONDS = 60
+
+
+class HeartbeatBuffer:
+
+    def __init__(self, flush_interval_seconds: int = HEARTBEATS_FLUSH_INTERVAL_SECONDS):
+        self.flush_interval_seconds = flush_interval_seconds
+        self._last_seen: dict[tuple[str, int], datetime] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def record(self, room_name: str, user_id: int, seen_at: datetime | None = None) -> None:
+        with self._lock:
+            self._last_seen[(room_name, user_id)] = seen_at or timezone.now()
+
+    def should_flush(self) -> bool:
+        return time.monotonic() - self._last_flush >= self.flush_interval_seconds
+
+    def flush(self) -> int:
+        """Writes buffered heartbeats to the database. Returns number of updated rows."""
+
+        with self._lock:
+            pending, self._last_seen = self._last_seen, {}
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        users_in_rooms = UserInRoom.objects.filter(
+            room__name__in={room_name for room_name, _ in pending},
+            user_id__in={user_id for _, user_id in pending},
+        ).select_related('room').only('id', 'user_id', 'last_active', 'room__name')
+
+        to_update = []
+        for user_in_room in users_in_rooms:
+            seen_at = pending.get((user_in_room.room.name, user_in_room.user_id))
+            if not seen_at:
+                continue
+
+            user_in_room.last_active = seen_at
+            to_update.append(user_in_room)
+
+        return UserInRoom.objects.bulk_update(to_update, ['last_active'])
+
+
+heartbeats = HeartbeatBuffer()
@@ -0,0 +1,100 @@
+import resource
+import tempfile
+import time
+import tracemalloc
+from statistics import median
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from beers.models import Beer
+from ratings.models import Rating
+from rooms.models import Room, BeerInRoom
+from rooms.reports import generate_excel_report, write_excel_report
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Django command comparing in-memory and write-only Excel reports (saved into a temporary file).
+    Benchmark data is created in a transaction, which is rolled back afterwards.
+    """
+    help = 'Measures latency and peak memory of Excel report generation'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--beers', type=int, default=100, help='Number of beers in the room')
+        parser.add_argument('--users', type=int, default=10, help='Number of participants of the room')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of runs of every mode')
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            room, user = self.create_room(options['beers'], options['users'])
+            self.stdout.write(
+                f"Room with {options['beers']} beers and {options['users']} participants, "
+                f"{options['repeat']} runs per mode"
+            )
+
+            modes = {
+                'in-memory': lambda: generate_excel_report(room.name, user).getbuffer().nbytes,
+                'write-only': lambda: self.write_to_temporary_file(room, user),
+            }
+            for mode, generate in modes.items():
+                self.benchmark(mode, generate, options['repeat'])
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def write_to_temporary_file(room: Room, user: User) -> int:
+        with tempfile.TemporaryFile() as output:
+            return write_excel_report(room.name, user, output)
+
+    def benchmark(self, mode: str, generate, repeat: int) -> None:
+        latencies, peaks = [], []
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        for _ in range(repeat):
+            tracemalloc.start()
+            start = time.perf_counter()
+            size = generate()
+            latencies.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        self.stdout.write(
+            f'{mode:>10}: size {size / 1024:.1f} KiB, '
+            f'median latency {median(latencies) * 1000:.1f} ms, '
+            f'peak allocated {max(peaks) / 1024:.1f} KiB, '
+            f'max RSS growth {rss_growth} KiB'
+        )
+
+    @staticmethod
+    def create_room(beers_count: int, users_count: int) -> tuple[Room, User]:
+        users = [
+            User.objects.create_user(username=f'benchmark_report_{index}')
+            for index in range(users_count)
+        ]
+        room = Room.objects.create(name='bench', host=users[0], slots=users_count)
+        room.users.add(*users)
+
+        beers = Beer.objects.bulk_create([
+            Beer(name=f'Benchmark beer {index}', percentage=5.5, volume_ml=500)
+            for index in range(beers_count)
+        ])
+        for beer in beers:
+            BeerInRoom.objects.create(room=room, beer=beer)
+
+        Rating.objects.bulk_create([
+            Rating(
+                added_by=user, room=room, beer=beer, note=(index % 10) + 1,
+                color='Golden', foam='Thick', smell='Citrus', taste='Bitter', opinion='Good one'
+            )
+            for index, (user, beer) in enumerate((user, beer) for user in users for beer in beers)
+        ])
+        # ratings are created in bulk (without signals), results are calculated when room is finished
+        room.state = Room.State.FINISHED
+        room.save()
+
+        return room, users[0]
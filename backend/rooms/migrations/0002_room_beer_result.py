@@ -0,0 +1,75 @@
+# Generated by Django 4.2.4 on 2026-10-18 15:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_room_beer_results(apps, schema_editor):
+    Rating = apps.get_model('ratings', 'Rating')
+    RoomBeerResult = apps.get_model('rooms', 'RoomBeerResult')
+
+    distributions = {}
+    notes_counts = Rating.objects.filter(
+        room__isnull=False, note__isnull=False
+    ).values('room_id', 'beer_id', 'note').annotate(count=models.Count('id')).order_by()
+
+    for row in notes_counts:
+        distribution = distributions.setdefault((row['room_id'], row['beer_id']), {})
+        distribution[str(row['note'])] = row['count']
+
+    results = []
+    for (room_id, beer_id), distribution in distributions.items():
+        notes_count = sum(distribution.values())
+        notes_sum = sum(int(note) * count for note, count in distribution.items())
+        notes = sorted(int(note) for note in distribution)
+        results.append(RoomBeerResult(
+            room_id=room_id,
+            beer_id=beer_id,
+            notes_count=notes_count,
+            notes_sum=notes_sum,
+            average_note=notes_sum / notes_count,
+            min_note=notes[0],
+            max_note=notes[-1],
+            notes_distribution=distribution,
+            is_frozen=False,
+        ))
+
+    RoomBeerResult.objects.bulk_create(results, batch_size=500)
+    RoomBeerResult.objects.filter(room__state='FINISHED').update(is_frozen=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0007_alter_hop_options_alter_hop_country'),
+        ('rooms', '0001_initial'),
+        ('ratings', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomBeerResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notes_count', models.PositiveIntegerField(default=0)),
+                ('notes_sum', models.PositiveIntegerField(default=0)),
+                ('average_note', models.FloatField(blank=True, null=True)),
+                ('min_note', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_note', models.PositiveIntegerField(blank=True, null=True)),
+                ('notes_distribution', models.JSONField(blank=True, default=dict, help_text='Number of ratings per note, e.g. {"7": 2, "8": 1}')),
+                ('is_frozen', models.BooleanField(default=False, help_text='Results of finished rooms are not updated anymore')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('beer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_results', to='beers.beer')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='rooms.room')),
+            ],
+            options={
+                'verbose_name_plural': 'Room Beer Results',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='roombeerresult',
+            constraint=models.UniqueConstraint(fields=('room', 'beer'), name='unique_room_beer_result'),
+        ),
+        migrations.RunPython(backfill_room_beer_results, migrations.RunPython.noop),
+    ]
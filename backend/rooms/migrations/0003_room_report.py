@@ -0,0 +1,32 @@
+# Generated by Django 4.2.4 on 2026-10-18 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('rooms', '0002_room_beer_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(help_text='Report file, named after SHA-256 of its content', upload_to='reports/')),
+                ('checksum', models.CharField(help_text='SHA-256 of the report file, used as its ETag', max_length=64)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reports', to='rooms.room')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roomreport',
+            constraint=models.UniqueConstraint(fields=('room', 'user'), name='unique_room_user_report'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+SCHEDULE_NAME = 'Sweep inactive users in rooms'
+
+
+def create_inactive_users_sweep_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            'func': 'rooms.queue.schedules.sweep_inactive_users_in_rooms',
+            'schedule_type': 'I',  # Schedule.MINUTES
+            'minutes': 1,
+            'repeats': -1,
+        }
+    )
+
+
+def delete_inactive_users_sweep_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_q', '0017_task_cluster_alter'),
+        ('rooms', '0003_room_report'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_inactive_users_sweep_schedule, delete_inactive_users_sweep_schedule),
+    ]
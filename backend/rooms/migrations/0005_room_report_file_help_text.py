@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0004_inactive_users_sweep_schedule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='roomreport',
+            name='file',
+            field=models.FileField(help_text='Report file, deleted together with the report', upload_to='reports/'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:55
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def mark_frozen_results(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    RoomBeerResult = apps.get_model('rooms', 'RoomBeerResult')
+
+    frozen = RoomBeerResult.objects.filter(is_frozen=True).values('room_id').annotate(frozen_at=Max('updated_at'))
+    for row in frozen:
+        Room.objects.filter(pk=row['room_id']).update(results_frozen_at=row['frozen_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_room_report_file_help_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='results_frozen_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When results of the room were frozen, set once the room is finished', null=True),
+        ),
+        migrations.RunPython(mark_frozen_results, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from core.shared.operations import PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0008_beer_search_document'),
+        ('rooms', '0006_room_results_frozen_at'),
+    ]
+
+    operations = [
+        # pg_trgm extension is created by beers.0008_beer_search_document
+        PostgresAddIndex(
+            model_name='room',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'),
+                name='room_name_trgm'
+            ),
+        ),
+    ]
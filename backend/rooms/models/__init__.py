@@ -1,3 +1,5 @@
 from .beer_in_room import BeerInRoom
 from .room import Room
 from .user_in_room import UserInRoom
+from .room_beer_result import RoomBeerResult
+from .room_report import RoomReport
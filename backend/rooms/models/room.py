@@ -1,6 +1,47 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Upper
+
+
+def count_related(model: type[models.Model], field_name: str) -> Coalesce:
+    """Counts rows of `model` pointing to the outer room by `field_name`, without joining them into the query."""
+
+    rows = model.objects.filter(
+        **{field_name: OuterRef('pk')}
+    ).order_by().values(field_name).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(rows), Value(0))
+
+
+def max_related(model: type[models.Model], field_name: str, value_field: str) -> Subquery:
+    """Latest `value_field` of rows of `model` pointing to the outer room by `field_name`, without joining them."""
+
+    rows = model.objects.filter(
+        **{field_name: OuterRef('pk')}
+    ).order_by().values(field_name).annotate(value=Max(value_field)).values('value')
+    return Subquery(rows)
+
+
+class RoomQuerySet(models.QuerySet):
+
+    def with_counts(self) -> 'RoomQuerySet':
+        """Annotates `users_count`, `beers_count` and `ratings_count` used by room serializers."""
+
+        return self.annotate(
+            users_count=count_related(self.model.users.through, 'room'),
+            beers_count=count_related(self.model.beers.through, 'room'),
+            ratings_count=count_related(self.model._meta.get_field('ratings').related_model, 'room'),
+        )
+
+    def with_related_last_modified(self) -> 'RoomQuerySet':
+        """Annotates `users_last_joined_at` and `beers_last_updated_at`, used by validators of conditional requests."""
+
+        return self.annotate(
+            users_last_joined_at=max_related(self.model.users.through, 'room', 'joined_at'),
+            beers_last_updated_at=max_related(self.model.beers.through, 'room', 'updated_at'),
+        )
 
 
 class Room(models.Model):
@@ -37,6 +78,10 @@ class Room(models.Model):
         choices=State.choices,
         default=State.WAITING
     )
+    results_frozen_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text='When results of the room were frozen, set once the room is finished'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     users = models.ManyToManyField(
@@ -54,6 +99,19 @@ class Room(models.Model):
         help_text='Beers to be reviewed in the room'
     )
 
+    objects = RoomQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # `icontains` search of ratings by the room name compares `UPPER(name)`, the index covers the same expression
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='room_name_trgm'),
+        ]
+
+    # set by `RoomQuerySet.with_counts`, counted one by one otherwise
+    _users_count: int | None = None
+    _beers_count: int | None = None
+    _ratings_count: int | None = None
+
     def __str__(self):
         return f"'{self.name}' {self.users_count}/{self.slots} - {self.state.lower()}"
 
@@ -63,4 +121,31 @@ class Room(models.Model):
 
     @property
     def users_count(self) -> int:
-        return self.users.count()
+        # might be annotated by the queryset, e.g. `.annotate(users_count=Count('users'))`
+        if self._users_count is None:
+            return self.users.count()
+        return self._users_count
+
+    @users_count.setter
+    def users_count(self, value: int) -> None:
+        self._users_count = value
+
+    @property
+    def beers_count(self) -> int:
+        if self._beers_count is None:
+            return self.beers.count()
+        return self._beers_count
+
+    @beers_count.setter
+    def beers_count(self, value: int) -> None:
+        self._beers_count = value
+
+    @property
+    def ratings_count(self) -> int:
+        if self._ratings_count is None:
+            return self.ratings.count()
+        return self._ratings_count
+
+    @ratings_count.setter
+    def ratings_count(self, value: int) -> None:
+        self._ratings_count = value
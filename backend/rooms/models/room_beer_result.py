@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class RoomBeerResult(models.Model):
+    """Precomputed results (notes given by participants) of a beer reviewed in a room."""
+
+    room = models.ForeignKey(
+        'rooms.Room',
+        related_name='results',
+        on_delete=models.CASCADE
+    )
+    beer = models.ForeignKey(
+        'beers.Beer',
+        related_name='room_results',
+        on_delete=models.CASCADE
+    )
+    notes_count = models.PositiveIntegerField(default=0)
+    notes_sum = models.PositiveIntegerField(default=0)
+    average_note = models.FloatField(null=True, blank=True)
+    min_note = models.PositiveIntegerField(null=True, blank=True)
+    max_note = models.PositiveIntegerField(null=True, blank=True)
+    notes_distribution = models.JSONField(
+        default=dict, blank=True,
+        help_text='Number of ratings per note, e.g. {"7": 2, "8": 1}'
+    )
+    is_frozen = models.BooleanField(
+        default=False,
+        help_text='Results of finished rooms are not updated anymore'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Room Beer Results'
+        constraints = [
+            models.UniqueConstraint(fields=('room', 'beer'), name='unique_room_beer_result'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.room.name} - {self.beer.name} - {self.average_note} ({self.notes_count})"
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import models
+
+
+class RoomReport(models.Model):
+    """Excel report with results of a finished room, generated once per participant."""
+
+    room = models.ForeignKey(
+        'rooms.Room',
+        related_name='reports',
+        on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='room_reports',
+        on_delete=models.CASCADE
+    )
+    file = models.FileField(
+        upload_to='reports/',
+        help_text='Report file, deleted together with the report'
+    )
+    checksum = models.CharField(
+        max_length=64,
+        help_text='SHA-256 of the report file, used as its ETag'
+    )
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('room', 'user'), name='unique_room_user_report'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.room.name} - {self.user.username} - {self.checksum[:8]}"
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.checksum}"'
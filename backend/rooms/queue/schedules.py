@@ -1,14 +1,21 @@
 from datetime import timedelta
 
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.utils import timezone
 from django_q.models import Schedule
 from django_q.tasks import schedule
 
 from core.shared.queue import get_function_module_path
+from rooms.consumers import RoomConsumer
+from rooms.heartbeats import INACTIVE_TIMEOUT_SECONDS
 from rooms.models import UserInRoom
+from rooms.state import USERS, ROOM, get_room_users, invalidate_room_state
 
 DEFAULT_INACTIVE_USERS_REMOVAL_MINUTES = 24 * 60
 
+INACTIVE_USERS_SWEEP_SCHEDULE_NAME = 'Sweep inactive users in rooms'
+
 
 def remove_inactive_users_in_rooms(minutes: int = DEFAULT_INACTIVE_USERS_REMOVAL_MINUTES):
     """Remove inactive users from rooms."""
@@ -29,3 +36,48 @@ def schedule_inactive_users_in_rooms_removal(*args, **kwargs) -> Schedule:
         repeats=-1,
         **kwargs
     )
+
+
+def sweep_inactive_users_in_rooms(seconds: int = INACTIVE_TIMEOUT_SECONDS) -> list[str]:
+    """
+    Remove users, who have not been active in the last `seconds`, from all rooms at once
+    and publish updated list of users to each affected room. Returns names of affected rooms.
+    """
+
+    inactive_users_in_rooms = UserInRoom.objects.filter(
+        last_active__lte=timezone.now() - timedelta(seconds=seconds)
+    )
+    room_names = list(
+        inactive_users_in_rooms.order_by().values_list('room__name', flat=True).distinct()
+    )
+    if not room_names:
+        return []
+
+    inactive_users_in_rooms.delete()
+
+    for room_name in room_names:
+        invalidate_room_state(room_name, USERS, ROOM)
+        publish_users_in_room(room_name)
+
+    return room_names
+
+
+def publish_users_in_room(room_name: str) -> None:
+    # recorded in the sync log, so that clients which opted in to delta sync receive a patch as well
+    async_to_sync(RoomConsumer.broadcast_synced)(
+        get_channel_layer(),
+        room_name,
+        {'command': 'set_users', 'data': get_room_users(room_name)},
+    )
+
+
+def schedule_inactive_users_in_rooms_sweep(*args, **kwargs) -> Schedule:
+    return schedule(
+        get_function_module_path(sweep_inactive_users_in_rooms),
+        *args,
+        name=INACTIVE_USERS_SWEEP_SCHEDULE_NAME,
+        schedule_type=Schedule.MINUTES,
+        minutes=1,
+        repeats=-1,
+        **kwargs
+    )
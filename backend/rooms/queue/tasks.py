@@ -0,0 +1,68 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django_q.tasks import async_task
+
+from core.shared.queue import get_function_module_path
+from rooms.consumers import RoomConsumer
+from rooms.models import Room, RoomReport
+from rooms.reports import get_or_create_excel_report, store_room_reports
+
+User = get_user_model()
+
+
+def generate_room_report(room_id: int, user_id: int) -> int:
+    """Generate (or reuse) report of the user and let them know it is ready. Returns id of the report."""
+
+    room = Room.objects.get(id=room_id)
+    user = User.objects.get(id=user_id)
+
+    report = get_or_create_excel_report(room, user)
+    publish_report_ready(report)
+    return report.id
+
+
+def generate_room_reports(room_id: int) -> list[int]:
+    """Generate missing reports of all participants of a finished room. Returns ids of new reports."""
+
+    room = Room.objects.get(id=room_id)
+
+    reports = store_room_reports(room)
+    for report in reports:
+        publish_report_ready(report)
+    return [report.id for report in reports]
+
+
+def publish_report_ready(report: RoomReport) -> None:
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        RoomConsumer.get_private_group_name(report.room.name, report.user_id),
+        {
+            'type': 'report_ready',
+            'data': {
+                'room': report.room.name,
+                'checksum': report.checksum,
+                'size': report.size,
+            }
+        }
+    )
+
+
+def enqueue_room_report(room: Room, user: User) -> str:
+    """Enqueue generation of user's report on the django-q cluster. Returns id of the task."""
+
+    return async_task(
+        get_function_module_path(generate_room_report),
+        room.id, user.id,
+        group=f'room_reports_{room.name}',
+    )
+
+
+def enqueue_room_reports(room: Room) -> str:
+    """Enqueue generation of reports of all participants of the room. Returns id of the task."""
+
+    return async_task(
+        get_function_module_path(generate_room_reports),
+        room.id,
+        group=f'room_reports_{room.name}',
+    )
@@ -0,0 +1,195 @@
+"""
+Bounded replay buffer of events broadcast to rooms, for resuming after a reconnect.
+
+Every event broadcast to a room gets a sequence number (`seq`) and is kept, already encoded,
+in a per-room ring buffer of the last `ROOM_REPLAY_BUFFER_SIZE` events.
+Client which reconnects with `?since=<seq>` receives only events it has missed,
+instead of refetching users, beers, room state and losing chat messages sent in the meantime.
+If the events it has missed are not in the buffer anymore, it receives a full `session_snapshot`.
+
+Buffer is kept in memory of the process by default, which is enough with the in-memory channel layer.
+Buffers of rooms without events for `ROOM_REPLAY_CACHE_TIMEOUT_SECONDS` are dropped, as well as the least recently
+used ones over `ROOM_REPLAY_MAX_ROOMS`. With multiple processes (Redis channel layer),
+`ROOM_REPLAY_BUFFER_BACKEND = 'cache'` keeps it in the shared cache (Redis) instead, where entries expire.
+
+Sequence numbers start from the current time in milliseconds, so that they keep increasing
+after the buffer is created again (process restart, expired cache entries).
+The initial sequence number of every counter is kept as well, `since` lower than it was given
+by another (e.g. expired) counter and the client has to fetch everything again.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+ROOM_REPLAY_BUFFER_SIZE = 100
+ROOM_REPLAY_MAX_ROOMS = 1000
+
+ROOM_REPLAY_CACHE_PREFIX = 'rooms:replay'
+ROOM_REPLAY_CACHE_TIMEOUT_SECONDS = 15 * 60
+
+
+def get_initial_seq() -> int:
+    return int(time.time() * 1000)
+
+
+class MemoryReplayBuffer:
+
+    def __init__(
+        self,
+        size: int = ROOM_REPLAY_BUFFER_SIZE,
+        timeout: int = ROOM_REPLAY_CACHE_TIMEOUT_SECONDS,
+        max_rooms: int = ROOM_REPLAY_MAX_ROOMS
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.max_rooms = max_rooms
+        self._initial_seq: dict[str, int] = {}
+        self._last_seq: dict[str, int] = {}
+        self._events: dict[str, OrderedDict[int, str]] = {}
+        # rooms from the least to the most recently used, with the time of their last use
+        self._used_at: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _touch(self, room_name: str) -> None:
+        """Marks the room as used and evicts expired and least recently used rooms, called with the lock held."""
+
+        now = time.monotonic()
+        self._used_at[room_name] = now
+        self._used_at.move_to_end(room_name)
+
+        while self._used_at:
+            oldest_room_name, used_at = next(iter(self._used_at.items()))
+            if len(self._used_at) <= self.max_rooms and now - used_at < self.timeout:
+                break
+
+            del self._used_at[oldest_room_name]
+            self._initial_seq.pop(oldest_room_name, None)
+            self._last_seq.pop(oldest_room_name, None)
+            self._events.pop(oldest_room_name, None)
+
+    def _get_last_seq(self, room_name: str) -> int:
+        """Returns the last sequence number of the room, starting a new counter if needed, called with the lock held."""
+
+        self._touch(room_name)
+        if room_name not in self._last_seq:
+            self._initial_seq[room_name] = self._last_seq[room_name] = get_initial_seq()
+        return self._last_seq[room_name]
+
+    def next_seq(self, room_name: str) -> int:
+        with self._lock:
+            seq = self._get_last_seq(room_name) + 1
+            self._last_seq[room_name] = seq
+            return seq
+
+    def current_seq(self, room_name: str) -> int:
+        with self._lock:
+            return self._get_last_seq(room_name)
+
+    def store(self, room_name: str, seq: int, text_data: str) -> None:
+        with self._lock:
+            self._touch(room_name)
+            events = self._events.setdefault(room_name, OrderedDict())
+            events[seq] = text_data
+            while len(events) > self.size:
+                events.popitem(last=False)
+
+    def get_since(self, room_name: str, since: int) -> list[str] | None:
+        """Returns events which came after `since`, or `None` if some of them are not in the buffer anymore."""
+
+        with self._lock:
+            last_seq = self._get_last_seq(room_name)
+            initial_seq = self._initial_seq[room_name]
+            events = dict(self._events.get(room_name, {}))
+
+        if not max(initial_seq, last_seq - self.size) <= since <= last_seq:
+            return None
+
+        seqs = range(since + 1, last_seq + 1)
+        if any(seq not in events for seq in seqs):
+            return None
+
+        return [events[seq] for seq in seqs]
+
+
+class CacheReplayBuffer:
+    """
+    Keeps events in the cache, shared by all processes. Counter is incremented atomically,
+    every event is a separate entry, entries older than the last `size` events are never read and expire.
+    """
+
+    def __init__(self, size: int = ROOM_REPLAY_BUFFER_SIZE, timeout: int = ROOM_REPLAY_CACHE_TIMEOUT_SECONDS):
+        self.size = size
+        self.timeout = timeout
+
+    @staticmethod
+    def get_seq_cache_key(room_name: str) -> str:
+        return f'{ROOM_REPLAY_CACHE_PREFIX}:{room_name}:seq'
+
+    @staticmethod
+    def get_initial_seq_cache_key(room_name: str) -> str:
+        return f'{ROOM_REPLAY_CACHE_PREFIX}:{room_name}:initial'
+
+    @staticmethod
+    def get_event_cache_key(room_name: str, seq: int) -> str:
+        return f'{ROOM_REPLAY_CACHE_PREFIX}:{room_name}:{seq}'
+
+    def add_counter(self, room_name: str) -> int:
+        """Starts a new counter of the room, unless it exists already. Returns the initial value of a new counter."""
+
+        initial_seq = get_initial_seq()
+        if cache.add(self.get_seq_cache_key(room_name), initial_seq, timeout=self.timeout):
+            cache.set(self.get_initial_seq_cache_key(room_name), initial_seq, timeout=self.timeout)
+        return initial_seq
+
+    def next_seq(self, room_name: str) -> int:
+        key = self.get_seq_cache_key(room_name)
+        self.add_counter(room_name)
+        try:
+            seq = cache.incr(key)
+        except ValueError:
+            # counter expired right after it was added
+            self.add_counter(room_name)
+            seq = cache.incr(key)
+
+        cache.touch(key, timeout=self.timeout)
+        cache.touch(self.get_initial_seq_cache_key(room_name), timeout=self.timeout)
+        return seq
+
+    def current_seq(self, room_name: str) -> int:
+        initial_seq = self.add_counter(room_name)
+
+        seq = cache.get(self.get_seq_cache_key(room_name))
+        if seq is None:
+            # counter expired right after it was added, the next one starts from a later time
+            return initial_seq
+        return seq
+
+    def store(self, room_name: str, seq: int, text_data: str) -> None:
+        cache.set(self.get_event_cache_key(room_name, seq), text_data, timeout=self.timeout)
+
+    def get_since(self, room_name: str, since: int) -> list[str] | None:
+        """Returns events which came after `since`, or `None` if some of them are not in the buffer anymore."""
+
+        last_seq = self.current_seq(room_name)
+        initial_seq = cache.get(self.get_initial_seq_cache_key(room_name))
+        # missing initial value is not trusted, the counter may have expired and started again
+        if initial_seq is None or not max(initial_seq, last_seq - self.size) <= since <= last_seq:
+            return None
+
+        keys = [self.get_event_cache_key(room_name, seq) for seq in range(since + 1, last_seq + 1)]
+        events = cache.get_many(keys)
+        if len(events) != len(keys):
+            return None
+
+        return [events[key] for key in keys]
+
+
+REPLAY_BUFFER_BACKENDS = {
+    'memory': MemoryReplayBuffer,
+    'cache': CacheReplayBuffer,
+}
+
+replay_buffer = REPLAY_BUFFER_BACKENDS[getattr(settings, 'ROOM_REPLAY_BUFFER_BACKEND', 'memory')]()
@@ -1,9 +1,12 @@
+import hashlib
+import tempfile
 from io import BytesIO
-from tempfile import NamedTemporaryFile
-from typing import NamedTuple
+from typing import NamedTuple, BinaryIO
 
 from django.contrib.auth import get_user_model
-from django.utils import timezone
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 
@@ -11,9 +14,12 @@ from rooms.async_db import (
     get_final_user_beer_ratings,
     get_final_beers_ratings
 )
+from rooms.models import Room, RoomReport
 
 User = get_user_model()
 
+REPORT_CHUNK_SIZE = 64 * 1024
+
 MAIN_HEADERS = [
     'NUMER', 'KOLOR', 'PIANA', 'ZAPACH', 'SMAK', 'OPINIA', 'OCENA KOŃCOWA'
 ]
@@ -96,29 +102,125 @@ def collect_beer_ratings(room_name) -> list[BeerRatingRow]:
     return ratings
 
 
-def generate_excel_report(room_name: str, user: User) -> BytesIO:
-    now = timezone.now()
-    wb = Workbook()
+def build_excel_report(
+    room_name: str,
+    user: User,
+    write_only: bool = True,
+    final_ratings: list[BeerRatingRow] | None = None
+) -> Workbook:
+    """
+    Builds workbook with user's ratings and final results of the room.
+    Write-only workbook does not keep cells in memory, rows are serialized as they are appended.
+    Final results are the same for every participant, they can be collected once and passed in.
+    """
+    wb = Workbook(write_only=write_only)
 
     # main sheet with user's ratings
-    main_sheet = wb.active
+    main_sheet = wb.create_sheet('Twoje oceny') if write_only else wb.active
     main_sheet.title = 'Twoje oceny'
-    main_sheet.append(MAIN_HEADERS)
+    # in write-only mode columns have to be formatted before any row is appended
     format_columns_width(main_sheet, MAIN_HEADERS)
+    main_sheet.append(MAIN_HEADERS)
     user_ratings = collect_user_ratings(room_name=room_name, user=user)
     for user_rating in user_ratings:
         main_sheet.append(user_rating)
 
     # second sheet with results (average ratings)
     second_sheet = wb.create_sheet('Podsumowanie')
-    second_sheet.append(SECOND_HEADERS)
     format_columns_width(second_sheet, SECOND_HEADERS)
-    final_ratings = collect_beer_ratings(room_name=room_name)
+    second_sheet.append(SECOND_HEADERS)
+    if final_ratings is None:
+        final_ratings = collect_beer_ratings(room_name=room_name)
     for final_rating in final_ratings:
         second_sheet.append(final_rating)
 
-    # save to temporary file and return it as a buffer
-    with NamedTemporaryFile() as tmp:
-        wb.save(tmp.name)
-        output = BytesIO(tmp.read())
-        return output
+    return wb
+
+
+def generate_excel_report(room_name: str, user: User, write_only: bool = False) -> BytesIO:
+    """Saves the whole report into an in-memory buffer."""
+
+    wb = build_excel_report(room_name, user, write_only=write_only)
+
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def write_excel_report(
+    room_name: str,
+    user: User,
+    output: BinaryIO,
+    final_ratings: list[BeerRatingRow] | None = None
+) -> int:
+    """
+    Builds write-only report and saves it into the given binary file, returns size of the report.
+    Rows are serialized as they are appended and the archive is written straight into the file,
+    which should be a temporary file on disk, so that the report is never held in memory as a whole.
+    """
+    wb = build_excel_report(room_name, user, write_only=True, final_ratings=final_ratings)
+    wb.save(output)
+    return output.tell()
+
+
+def get_file_checksum(file: BinaryIO) -> str:
+    checksum = hashlib.sha256()
+    for chunk in iter(lambda: file.read(REPORT_CHUNK_SIZE), b''):
+        checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def get_report_file_name(room: Room, user: User) -> str:
+    return f'reports/room_{room.id}_user_{user.id}.xlsx'
+
+
+def store_excel_report(
+    room: Room,
+    user: User,
+    final_ratings: list[BeerRatingRow] | None = None
+) -> RoomReport:
+    """
+    Generates report of the user and saves it through the default storage.
+    File of the previous report of the user (if any) is deleted, once the new one is committed.
+    """
+    previous_file_name = RoomReport.objects.filter(room=room, user=user).values_list('file', flat=True).first()
+
+    with tempfile.TemporaryFile() as output:
+        size = write_excel_report(room.name, user, output, final_ratings=final_ratings)
+        output.seek(0)
+        checksum = get_file_checksum(output)
+
+        output.seek(0)
+        # storage copies the file in chunks, name gets a suffix if the previous file still exists
+        file_name = default_storage.save(get_report_file_name(room, user), File(output))
+
+    report, _ = RoomReport.objects.update_or_create(
+        room=room, user=user,
+        defaults={'file': file_name, 'checksum': checksum, 'size': size}
+    )
+
+    if previous_file_name and previous_file_name != file_name:
+        transaction.on_commit(lambda: default_storage.delete(previous_file_name), robust=True)
+
+    return report
+
+
+def get_or_create_excel_report(room: Room, user: User) -> RoomReport:
+    """Returns stored report of the user, generating it on the first request."""
+
+    try:
+        return RoomReport.objects.get(room=room, user=user)
+    except RoomReport.DoesNotExist:
+        return store_excel_report(room, user)
+
+
+def store_room_reports(room: Room) -> list[RoomReport]:
+    """Generates missing reports of all participants of the room, collecting final results once."""
+
+    users = room.users.exclude(room_reports__room=room)
+    if not users:
+        return []
+
+    final_ratings = collect_beer_ratings(room_name=room.name)
+    return [store_excel_report(room, user, final_ratings=final_ratings) for user in users]
@@ -0,0 +1,147 @@
+"""
+Materialized results of beers reviewed in rooms.
+
+`RoomBeerResult` rows hold aggregated notes of every (room, beer) pair, so that results screens,
+Excel reports and admin read a single precomputed row instead of aggregating `Rating` each time.
+A row is refreshed whenever a note of a rating in its room changes and frozen for good,
+once the room reaches `Room.State.FINISHED` (marked with `Room.results_frozen_at`).
+"""
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ratings.models import Rating
+from rooms.models import Room, RoomBeerResult, RoomReport
+
+
+def summarize_notes_distribution(distribution: dict[str, int]) -> dict:
+    """Computes aggregated fields of `RoomBeerResult` from numbers of ratings per note."""
+
+    notes = sorted(int(note) for note, count in distribution.items() if count)
+    notes_count = sum(distribution[str(note)] for note in notes)
+    notes_sum = sum(note * distribution[str(note)] for note in notes)
+
+    return {
+        'notes_count': notes_count,
+        'notes_sum': notes_sum,
+        'average_note': notes_sum / notes_count if notes_count else None,
+        'min_note': notes[0] if notes else None,
+        'max_note': notes[-1] if notes else None,
+        'notes_distribution': {str(note): distribution[str(note)] for note in notes},
+    }
+
+
+def get_notes_distributions(room_id: int, beer_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+    """Returns numbers of ratings per note of given beers in the room, using a single query."""
+
+    distributions = defaultdict(dict)
+
+    notes_counts = Rating.objects.filter(
+        room_id=room_id,
+        beer_id__in=beer_ids,
+        note__isnull=False,
+    ).values('beer_id', 'note').annotate(count=Count('id')).order_by()
+
+    for row in notes_counts:
+        distributions[row['beer_id']][str(row['note'])] = row['count']
+
+    return distributions
+
+
+@transaction.atomic
+def refresh_room_beer_result(room_id: int | None, beer_id: int, create: bool = True) -> None:
+    """
+    Recalculates results of a single beer in the room, unless they are frozen.
+    Missing row is created only if `create` is set - rows must not be recreated while
+    ratings are deleted together with their beer.
+    """
+
+    if room_id is None:
+        return
+
+    # row is locked before notes are aggregated, concurrent ratings of the same beer are aggregated
+    # one after another, each of them seeing the note committed by the previous one
+    locked = RoomBeerResult.objects.select_for_update().filter(room_id=room_id, beer_id=beer_id)
+    if (result := locked.first()) is None:
+        if not create:
+            return
+        RoomBeerResult.objects.get_or_create(room_id=room_id, beer_id=beer_id)
+        result = locked.first()
+
+    # frozen rows are left untouched
+    if result.is_frozen:
+        return
+
+    distribution = get_notes_distributions(room_id, [beer_id]).get(beer_id, {})
+    values = summarize_notes_distribution(distribution)
+
+    RoomBeerResult.objects.filter(pk=result.pk).update(**values, updated_at=timezone.now())
+
+
+@transaction.atomic
+def freeze_room_results(room: Room) -> bool:
+    """
+    Refreshes results of all beers in the room one last time and freezes them.
+    Returns False if results had already been frozen.
+    """
+    frozen_at = timezone.now()
+    # marker is set atomically, results are frozen only once, also in rooms without any beers
+    if not Room.objects.filter(pk=room.pk, results_frozen_at__isnull=True).update(results_frozen_at=frozen_at):
+        return False
+
+    room.results_frozen_at = frozen_at
+
+    beer_ids = list(room.beers_through.values_list('beer_id', flat=True))
+    distributions = get_notes_distributions(room.id, beer_ids)
+
+    for beer_id in beer_ids:
+        values = summarize_notes_distribution(distributions.get(beer_id, {}))
+        RoomBeerResult.objects.update_or_create(
+            room=room, beer_id=beer_id,
+            defaults={**values, 'is_frozen': True}
+        )
+
+    return True
+
+
+def delete_room_reports_on_commit(room_id: int, user_id: int | None = None) -> None:
+    """Drops stored reports of the room (of a single user, if given), they are generated again on the next request."""
+
+    reports = RoomReport.objects.filter(room_id=room_id)
+    if user_id is not None:
+        reports = reports.filter(user_id=user_id)
+    transaction.on_commit(reports.delete, robust=True)
+
+
+def refresh_late_room_beer_result(room_name: str, beer_id: int | str, submitted_at: datetime) -> bool:
+    """
+    Rating forms are written with a delay (see `rooms.autosave`), a form submitted before the room was finished
+    may be written after its results were frozen. Frozen result of the beer is refreshed with it then,
+    reports of the room, which include results, are dropped to be generated again.
+    Returns True if the result has changed.
+    """
+    room = Room.objects.filter(name=room_name, results_frozen_at__gt=submitted_at).first()
+    if room is None:
+        return False
+
+    beer_id = int(beer_id)
+    # members flush their forms at once when the room is finished, notes are aggregated with the row locked,
+    # so that the last writer does not store a distribution missing a concurrently written note
+    result = RoomBeerResult.objects.select_for_update().filter(room=room, beer_id=beer_id, is_frozen=True).first()
+    if result is None:
+        return False
+
+    values = summarize_notes_distribution(get_notes_distributions(room.id, [beer_id]).get(beer_id, {}))
+    if all(getattr(result, field) == value for field, value in values.items()):
+        return False
+
+    for field, value in values.items():
+        setattr(result, field, value)
+    result.save()
+
+    delete_room_reports_on_commit(room.id)
+    return True
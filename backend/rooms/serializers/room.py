@@ -20,7 +20,7 @@ class RoomSerializer(serializers.ModelSerializer):
             'id', 'name', 'has_password',
             'host', 'slots', 'state',
             'created_at', 'updated_at',
-            'users', 'beers', 'users_count',
+            'users', 'beers', 'users_count', 'beers_count',
         )
 
 
@@ -36,7 +36,8 @@ class RoomListSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'has_password',
             'host', 'slots', 'state',
-            'created_at', 'updated_at', 'users_count',
+            'created_at', 'updated_at',
+            'users_count', 'beers_count', 'ratings_count',
         )
 
 
@@ -96,6 +97,10 @@ class DetailedRoomSerializer(RoomSerializer):
     users = UserSerializer(many=True, read_only=True)
     beers = SimplifiedBeerSerializer(many=True, read_only=True)
 
+    class Meta(RoomSerializer.Meta):
+        # ratings are not a part of the websocket room state (`RoomSerializer`), it would go stale
+        fields = RoomSerializer.Meta.fields + ('ratings_count',)
+
 
 class RoomJoinSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, allow_blank=True)
@@ -163,7 +168,7 @@ class RoomAddBeerSerializer(serializers.Serializer):
         )
         return Beer.objects.filter(rooms=self.room).order_by(
             'rooms_through__order'
-        )
+        ).prefetch_related('hops')
 
 
 class RoomDeleteBeerSerializer(serializers.Serializer):
@@ -1,7 +1,15 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 
-from rooms.models import Room
+from beers.models import Beer
+from ratings.models import Rating
+from rooms.models import Room, BeerInRoom, UserInRoom, RoomReport
+from rooms.queue.tasks import enqueue_room_reports
+from rooms.results import refresh_room_beer_result, freeze_room_results, delete_room_reports_on_commit
+from rooms.state import USERS, BEERS, ROOM, invalidate_room_state_on_commit
+
+M2M_CHANGED_ACTIONS = ('post_add', 'post_remove', 'post_clear')
 
 
 @receiver(post_save, sender=Room)
@@ -10,3 +18,108 @@ def add_host_to_participants_on_create(sender, instance, created, **kwargs):
     if created and instance.host:
         instance.users.add(instance.host)
 
+
+@receiver(post_save, sender=Room)
+def freeze_results_on_room_finish(sender, instance: Room, **kwargs):
+    if instance.state != Room.State.FINISHED:
+        return
+
+    if freeze_room_results(instance):
+        # reports of all participants are generated in the background, once results are committed
+        transaction.on_commit(lambda: enqueue_room_reports(instance), robust=True)
+
+
+@receiver(post_save, sender=Rating)
+def refresh_room_beer_result_on_rating_save(sender, instance: Rating, **kwargs):
+    refresh_room_beer_result(instance.room_id, instance.beer_id)
+
+
+@receiver(post_delete, sender=Rating)
+def refresh_room_beer_result_on_rating_delete(sender, instance: Rating, **kwargs):
+    refresh_room_beer_result(instance.room_id, instance.beer_id, create=False)
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def delete_outdated_room_report(sender, instance: Rating, **kwargs):
+    if not instance.room_id or not instance.added_by_id:
+        return
+
+    # reports exist for finished rooms only, ratings of running rooms (e.g. autosaves) never touch them,
+    # room is already loaded by the code saving the rating
+    if instance.room.state != Room.State.FINISHED:
+        return
+
+    # user's own ratings are part of the report, it will be generated again on the next request
+    delete_room_reports_on_commit(instance.room_id, instance.added_by_id)
+
+
+@receiver(post_delete, sender=RoomReport)
+def delete_room_report_file(sender, instance: RoomReport, **kwargs):
+    if not instance.file:
+        return
+
+    # file is kept if the transaction is rolled back
+    storage, file_name = instance.file.storage, instance.file.name
+    transaction.on_commit(lambda: storage.delete(file_name), robust=True)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_state_on_room_change(sender, instance: Room, **kwargs):
+    invalidate_room_state_on_commit(instance.name)
+
+
+@receiver(post_save, sender=UserInRoom)
+def invalidate_room_users_on_join(sender, instance: UserInRoom, created: bool, **kwargs):
+    # `last_active` bumps do not change the list of users
+    if not created:
+        return
+
+    invalidate_room_state_on_commit(instance.room.name, USERS, ROOM)
+
+
+@receiver(post_save, sender=BeerInRoom)
+@receiver(post_delete, sender=BeerInRoom)
+def invalidate_room_beers_on_change(sender, instance: BeerInRoom, **kwargs):
+    invalidate_room_state_on_commit(instance.room.name, BEERS, ROOM)
+
+
+@receiver(post_save, sender=Beer)
+def invalidate_room_beers_on_beer_change(sender, instance: Beer, created: bool, **kwargs):
+    if created:
+        return
+
+    for room_name in Room.objects.filter(beers=instance).values_list('name', flat=True):
+        invalidate_room_state_on_commit(room_name, BEERS)
+
+
+@receiver(m2m_changed, sender=Room.users.through)
+def invalidate_room_users_on_m2m_change(sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    if action not in M2M_CHANGED_ACTIONS:
+        return
+
+    for room_name in get_affected_room_names(instance, reverse, pk_set):
+        invalidate_room_state_on_commit(room_name, USERS, ROOM)
+
+
+@receiver(m2m_changed, sender=Room.beers.through)
+def invalidate_room_beers_on_m2m_change(sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    if action not in M2M_CHANGED_ACTIONS:
+        return
+
+    for room_name in get_affected_room_names(instance, reverse, pk_set):
+        invalidate_room_state_on_commit(room_name, BEERS, ROOM)
+
+
+def get_affected_room_names(instance, reverse: bool, pk_set: set | None) -> list[str]:
+    # forward relation: `room.users.add(...)`, instance is the room
+    if not reverse:
+        return [instance.name]
+
+    # reverse relation: `user.rooms_joined.add(...)`, pk_set holds ids of rooms,
+    # it is empty on `clear()` - affected rooms are unknown then, cache entries will expire
+    if not pk_set:
+        return []
+
+    return list(Room.objects.filter(pk__in=pk_set).values_list('name', flat=True))
@@ -0,0 +1,143 @@
+"""
+In-memory state engine for rooms.
+
+Users, beers and state of a room are loaded from the database and serialized once,
+then kept in the cache (local memory by default, Redis in dev/prod settings).
+Websocket handlers read from here instead of querying and serializing on every event.
+
+Entries are refreshed on writes (once committed) - see `rooms.signals` and `rooms.async_db`.
+Every section has a generation, which is part of the key of its entry and is bumped on writes,
+so that a reader which loaded the section before a write cannot put the old data back in the cache.
+"""
+import time
+from typing import Any, Callable
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from beers.models import Beer
+from beers.serializers import BeerRepresentationalSerializer
+from rooms.models import Room
+from rooms.serializers import RoomSerializer
+from users.serializers.user import UserSerializer
+
+User = get_user_model()
+
+ROOM_STATE_CACHE_PREFIX = 'rooms:state'
+ROOM_STATE_CACHE_TIMEOUT_SECONDS = 15 * 60
+
+USERS = 'users'
+BEERS = 'beers'
+ROOM = 'room'
+
+SECTIONS = (USERS, BEERS, ROOM)
+
+_missing = object()
+
+
+def get_room_state_cache_key(room_name: str, section: str, generation: int) -> str:
+    return f'{ROOM_STATE_CACHE_PREFIX}:{room_name}:{section}:{generation}'
+
+
+def get_room_state_generation_cache_key(room_name: str, section: str) -> str:
+    return f'{ROOM_STATE_CACHE_PREFIX}:{room_name}:{section}:generation'
+
+
+def get_room_state_generation(room_name: str, section: str) -> int:
+    key = get_room_state_generation_cache_key(room_name, section)
+    if (generation := cache.get(key)) is None:
+        # starting from the current time, a generation which was evicted is not reused
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_room_state_generation(room_name: str, section: str) -> int:
+    key = get_room_state_generation_cache_key(room_name, section)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = time.time_ns()
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+def load_room_users(room_name: str) -> list[dict]:
+    users = User.objects.filter(rooms_joined__name=room_name)
+    return UserSerializer(users, many=True).data
+
+
+def load_room_beers(room_name: str) -> list[dict]:
+    beers = Beer.objects.filter(
+        rooms_through__room__name=room_name
+    ).select_related(
+        'brewery', 'style'
+    ).order_by('rooms_through__order')
+    return BeerRepresentationalSerializer(beers, many=True).data
+
+
+def load_room(room_name: str) -> dict | None:
+    try:
+        room = Room.objects.prefetch_related('users', 'beers').get(name=room_name)
+    except ObjectDoesNotExist:
+        return None
+
+    return RoomSerializer(room).data
+
+
+LOADERS: dict[str, Callable[[str], Any]] = {
+    USERS: load_room_users,
+    BEERS: load_room_beers,
+    ROOM: load_room,
+}
+
+
+def get_room_section(room_name: str, section: str) -> Any:
+    # generation is read before loading, data loaded before a concurrent write ends up under the outdated key
+    key = get_room_state_cache_key(room_name, section, get_room_state_generation(room_name, section))
+    data = cache.get(key, _missing)
+
+    if data is not _missing:
+        return data
+
+    data = LOADERS[section](room_name)
+    if data is not None:
+        cache.set(key, data, timeout=ROOM_STATE_CACHE_TIMEOUT_SECONDS)
+    return data
+
+
+def set_room_section(room_name: str, section: str, data: Any) -> None:
+    """Puts data of a committed write in the cache, replacing the section for every reader."""
+
+    key = get_room_state_cache_key(room_name, section, bump_room_state_generation(room_name, section))
+    cache.set(key, data, timeout=ROOM_STATE_CACHE_TIMEOUT_SECONDS)
+
+
+def invalidate_room_state(room_name: str, *sections: str) -> None:
+    """Drop cached sections of the room state. Drops all of them if none were given."""
+
+    for section in sections or SECTIONS:
+        bump_room_state_generation(room_name, section)
+
+
+def invalidate_room_state_on_commit(room_name: str, *sections: str) -> None:
+    """
+    Drop cached sections of the room state once the current transaction is committed.
+    Dropped earlier, they could be loaded again by a concurrent reader with the old data,
+    which would stay in the cache until it expires.
+    """
+    transaction.on_commit(lambda: invalidate_room_state(room_name, *sections), robust=True)
+
+
+def get_room_users(room_name: str) -> list[dict]:
+    return get_room_section(room_name, USERS)
+
+
+def get_room_beers(room_name: str) -> list[dict]:
+    return get_room_section(room_name, BEERS)
+
+
+def get_room(room_name: str) -> dict | None:
+    return get_room_section(room_name, ROOM)
@@ -0,0 +1,135 @@
+"""
+Versioned delta sync of room users, beers and state.
+
+Every room has a sync log in the cache: the last document sent to clients
+(`{'users': [...], 'beers': [...], 'room': {...}}`), its version and a bounded history of JSON patches.
+When a section changes, a patch against the previous document is recorded and the version is bumped.
+
+Clients which opted in (`sync_room` command with their last acknowledged version) receive only patches,
+a full snapshot is sent when they are too far behind (patches older than the history were dropped).
+
+Initial version of a log is based on the current time, so that versions keep increasing
+even if the log expired from the cache and had to be created again.
+"""
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from django.core.cache import cache
+
+from core.shared.cache import delete_if_equal
+from core.shared.json_patch import make_patch, JSONPatch
+from rooms.state import SECTIONS, get_room_section
+
+ROOM_SYNC_CACHE_PREFIX = 'rooms:sync'
+ROOM_SYNC_CACHE_TIMEOUT_SECONDS = 15 * 60
+ROOM_SYNC_HISTORY_SIZE = 50
+
+ROOM_SYNC_LOCK_TIMEOUT_SECONDS = 5
+ROOM_SYNC_LOCK_RETRY_SECONDS = 0.01
+
+
+class RoomSyncLockTimeout(Exception):
+    pass
+
+
+def get_room_sync_cache_key(room_name: str) -> str:
+    return f'{ROOM_SYNC_CACHE_PREFIX}:{room_name}'
+
+
+@contextmanager
+def room_sync_lock(room_name: str):
+    """
+    Serializes updates of the log of a room, also between processes sharing the cache.
+    Raises `RoomSyncLockTimeout` if the lock could not be acquired in time, the log is never updated unlocked.
+
+    Waiting blocks the thread, consumers call it outside of the thread-sensitive executor (see `rooms.async_db`).
+    """
+    key = f'{get_room_sync_cache_key(room_name)}:lock'
+    # lock is released by its holder only, not by a process which held it before it expired
+    token = secrets.randbits(63)
+    deadline = time.monotonic() + ROOM_SYNC_LOCK_TIMEOUT_SECONDS
+
+    # lock expires on its own, if the process holding it died
+    while not cache.add(key, token, timeout=ROOM_SYNC_LOCK_TIMEOUT_SECONDS):
+        if time.monotonic() >= deadline:
+            raise RoomSyncLockTimeout(f'Sync log of room {room_name} is locked')
+        time.sleep(ROOM_SYNC_LOCK_RETRY_SECONDS)
+
+    try:
+        yield
+    finally:
+        delete_if_equal(key, token)
+
+
+def get_room_sync_log(room_name: str) -> dict:
+    return cache.get(get_room_sync_cache_key(room_name)) or {
+        'version': int(time.time() * 1000),
+        'document': {},
+        'history': [],
+    }
+
+
+def set_room_sync_log(room_name: str, log: dict) -> None:
+    cache.set(get_room_sync_cache_key(room_name), log, timeout=ROOM_SYNC_CACHE_TIMEOUT_SECONDS)
+
+
+def commit_room_sync(room_name: str, sections: dict[str, Any]) -> dict:
+    """
+    Records new data of the given sections in the sync log.
+    Returns delta between the previous and the new version, `ops` are empty if nothing has changed.
+    """
+    with room_sync_lock(room_name):
+        log = get_room_sync_log(room_name)
+        base_version = log['version']
+
+        operations: JSONPatch = []
+        for section, data in sections.items():
+            operations.extend(make_patch(log['document'].get(section), data, f'/{section}'))
+            log['document'][section] = data
+
+        if operations:
+            log['version'] += 1
+            log['history'] = [*log['history'], (log['version'], operations)][-ROOM_SYNC_HISTORY_SIZE:]
+            set_room_sync_log(room_name, log)
+
+    return {
+        'base_version': base_version,
+        'version': log['version'],
+        'ops': operations,
+    }
+
+
+def get_room_delta(room_name: str, since: int | None) -> dict:
+    """
+    Returns patches which bring the client from version `since` to the current one,
+    or a full snapshot of the document, if the client is too far behind (or has not synced yet).
+    Version of the snapshot is `None`, if the log could not be updated (see `room_sync_lock`).
+    """
+    log = get_room_sync_log(room_name)
+
+    if missing := [section for section in SECTIONS if section not in log['document']]:
+        # document is completed from the room state cache (and the database, on a miss)
+        sections = {section: get_room_section(room_name, section) for section in missing}
+        try:
+            commit_room_sync(room_name, sections)
+        except RoomSyncLockTimeout:
+            # full snapshot without a version, the client keeps receiving full payloads
+            return {'version': None, 'snapshot': {**log['document'], **sections}}
+        log = get_room_sync_log(room_name)
+
+    version = log['version']
+    history = log['history']
+
+    if since == version:
+        return {'base_version': since, 'version': version, 'ops': []}
+
+    # patches can be applied starting from the version preceding the oldest one kept in the history
+    oldest_base_version = history[0][0] - 1 if history else version
+    if since is None or not oldest_base_version <= since < version:
+        return {'version': version, 'snapshot': log['document']}
+
+    operations = [operation for patch_version, patch in history if patch_version > since for operation in patch]
+    return {'base_version': since, 'version': version, 'ops': operations}
+
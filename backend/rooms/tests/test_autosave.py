@@ -0,0 +1,65 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase
+
+from rooms.autosave import RatingFormAutosave, AutosaveCounters
+
+
+@mock.patch('rooms.autosave.async_save_autosaved_user_form', new_callable=mock.AsyncMock)
+class RatingFormAutosaveTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.user = AnonymousUser()
+        self.counters = AutosaveCounters()
+        self.autosave = RatingFormAutosave(
+            room_name='autosave',
+            user=self.user,
+            quiet_period_seconds=0.01,
+            counters=self.counters
+        )
+
+    async def wait_for_quiet_period(self):
+        await asyncio.sleep(0.05)
+
+    async def test_successive_saves_are_coalesced(self, save_user_form: mock.AsyncMock):
+        await self.autosave.submit(beer_id=1, data={'beer_id': 1, 'color': 'amber'})
+        await self.autosave.submit(beer_id=1, data={'beer_id': 1, 'foam': 'white'})
+        await self.autosave.submit(beer_id=1, data={'beer_id': 1, 'note': 7})
+
+        save_user_form.assert_not_awaited()
+
+        await self.wait_for_quiet_period()
+
+        save_user_form.assert_awaited_once_with(
+            room_name='autosave',
+            user=self.user,
+            beer_id='1',
+            data={'beer_id': 1, 'color': 'amber', 'foam': 'white', 'note': 7},
+            submitted_at=mock.ANY
+        )
+        self.assertEqual(self.counters.as_dict(), {'received': 3, 'written': 1, 'absorbed': 2})
+
+    async def test_switching_beer_flushes_previous_one(self, save_user_form: mock.AsyncMock):
+        await self.autosave.submit(beer_id=1, data={'beer_id': 1, 'note': 7})
+        await self.autosave.submit(beer_id=2, data={'beer_id': 2, 'note': 8})
+
+        save_user_form.assert_awaited_once()
+        self.assertEqual(save_user_form.await_args.kwargs['beer_id'], '1')
+        self.assertEqual(list(self.autosave.pending), ['2'])
+
+        await self.wait_for_quiet_period()
+
+        self.assertEqual(save_user_form.await_count, 2)
+
+    async def test_flush_all_on_disconnect(self, save_user_form: mock.AsyncMock):
+        await self.autosave.submit(beer_id=1, data={'beer_id': 1, 'note': 7})
+        await self.autosave.flush_all()
+
+        save_user_form.assert_awaited_once()
+        self.assertEqual(self.autosave.pending, {})
+
+        # timer of flushed save has been cancelled
+        await self.wait_for_quiet_period()
+        save_user_form.assert_awaited_once()
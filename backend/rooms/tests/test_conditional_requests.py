@@ -0,0 +1,51 @@
+from rest_framework import status
+
+from beers.models import Beer
+from core.shared.unit_tests import APITestCase
+from rooms.models import Room, BeerInRoom, UserInRoom
+from users.models import User
+
+
+class RoomsConditionalRequestsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.room = Room.objects.create(name='etag', host=cls.user, slots=4)
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        cls.guest = User.objects.create_user(username='Guest', password='!@#$%')
+
+    def setUp(self):
+        super().setUp()
+        self._require_login_and_auth()
+
+    def assertListModified(self, etag: str) -> str:
+        response = self.client.get('/api/rooms/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_list_not_modified(self):
+        etag = self.client.get('/api/rooms/')['ETag']
+
+        # single aggregate query, memberships and beers are not joined into it
+        with self.assertNumQueries(1) as context:
+            response = self.client.get('/api/rooms/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn('JOIN', context.captured_queries[0]['sql'])
+
+    def test_list_modified_by_memberships_and_beers(self):
+        etag = self.client.get('/api/rooms/')['ETag']
+
+        membership = UserInRoom.objects.create(user=self.guest, room=self.room)
+        etag = self.assertListModified(etag)
+
+        membership.delete()
+        etag = self.assertListModified(etag)
+
+        beer_in_room = BeerInRoom.objects.create(room=self.room, beer=self.beer)
+        etag = self.assertListModified(etag)
+
+        beer_in_room.delete()
+        self.assertListModified(etag)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from rooms.async_db import bump_users_last_active_field
+from rooms.heartbeats import HeartbeatBuffer
+from rooms.models import Room, UserInRoom
+
+User = get_user_model()
+
+
+class HeartbeatBufferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.user = User.objects.create_user(username='Guest', password='!@#$%')
+        cls.room = Room.objects.create(name='beats', host=cls.host, slots=4)
+        cls.room.users.add(cls.user)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.buffer = HeartbeatBuffer(flush_interval_seconds=60)
+        patcher = mock.patch('rooms.async_db.heartbeats', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_last_active(self, user: User, last_active) -> None:
+        UserInRoom.objects.filter(room=self.room, user=user).update(last_active=last_active)
+
+    def test_heartbeats_are_buffered(self):
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                bump_users_last_active_field(self.room.name, self.host)
+                bump_users_last_active_field(self.room.name, self.user)
+
+        self.assertEqual(len(self.buffer), 2)
+
+    def test_flush_writes_heartbeats_in_bulk(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        self.set_last_active(self.host, long_ago)
+        self.set_last_active(self.user, long_ago)
+
+        bump_users_last_active_field(self.room.name, self.host)
+        bump_users_last_active_field(self.room.name, self.user)
+
+        # one query to select rows and one bulk update
+        with self.assertNumQueries(2):
+            self.assertEqual(self.buffer.flush(), 2)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertFalse(UserInRoom.objects.filter(room=self.room, last_active__lte=long_ago).exists())
+
+    def test_flush_when_interval_elapsed(self):
+        self.buffer.flush_interval_seconds = 0
+
+        bump_users_last_active_field(self.room.name, self.host)
+
+        self.assertEqual(len(self.buffer), 0)
@@ -0,0 +1,123 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from rooms.replay import MemoryReplayBuffer, CacheReplayBuffer
+
+
+class ReplayBufferTestsMixin:
+    room_name = 'replay'
+
+    def make_buffer(self, size: int):
+        raise NotImplementedError
+
+    def record(self, buffer, text_data: str) -> int:
+        seq = buffer.next_seq(self.room_name)
+        buffer.store(self.room_name, seq, text_data)
+        return seq
+
+    def test_missed_events_are_returned_in_order(self):
+        buffer = self.make_buffer(size=10)
+        start = buffer.current_seq(self.room_name)
+
+        seqs = [self.record(buffer, f'event {index}') for index in range(3)]
+
+        self.assertEqual(seqs, [start + 1, start + 2, start + 3])
+        self.assertEqual(buffer.get_since(self.room_name, start), ['event 0', 'event 1', 'event 2'])
+        self.assertEqual(buffer.get_since(self.room_name, seqs[1]), ['event 2'])
+        self.assertEqual(buffer.get_since(self.room_name, seqs[2]), [])
+
+    def test_buffer_is_bounded(self):
+        buffer = self.make_buffer(size=3)
+        start = buffer.current_seq(self.room_name)
+
+        seqs = [self.record(buffer, f'event {index}') for index in range(5)]
+
+        # oldest events were dropped, client has to fetch everything again
+        self.assertIsNone(buffer.get_since(self.room_name, start))
+        self.assertEqual(buffer.get_since(self.room_name, seqs[1]), ['event 2', 'event 3', 'event 4'])
+
+    def test_unknown_seq(self):
+        buffer = self.make_buffer(size=3)
+        # counters start from the current time, it is fixed so that counters of rooms do not overlap by chance
+        with mock.patch('rooms.replay.get_initial_seq', return_value=1000):
+            seq = self.record(buffer, 'event')
+
+        with mock.patch('rooms.replay.get_initial_seq', return_value=2000):
+            self.assertIsNone(buffer.get_since(self.room_name, seq + 1))
+            self.assertIsNone(buffer.get_since('other', seq))
+
+    def test_seq_of_previous_counter(self):
+        buffer = self.make_buffer(size=10)
+        with mock.patch('rooms.replay.get_initial_seq', return_value=1000):
+            start = buffer.current_seq(self.room_name)
+            buffer.store(self.room_name, start, 'event of previous counter')
+            self.record(buffer, 'event')
+
+        # `since` was given by another (expired) counter
+        self.assertIsNone(buffer.get_since(self.room_name, start - 1))
+        self.assertEqual(buffer.get_since(self.room_name, start), ['event'])
+
+    def test_rooms_are_separated(self):
+        buffer = self.make_buffer(size=3)
+        start = buffer.current_seq('other')
+
+        seq = self.record(buffer, 'event')
+        self.record(buffer, 'event')
+
+        self.assertEqual(buffer.get_since(self.room_name, seq), ['event'])
+        self.assertEqual(buffer.get_since('other', start), [])
+
+
+class MemoryReplayBufferTests(ReplayBufferTestsMixin, SimpleTestCase):
+
+    def make_buffer(self, size: int) -> MemoryReplayBuffer:
+        return MemoryReplayBuffer(size=size)
+
+    def test_least_recently_used_rooms_are_evicted(self):
+        buffer = MemoryReplayBuffer(size=3, max_rooms=2)
+        seq = self.record(buffer, 'event')
+
+        self.record(buffer, 'event')
+        buffer.current_seq('other')
+        buffer.current_seq('another')
+
+        self.assertEqual(set(buffer._last_seq), {'other', 'another'})
+        self.assertNotIn(self.room_name, buffer._events)
+        # client has to fetch everything again
+        self.assertIsNone(buffer.get_since(self.room_name, seq))
+
+    def test_expired_rooms_are_evicted(self):
+        buffer = MemoryReplayBuffer(size=3, timeout=60)
+        self.record(buffer, 'event')
+
+        with mock.patch('rooms.replay.time.monotonic', return_value=time.monotonic() + 61):
+            buffer.current_seq('other')
+
+        self.assertEqual(set(buffer._last_seq), {'other'})
+        self.assertEqual(set(buffer._events), set())
+
+
+class CacheReplayBufferTests(ReplayBufferTestsMixin, SimpleTestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def make_buffer(self, size: int) -> CacheReplayBuffer:
+        return CacheReplayBuffer(size=size)
+
+    def test_buffer_is_shared(self):
+        start = CacheReplayBuffer().current_seq(self.room_name)
+        self.record(CacheReplayBuffer(), 'event')
+
+        self.assertEqual(CacheReplayBuffer().get_since(self.room_name, start), ['event'])
+
+    def test_current_seq_of_expired_counter(self):
+        with mock.patch.object(cache, 'get', return_value=None):
+            self.assertIsInstance(CacheReplayBuffer().current_seq(self.room_name), int)
+
+        # zero is a valid value of the counter
+        with mock.patch.object(cache, 'get', return_value=0):
+            self.assertEqual(CacheReplayBuffer().current_seq(self.room_name), 0)
@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from beers.models import Beer
+from ratings.models import Rating
+from rooms.consumers import RoomConsumer
+from rooms.models import Room, BeerInRoom, RoomReport
+from rooms.queue.tasks import generate_room_report, generate_room_reports
+
+User = get_user_model()
+
+
+class ReportExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.user = User.objects.create_user(username='Guest', password='!@#$%')
+        cls.room = Room.objects.create(name='export', host=cls.host, slots=2)
+        cls.room.users.add(cls.user)
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        BeerInRoom.objects.create(room=cls.room, beer=cls.beer)
+        Rating.objects.create(added_by=cls.host, room=cls.room, beer=cls.beer, note=8)
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.channel_layer = get_channel_layer()
+        self.channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(
+            RoomConsumer.get_private_group_name(self.room.name, self.host.id), self.channel_name
+        )
+        self.addCleanup(async_to_sync(self.channel_layer.flush))
+
+    def finish_room(self) -> None:
+        with mock.patch('rooms.signals.enqueue_room_reports') as enqueue_room_reports:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.room.state = Room.State.FINISHED
+                self.room.save()
+
+        enqueue_room_reports.assert_called_once_with(self.room)
+
+    def test_reports_are_enqueued_once_room_is_finished(self):
+        self.finish_room()
+
+        with mock.patch('rooms.signals.enqueue_room_reports') as enqueue_room_reports:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.room.save()
+
+        enqueue_room_reports.assert_not_called()
+
+    @mock.patch('rooms.views.rooms.enqueue_room_report', return_value='task-id')
+    def test_export_report(self, enqueue_room_report: mock.Mock):
+        self.finish_room()
+        self.client.force_authenticate(self.host)
+
+        response = self.client.post(f'/api/rooms/{self.room.name}/report/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {'task_id': 'task-id'})
+        enqueue_room_report.assert_called_once_with(self.room, self.host)
+
+    @mock.patch('rooms.views.rooms.enqueue_room_report')
+    def test_export_report_room_not_finished(self, enqueue_room_report: mock.Mock):
+        self.client.force_authenticate(self.host)
+
+        response = self.client.post(f'/api/rooms/{self.room.name}/report/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        enqueue_room_report.assert_not_called()
+
+    def test_generate_room_report_notifies_user(self):
+        self.finish_room()
+
+        report_id = generate_room_report(self.room.id, self.host.id)
+
+        report = RoomReport.objects.get(id=report_id)
+        message = async_to_sync(self.channel_layer.receive)(self.channel_name)
+        self.assertEqual(message, {
+            'type': 'report_ready',
+            'data': {'room': self.room.name, 'checksum': report.checksum, 'size': report.size},
+        })
+
+    def test_generate_room_reports_of_all_participants(self):
+        self.finish_room()
+        generate_room_report(self.room.id, self.host.id)
+
+        report_ids = generate_room_reports(self.room.id)
+
+        self.assertEqual(
+            list(RoomReport.objects.filter(id__in=report_ids).values_list('user__username', flat=True)),
+            ['Guest']
+        )
+        self.assertEqual(RoomReport.objects.filter(room=self.room).count(), 2)
+        self.assertEqual(generate_room_reports(self.room.id), [])
@@ -0,0 +1,142 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from beers.models import Beer
+from ratings.models import Rating
+from rooms.models import Room, BeerInRoom, RoomReport
+from rooms.reports import write_excel_report, generate_excel_report, store_excel_report
+
+User = get_user_model()
+
+
+class ExcelReportTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.room = Room.objects.create(name='report', host=cls.host, slots=2)
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        BeerInRoom.objects.create(room=cls.room, beer=cls.beer)
+        Rating.objects.create(
+            added_by=cls.host, room=cls.room, beer=cls.beer,
+            color='Golden', foam='Thick', smell='Citrus', taste='Bitter', opinion='Good', note=8
+        )
+        cls.room.state = Room.State.FINISHED
+        cls.room.save()
+
+    def read_report(self, content: bytes) -> dict[str, list[tuple]]:
+        wb = load_workbook(BytesIO(content), read_only=True)
+        return {sheet.title: list(sheet.values) for sheet in wb.worksheets}
+
+    def write_report(self) -> bytes:
+        with tempfile.TemporaryFile() as output:
+            size = write_excel_report(self.room.name, self.host, output)
+            output.seek(0)
+            content = output.read()
+
+        self.assertEqual(size, len(content))
+        return content
+
+    def test_write_only_report_content(self):
+        content = self.write_report()
+
+        sheets = self.read_report(content)
+        self.assertEqual(list(sheets), ['Twoje oceny', 'Podsumowanie'])
+        self.assertEqual(sheets['Twoje oceny'][1], (1, 'Golden', 'Thick', 'Citrus', 'Bitter', 'Good', 8))
+        self.assertEqual(sheets['Podsumowanie'][1], (1, 'Atak Chmielu', None, None, '8.00'))
+
+    def test_write_only_report_matches_in_memory_report(self):
+        write_only = self.read_report(self.write_report())
+        in_memory = self.read_report(generate_excel_report(self.room.name, self.host).getvalue())
+        self.assertEqual(write_only, in_memory)
+
+    def test_download_report(self):
+        self.client.force_authenticate(self.host)
+
+        response = self.client.get(f'/api/rooms/{self.room.name}/report/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        self.assertEqual(int(response['Content-Length']), len(content))
+        self.assertIn('Twoje oceny', self.read_report(content))
+
+        report = RoomReport.objects.get(room=self.room, user=self.host)
+        self.assertEqual(response['ETag'], report.etag)
+        self.assertEqual(report.file.name, f'reports/room_{self.room.id}_user_{self.host.id}.xlsx')
+
+    def test_download_report_is_generated_once(self):
+        self.client.force_authenticate(self.host)
+        first = self.client.get(f'/api/rooms/{self.room.name}/report/')
+        b''.join(first.streaming_content)
+
+        # room, membership and stored report lookups only
+        with self.assertNumQueries(3):
+            second = self.client.get(f'/api/rooms/{self.room.name}/report/')
+            content = b''.join(second.streaming_content)
+
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(content, RoomReport.objects.get(room=self.room, user=self.host).file.read())
+
+    def test_download_report_not_modified(self):
+        self.client.force_authenticate(self.host)
+        etag = self.client.get(f'/api/rooms/{self.room.name}/report/')['ETag']
+
+        response = self.client.get(f'/api/rooms/{self.room.name}/report/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_report_is_regenerated_after_rating_change(self):
+        self.client.force_authenticate(self.host)
+        etag = self.client.get(f'/api/rooms/{self.room.name}/report/')['ETag']
+
+        previous_file_name = RoomReport.objects.get(room=self.room, user=self.host).file.name
+
+        rating = Rating.objects.get(room=self.room, added_by=self.host)
+        with self.captureOnCommitCallbacks(execute=True):
+            rating.opinion = 'Even better'
+            rating.save()
+
+        self.assertFalse(RoomReport.objects.filter(room=self.room, user=self.host).exists())
+        self.assertFalse(default_storage.exists(previous_file_name))
+
+        response = self.client.get(f'/api/rooms/{self.room.name}/report/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_previous_file_is_deleted_on_regeneration(self):
+        first = store_excel_report(self.room, self.host)
+        with self.captureOnCommitCallbacks(execute=True):
+            second = store_excel_report(self.room, self.host)
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertFalse(default_storage.exists(first.file.name))
+        self.assertTrue(default_storage.exists(second.file.name))
+
+    def test_ratings_of_running_rooms_do_not_touch_reports(self):
+        room = Room.objects.create(name='running', host=self.host, slots=2)
+
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            rating = Rating.objects.create(added_by=self.host, room=room, beer=self.beer, note=5)
+            rating.delete()
+
+        self.assertFalse([query for query in queries if 'rooms_roomreport' in query['sql']])
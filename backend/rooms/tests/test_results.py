@@ -0,0 +1,145 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from beers.models import Beer
+from ratings.models import Rating
+from rooms.async_db import save_user_form, save_autosaved_user_form, get_final_beers_ratings
+from rooms.models import Room, BeerInRoom, RoomBeerResult, RoomReport
+from rooms.results import summarize_notes_distribution, freeze_room_results
+
+User = get_user_model()
+
+
+class RoomBeerResultTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.user = User.objects.create_user(username='Guest', password='!@#$%')
+        cls.room = Room.objects.create(name='results', host=cls.host, slots=4)
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+        cls.other_beer = Beer.objects.create(name='Grodziskie', percentage=3.1, volume_ml=500)
+        BeerInRoom.objects.create(room=cls.room, beer=cls.beer)
+        BeerInRoom.objects.create(room=cls.room, beer=cls.other_beer)
+
+    def get_result(self, beer: Beer = None) -> RoomBeerResult:
+        return RoomBeerResult.objects.get(room=self.room, beer=beer or self.beer)
+
+    def test_summarize_notes_distribution(self):
+        self.assertEqual(summarize_notes_distribution({'8': 1, '6': 2, '3': 0}), {
+            'notes_count': 3,
+            'notes_sum': 20,
+            'average_note': 20 / 3,
+            'min_note': 6,
+            'max_note': 8,
+            'notes_distribution': {'6': 2, '8': 1},
+        })
+        self.assertEqual(summarize_notes_distribution({})['average_note'], None)
+
+    def test_result_is_updated_on_rating_change(self):
+        rating = Rating.objects.create(added_by=self.host, room=self.room, beer=self.beer, note=6)
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beer, note=9)
+
+        result = self.get_result()
+        self.assertEqual(result.notes_count, 2)
+        self.assertEqual(result.average_note, 7.5)
+        self.assertEqual((result.min_note, result.max_note), (6, 9))
+        self.assertEqual(result.notes_distribution, {'6': 1, '9': 1})
+
+        rating.note = 9
+        rating.save()
+        self.assertEqual(self.get_result().notes_distribution, {'9': 2})
+
+        rating.delete()
+        result = self.get_result()
+        self.assertEqual(result.notes_count, 1)
+        self.assertEqual(result.notes_sum, 9)
+
+    def test_result_is_updated_by_form_save(self):
+        save_user_form(self.room.name, self.user, str(self.beer.id), {'note': '7', 'taste': 'Hoppy'})
+        self.assertEqual(self.get_result().average_note, 7)
+
+        save_user_form(self.room.name, self.user, str(self.beer.id), {'note': 4})
+        self.assertEqual(self.get_result().average_note, 4)
+
+    def test_results_are_frozen_when_room_is_finished(self):
+        rating = Rating.objects.create(added_by=self.host, room=self.room, beer=self.beer, note=6)
+
+        self.room.state = Room.State.FINISHED
+        self.room.save()
+
+        self.assertTrue(self.get_result().is_frozen)
+        self.assertTrue(self.get_result(self.other_beer).is_frozen)
+        self.assertIsNone(self.get_result(self.other_beer).average_note)
+
+        rating.note = 10
+        rating.save()
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beer, note=1)
+        self.assertEqual(self.get_result().average_note, 6)
+
+    def test_late_autosave_is_included_in_frozen_results(self):
+        Rating.objects.create(added_by=self.host, room=self.room, beer=self.beer, note=6)
+        # form of the guest was submitted before the room was finished, but is written afterwards
+        submitted_at = timezone.now()
+        self.room.state = Room.State.FINISHED
+        self.room.save()
+        report = RoomReport.objects.create(room=self.room, user=self.host, checksum='outdated')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_autosaved_user_form(self.room.name, self.user, str(self.beer.id), {'note': 10}, submitted_at)
+
+        result = self.get_result()
+        self.assertTrue(result.is_frozen)
+        self.assertEqual(result.average_note, 8)
+        # final results are part of every report of the room
+        self.assertFalse(RoomReport.objects.filter(pk=report.pk).exists())
+
+        # forms submitted after the room was finished do not change its results
+        save_autosaved_user_form(self.room.name, self.host, str(self.beer.id), {'note': 1}, timezone.now())
+        self.assertEqual(self.get_result().average_note, 8)
+
+    def test_late_form_without_note_change_drops_report_of_user(self):
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beer, note=6, opinion='')
+        submitted_at = timezone.now()
+        self.room.state = Room.State.FINISHED
+        self.room.save()
+        user_report = RoomReport.objects.create(room=self.room, user=self.user, checksum='outdated')
+        host_report = RoomReport.objects.create(room=self.room, user=self.host, checksum='current')
+
+        # queryset update of the rating sends no signals, results stay the same
+        with self.captureOnCommitCallbacks(execute=True):
+            save_autosaved_user_form(
+                self.room.name, self.user, str(self.beer.id), {'note': 6, 'opinion': 'Hoppy'}, submitted_at
+            )
+
+        self.assertEqual(self.get_result().average_note, 6)
+        self.assertFalse(RoomReport.objects.filter(pk=user_report.pk).exists())
+        self.assertTrue(RoomReport.objects.filter(pk=host_report.pk).exists())
+
+    def test_results_of_room_without_beers_are_frozen_once(self):
+        room = Room.objects.create(name='empty', host=self.host, slots=2)
+
+        room.state = Room.State.FINISHED
+        room.save()
+        self.assertIsNotNone(Room.objects.get(pk=room.pk).results_frozen_at)
+
+        self.assertFalse(freeze_room_results(room))
+
+    def test_results_are_removed_with_beer(self):
+        Rating.objects.create(added_by=self.host, room=self.room, beer=self.beer, note=6)
+
+        self.beer.delete()
+
+        self.assertFalse(RoomBeerResult.objects.exists())
+
+    def test_final_beers_ratings_read_precomputed_results(self):
+        Rating.objects.create(added_by=self.host, room=self.room, beer=self.beer, note=6)
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beer, note=7)
+
+        with self.assertNumQueries(1):
+            final_ratings = get_final_beers_ratings(self.room.name)
+
+        self.assertEqual(
+            [(result['beer']['id'], result['average_rating']) for result in final_ratings],
+            [(self.beer.id, '6.50'), (self.other_beer.id, None)]
+        )
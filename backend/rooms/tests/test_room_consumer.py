@@ -1,5 +1,325 @@
-from django.test import TestCase
+from unittest import mock
 
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
-class RoomConsumerTests(TestCase):
-    pass
+from beers.models import Beer
+from core.shared.json_patch import apply_patch
+from ratings.models import Rating
+from rooms.consumers import RoomConsumer
+from rooms.heartbeats import HeartbeatBuffer
+from rooms.models import Room
+from rooms.replay import MemoryReplayBuffer
+from rooms.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+MAX_ROOM_SLOTS = 10
+
+
+class RoomConsumerTestCase(TransactionTestCase):
+    room_name = 'consumer'
+
+    def setUp(self) -> None:
+        cache.clear()
+        # heartbeats are flushed explicitly on disconnect only
+        patcher = mock.patch('rooms.async_db.heartbeats', HeartbeatBuffer(flush_interval_seconds=3600))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('rooms.consumers.room.replay_buffer', MemoryReplayBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.users = [
+            User.objects.create_user(username=f'user{index}', password='!@#$%')
+            for index in range(MAX_ROOM_SLOTS)
+        ]
+        self.room = Room.objects.create(
+            name=self.room_name,
+            host=self.users[0],
+            slots=MAX_ROOM_SLOTS
+        )
+        self.room.users.add(*self.users)
+
+    async def connect(self, user: User, query_string: str = '') -> WebsocketCommunicator:
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns),
+            f'/ws/room/{self.room_name}/{query_string}'
+        )
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def connect_many(self, users: list[User]) -> list[WebsocketCommunicator]:
+        communicators = [await self.connect(user) for user in users]
+        for communicator in communicators:
+            await self.drain(communicator)
+        return communicators
+
+    @staticmethod
+    async def drain(communicator: WebsocketCommunicator) -> list[dict]:
+        received = []
+        while not await communicator.receive_nothing(timeout=0.05):
+            received.append(await communicator.receive_json_from())
+        return received
+
+    @staticmethod
+    async def disconnect_all(communicators: list[WebsocketCommunicator]) -> None:
+        for communicator in communicators:
+            await communicator.disconnect()
+
+
+class RoomConsumerTests(RoomConsumerTestCase):
+
+    async def test_connect_anonymous_user_rejected(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns),
+            f'/ws/room/{self.room_name}/'
+        )
+        communicator.scope['user'] = AnonymousUser()
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+    async def test_connect_receives_session_snapshot(self):
+        beers = await database_sync_to_async(self.add_beers_with_ratings)(self.users[0])
+
+        communicator = await self.connect(self.users[0])
+        received = await self.drain(communicator)
+
+        self.assertEqual([message['command'] for message in received], ['session_snapshot'])
+        snapshot = received[0]['data']
+        self.assertEqual(snapshot['room']['name'], self.room_name)
+        self.assertEqual(len(snapshot['users']), MAX_ROOM_SLOTS)
+        self.assertEqual([beer['id'] for beer in snapshot['beers']], [beer.id for beer in beers])
+        self.assertEqual([rating['beer'] for rating in snapshot['ratings']], [beer.id for beer in beers])
+        self.assertEqual(snapshot['ratings'][0]['note'], 7)
+        await communicator.disconnect()
+
+    async def test_members_receive_presence_delta_on_connect(self):
+        first = await self.connect(self.users[0])
+        await self.drain(first)
+
+        second = await self.connect(self.users[1])
+
+        received = await self.drain(first)
+        self.assertEqual([message['command'] for message in received], ['user_join'])
+        self.assertEqual(received[0]['data'], 'user1')
+        self.assertEqual(received[0]['user']['id'], self.users[1].id)
+
+        await self.disconnect_all([first, second])
+
+    async def test_new_message_is_broadcast_with_sender(self):
+        first, second = await self.connect_many(self.users[:2])
+
+        await first.send_json_to({'command': 'get_new_message', 'data': 'Cheers!'})
+
+        for communicator in (first, second):
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['command'], 'set_new_message')
+            self.assertEqual(response['data'], {'message': 'Cheers!', 'user': 'user0'})
+
+        await self.disconnect_all([first, second])
+
+    async def test_report_ready_is_sent_to_user_only(self):
+        first, second = await self.connect_many(self.users[:2])
+
+        channel_layer = get_channel_layer()
+        await channel_layer.group_send(
+            RoomConsumer.get_private_group_name(self.room_name, self.users[0].id),
+            {'type': 'report_ready', 'data': {'room': self.room_name}}
+        )
+
+        response = await first.receive_json_from()
+        self.assertEqual(response['command'], 'report_ready')
+        self.assertEqual(response['data'], {'room': self.room_name})
+        self.assertTrue(await second.receive_nothing(timeout=0.05))
+
+        # pushes are scoped to the room, user's sockets in other rooms do not receive them
+        await channel_layer.group_send(
+            RoomConsumer.get_private_group_name('other', self.users[0].id),
+            {'type': 'report_ready', 'data': {'room': 'other'}}
+        )
+        self.assertTrue(await first.receive_nothing(timeout=0.05))
+
+        await self.disconnect_all([first, second])
+
+    async def test_private_command_is_handled_inline(self):
+        first, second = await self.connect_many(self.users[:2])
+
+        channel_layer = get_channel_layer()
+        with mock.patch.object(channel_layer, 'group_send', wraps=channel_layer.group_send) as group_send:
+            await first.send_json_to({'command': 'get_user_ratings'})
+            response = await first.receive_json_from()
+
+        self.assertEqual(response['command'], 'set_user_results')
+        group_send.assert_not_called()
+        self.assertTrue(await second.receive_nothing(timeout=0.05))
+
+        await self.disconnect_all([first, second])
+
+    async def test_synced_client_receives_patches(self):
+        synced, legacy = await self.connect_many(self.users[:2])
+
+        await synced.send_json_to({'command': 'sync_room'})
+        response = await synced.receive_json_from()
+        self.assertEqual(response['command'], 'sync_room')
+        document, version = response['data']['snapshot'], response['data']['version']
+
+        await legacy.send_json_to({'command': 'change_room_state', 'data': Room.State.STARTING})
+
+        response = await legacy.receive_json_from()
+        self.assertEqual(response['command'], 'set_room_state')
+
+        response = await synced.receive_json_from()
+        self.assertEqual(response['command'], 'sync_room')
+        self.assertEqual(response['data']['base_version'], version)
+        self.assertIn(
+            {'op': 'replace', 'path': '/room/state', 'value': Room.State.STARTING},
+            response['data']['ops']
+        )
+
+        # nothing has changed, synced client does not receive anything
+        await legacy.send_json_to({'command': 'get_users'})
+        self.assertEqual((await legacy.receive_json_from())['command'], 'set_users')
+        self.assertTrue(await synced.receive_nothing(timeout=0.05))
+
+        # client reconnects with the last version it has acknowledged
+        await synced.disconnect()
+        await self.drain(legacy)
+        await database_sync_to_async(self.room.beers.add)(
+            await database_sync_to_async(Beer.objects.create)(name='Beer', percentage=5, volume_ml=500)
+        )
+        synced = await self.connect(self.users[0])
+        await self.drain(synced)
+
+        await synced.send_json_to({'command': 'sync_room', 'data': version})
+        response = await synced.receive_json_from()
+        document = apply_patch(document, response['data']['ops'])
+        self.assertEqual(document['room']['state'], Room.State.STARTING)
+        self.assertEqual([beer['name'] for beer in document['beers']], ['Beer'])
+
+        await self.disconnect_all([synced, legacy])
+
+    async def test_reconnect_replays_missed_events(self):
+        first, second = await self.connect_many(self.users[:2])
+
+        await first.send_json_to({'command': 'get_new_message', 'data': 'Before'})
+        last_seq = (await second.receive_json_from())['seq']
+        await second.disconnect()
+
+        await first.send_json_to({'command': 'get_new_message', 'data': 'While away'})
+        await first.send_json_to({'command': 'change_room_state', 'data': Room.State.STARTING})
+        await self.drain(first)
+
+        second = await self.connect(self.users[1], query_string=f'?since={last_seq}')
+        received = await self.drain(second)
+
+        self.assertEqual([message['command'] for message in received], ['set_new_message', 'set_room_state'])
+        self.assertEqual(received[0]['data']['message'], 'While away')
+        self.assertEqual([message['seq'] for message in received], [last_seq + 1, last_seq + 2])
+
+        # client is too far behind (or the buffer is gone), full snapshot is sent instead
+        await second.disconnect()
+        second = await self.connect(self.users[1], query_string=f'?since={last_seq - 1000}')
+        received = await self.drain(second)
+        self.assertEqual([message['command'] for message in received], ['session_snapshot'])
+        self.assertEqual(received[0]['seq'], last_seq + 2)
+
+        await self.disconnect_all([first, second])
+
+    def add_beers_with_ratings(self, user: User) -> list[Beer]:
+        beers = [Beer.objects.create(name=f'Beer {index}', percentage=5, volume_ml=500) for index in range(3)]
+        self.room.beers.add(*beers)
+        # user rated beers in a different order than they are served
+        for beer in reversed(beers):
+            Rating.objects.create(added_by=user, room=self.room, beer=beer, note=7)
+        return beers
+
+
+class RoomConsumerBroadcastBenchmark(RoomConsumerTestCase):
+    """
+    Cost of room wide commands must not depend on the number of members of the room.
+    Payload is built, queried and encoded once by the sender and forwarded by the receivers.
+    """
+
+    async def measure_command(self, command: str, members: int) -> tuple[int, int]:
+        communicators = await self.connect_many(self.users[:members])
+
+        # consumers access the database from the main thread (thread sensitive executor)
+        connection = await database_sync_to_async(lambda: connections['default'])()
+        queries = CaptureQueriesContext(connection)
+
+        with mock.patch.object(RoomConsumer, 'encode_json', wraps=RoomConsumer.encode_json) as encode_json:
+            await database_sync_to_async(queries.__enter__)()
+            await communicators[0].send_json_to({'command': command})
+
+            for communicator in communicators:
+                response = await communicator.receive_json_from()
+                self.assertTrue(response['command'].startswith('set_'))
+
+            await database_sync_to_async(queries.__exit__)(None, None, None)
+
+        await self.disconnect_all(communicators)
+        return len(queries), encode_json.call_count
+
+    async def test_broadcast_cost_is_constant(self):
+        for command in ('get_users', 'get_beers', 'get_room_state', 'get_final_ratings'):
+            with self.subTest(command=command):
+                await database_sync_to_async(cache.clear)()
+                queries_single, encodes_single = await self.measure_command(command, members=1)
+
+                await database_sync_to_async(cache.clear)()
+                queries_full, encodes_full = await self.measure_command(command, members=MAX_ROOM_SLOTS)
+
+                self.assertEqual(queries_full, queries_single)
+                self.assertEqual(encodes_full, 1)
+                self.assertEqual(encodes_single, 1)
+
+
+class RoomConsumerWritesTests(RoomConsumerTestCase):
+    """Commands with side effects are executed once, by the consumer of the sender, not by every member."""
+
+    async def count_writes(self, command: dict, members: int) -> list[str]:
+        communicators = await self.connect_many(self.users[:members])
+
+        connection = await database_sync_to_async(lambda: connections['default'])()
+        queries = CaptureQueriesContext(connection)
+
+        await database_sync_to_async(queries.__enter__)()
+        await communicators[0].send_json_to(command)
+
+        for communicator in communicators:
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['command'], 'set_room_state')
+            self.assertEqual(response['data']['state'], command['data'])
+
+        await database_sync_to_async(queries.__exit__)(None, None, None)
+        await self.disconnect_all(communicators)
+
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+
+    async def test_change_room_state_is_written_once(self):
+        command = {'command': 'change_room_state', 'data': Room.State.STARTING}
+
+        writes_single = await self.count_writes(command, members=1)
+
+        await database_sync_to_async(Room.objects.filter(pk=self.room.pk).update)(state=Room.State.WAITING)
+        await database_sync_to_async(cache.clear)()
+        writes_full = await self.count_writes(command, members=MAX_ROOM_SLOTS)
+
+        self.assertEqual(len(writes_full), len(writes_single))
+        self.assertEqual(len([sql for sql in writes_full if sql.startswith('UPDATE "rooms_room"')]), 1)
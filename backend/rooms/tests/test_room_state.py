@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from beers.models import Beer
+from rooms.async_db import get_users_in_room, change_room_state_to
+from rooms.models import Room, BeerInRoom
+from rooms.state import USERS, get_room, get_room_users, get_room_beers, invalidate_room_state, load_room_users
+
+User = get_user_model()
+
+
+class RoomStateEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.user = User.objects.create_user(username='Guest', password='!@#$%')
+        cls.room = Room.objects.create(name='state', host=cls.host, slots=4)
+        cls.beer = Beer.objects.create(name='Atak Chmielu', percentage=6.1, volume_ml=500)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_users_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            users = get_room_users(self.room.name)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_room_users(self.room.name), users)
+
+        self.assertEqual([user['username'] for user in users], ['Host'])
+
+    def test_users_are_refreshed_on_join_and_leave(self):
+        get_room_users(self.room.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.users.add(self.user)
+        usernames = [user['username'] for user in get_room_users(self.room.name)]
+        self.assertCountEqual(usernames, ['Host', 'Guest'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.users.remove(self.user)
+        usernames = [user['username'] for user in get_room_users(self.room.name)]
+        self.assertEqual(usernames, ['Host'])
+
+    def test_beers_are_refreshed_on_change(self):
+        self.assertEqual(get_room_beers(self.room.name), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            beer_in_room = BeerInRoom.objects.create(room=self.room, beer=self.beer)
+        beers = get_room_beers(self.room.name)
+        self.assertEqual([beer['id'] for beer in beers], [self.beer.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beer.name = 'Atak Chmielu 2.0'
+            self.beer.save()
+        self.assertEqual(get_room_beers(self.room.name)[0]['name'], 'Atak Chmielu 2.0')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            beer_in_room.delete()
+        self.assertEqual(get_room_beers(self.room.name), [])
+
+    def test_state_is_invalidated_on_commit(self):
+        get_room_users(self.room.name)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.room.users.add(self.user)
+            # not committed yet, readers keep getting the committed state
+            with self.assertNumQueries(0):
+                self.assertEqual(len(get_room_users(self.room.name)), 1)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(get_room_users(self.room.name)), 2)
+
+    def test_stale_read_is_not_cached_after_invalidation(self):
+        def load_and_write(room_name: str) -> list[dict]:
+            users = load_room_users(room_name)
+            # write is committed and invalidated while the reader is serializing the old data
+            with self.captureOnCommitCallbacks(execute=True):
+                self.room.users.add(self.user)
+            return users
+
+        with mock.patch.dict('rooms.state.LOADERS', {USERS: load_and_write}):
+            self.assertEqual(len(get_room_users(self.room.name)), 1)
+        self.assertEqual(len(get_room_users(self.room.name)), 2)
+
+        invalidate_room_state(self.room.name)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(get_room_users(self.room.name)), 2)
+
+    def test_room_state_is_updated_on_write(self):
+        self.assertEqual(get_room(self.room.name)['state'], Room.State.WAITING)
+
+        change_room_state_to(Room.State.STARTING, self.room.name)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_room(self.room.name)['state'], Room.State.STARTING)
+
+    def test_get_users_in_room_reads_from_memory(self):
+        get_users_in_room(self.room.name)
+
+        with self.assertNumQueries(0):
+            users = get_users_in_room(self.room.name)
+
+        self.assertEqual([user['username'] for user in users], ['Host'])
+
+    def test_not_existing_room(self):
+        self.assertIsNone(get_room('missing'))
+        self.assertEqual(get_room_users('missing'), [])
+        self.assertEqual(get_users_in_room('missing'), [])
@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.shared.json_patch import apply_patch
+from rooms.async_db import get_session_snapshot
+from rooms.models import Room
+from rooms.state import USERS, BEERS, ROOM
+from rooms.sync import (
+    RoomSyncLockTimeout,
+    commit_room_sync,
+    get_room_delta,
+    get_room_sync_cache_key,
+    room_sync_lock
+)
+
+User = get_user_model()
+
+
+class RoomSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.room = Room.objects.create(name='sync', host=cls.host, slots=4)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_snapshot_is_sent_to_client_which_did_not_sync_yet(self):
+        delta = get_room_delta(self.room.name, since=None)
+
+        self.assertEqual(set(delta['snapshot']), {USERS, BEERS, ROOM})
+        self.assertEqual([user['username'] for user in delta['snapshot'][USERS]], ['Host'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_room_delta(self.room.name, since=None), delta)
+
+    def test_versions_and_patches(self):
+        document = get_room_delta(self.room.name, since=None)['snapshot']
+        version = get_room_delta(self.room.name, since=None)['version']
+
+        users = [*document[USERS], {'id': 100, 'username': 'Guest'}]
+        delta = commit_room_sync(self.room.name, {USERS: users})
+        self.assertEqual(delta['base_version'], version)
+        self.assertEqual(delta['version'], version + 1)
+        self.assertEqual(delta['ops'], [{'op': 'add', 'path': '/users/1', 'value': users[1]}])
+
+        # nothing has changed, version stays the same
+        delta = commit_room_sync(self.room.name, {USERS: users})
+        self.assertEqual(delta['version'], version + 1)
+        self.assertEqual(delta['ops'], [])
+
+        commit_room_sync(self.room.name, {ROOM: {**document[ROOM], 'state': Room.State.STARTING}})
+
+        delta = get_room_delta(self.room.name, since=version)
+        self.assertEqual(delta['version'], version + 2)
+        patched = apply_patch(document, delta['ops'])
+        self.assertEqual(patched[USERS], users)
+        self.assertEqual(patched[ROOM]['state'], Room.State.STARTING)
+
+        self.assertEqual(get_room_delta(self.room.name, since=version + 2)['ops'], [])
+
+    @mock.patch('rooms.sync.ROOM_SYNC_HISTORY_SIZE', 2)
+    def test_snapshot_is_sent_when_client_is_too_far_behind(self):
+        version = get_room_delta(self.room.name, since=None)['version']
+
+        for slots in range(5, 9):
+            commit_room_sync(self.room.name, {ROOM: {'slots': slots}})
+
+        self.assertEqual(get_room_delta(self.room.name, since=version)['snapshot'][ROOM], {'slots': 8})
+        self.assertEqual(get_room_delta(self.room.name, since=version + 2)['ops'], [
+            {'op': 'replace', 'path': '/room/slots', 'value': 7},
+            {'op': 'replace', 'path': '/room/slots', 'value': 8},
+        ])
+        # version from the future, e.g. after the log expired
+        self.assertIn('snapshot', get_room_delta(self.room.name, since=version + 100))
+
+    def test_versions_increase_after_log_expires(self):
+        version = get_room_delta(self.room.name, since=None)['version']
+        commit_room_sync(self.room.name, {ROOM: {'slots': 5}})
+
+        cache.clear()
+        self.assertGreater(get_room_delta(self.room.name, since=None)['version'], version + 1)
+
+    @mock.patch('rooms.sync.ROOM_SYNC_LOCK_TIMEOUT_SECONDS', 0)
+    def test_log_is_not_updated_unlocked(self):
+        version = get_room_delta(self.room.name, since=None)['version']
+        lock_key = f'{get_room_sync_cache_key(self.room.name)}:lock'
+        cache.set(lock_key, 1)
+
+        with self.assertRaises(RoomSyncLockTimeout):
+            commit_room_sync(self.room.name, {ROOM: {'slots': 5}})
+
+        self.assertEqual(get_room_delta(self.room.name, since=version)['ops'], [])
+        self.assertEqual(cache.get(lock_key), 1)
+
+    def test_lock_is_released_by_its_holder_only(self):
+        lock_key = f'{get_room_sync_cache_key(self.room.name)}:lock'
+
+        with room_sync_lock(self.room.name):
+            # lock expired and was acquired by someone else meanwhile
+            cache.set(lock_key, 1)
+        self.assertEqual(cache.get(lock_key), 1)
+
+        cache.delete(lock_key)
+        with room_sync_lock(self.room.name):
+            pass
+        self.assertIsNone(cache.get(lock_key))
+
+    @mock.patch('rooms.sync.ROOM_SYNC_LOCK_TIMEOUT_SECONDS', 0)
+    def test_snapshot_without_version_is_sent_while_locked(self):
+        cache.set(f'{get_room_sync_cache_key(self.room.name)}:lock', 1)
+
+        delta = get_room_delta(self.room.name, since=None)
+        self.assertIsNone(delta['version'])
+        self.assertEqual([user['username'] for user in delta['snapshot'][USERS]], ['Host'])
+
+        snapshot = get_session_snapshot(self.room.name, self.host)
+        self.assertIsNone(snapshot['version'])
+        self.assertEqual(snapshot[ROOM], delta['snapshot'][ROOM])
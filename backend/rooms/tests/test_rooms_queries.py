@@ -0,0 +1,118 @@
+from django.contrib.auth import get_user_model
+from rest_framework import status
+
+from beers.models import Beer, Brewery
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+from rooms.models import Room
+
+User = get_user_model()
+
+
+class RoomsQueriesTests(APITestCase):
+    """Number of queries of room endpoints must not depend on the number of rooms, participants or beers."""
+    query_budgets = {
+        # validators, count, page of rooms with counts (subqueries) and host
+        'rooms-list': 3,
+        # validators, room with counts and host, users, beers with their breweries and styles
+        'rooms-detail': 4,
+        'rooms-user-in': 2,
+        # room lookup, beers and their hops
+        'rooms-detail-beers': 3,
+        # validators, count, page of ratings with beers, rooms with counts and hosts
+        'ratings-list': 4,
+        # daily rollups and current rooms with counts
+        'statistics-dashboard': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.brewery = Brewery.objects.create(name='Pinta')
+        cls.users = [User.objects.create_user(username=f'user{index}', password='!@#$%') for index in range(4)]
+        cls.beers = [
+            Beer.objects.create(name=f'Beer {index}', brewery=cls.brewery, percentage=5, volume_ml=500)
+            for index in range(4)
+        ]
+        cls.room = cls.create_room('room', host=cls.user)
+
+    @classmethod
+    def create_room(cls, name: str, host: User) -> Room:
+        room = Room.objects.create(name=name, host=host, slots=10)
+        room.users.add(*cls.users)
+        room.beers.add(*cls.beers)
+        Rating.objects.bulk_create([
+            Rating(added_by=host, beer=beer, room=room, note=5)
+            for beer in cls.beers
+        ])
+        return room
+
+    def setUp(self):
+        super().setUp()
+        self._require_login_and_auth()
+
+    def create_more_rooms(self, count: int) -> None:
+        for index in range(count):
+            host = User.objects.create_user(username=f'host{index}', password='!@#$%')
+            self.create_room(f'more{index}', host=host)
+
+    def test_list_rooms(self):
+        with self.assertQueryBudget('rooms-list'):
+            response = self.client.get('/api/rooms/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        room = response.json()['results'][0]
+        self.assertEqual(room['users_count'], 5)
+        self.assertEqual(room['beers_count'], 4)
+        self.assertEqual(room['ratings_count'], 4)
+        self.assertEqual(room['host']['username'], self.USER_NAME)
+
+        self.create_more_rooms(5)
+
+        with self.assertQueryBudget('rooms-list'):
+            response = self.client.get('/api/rooms/')
+
+        self.assertEqual(response.json()['count'], 6)
+
+    def test_retrieve_room(self):
+        with self.assertQueryBudget('rooms-detail'):
+            response = self.client.get(f'/api/rooms/{self.room.name}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['users']), 5)
+        self.assertEqual(response.json()['beers_count'], 4)
+        self.assertEqual(response.json()['ratings_count'], 4)
+
+    def test_user_in_room(self):
+        with self.assertQueryBudget('rooms-user-in'):
+            response = self.client.get(f'/api/rooms/{self.room.name}/in/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['is_host'])
+
+    def test_list_beers_in_room(self):
+        with self.assertQueryBudget('rooms-detail-beers'):
+            response = self.client.get(f'/api/rooms/{self.room.name}/beers/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 4)
+
+    def test_list_ratings_with_rooms(self):
+        self.create_more_rooms(3)
+
+        with self.assertQueryBudget('ratings-list'):
+            response = self.client.get('/api/ratings/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['room']['users_count'], 5)
+
+    def test_dashboard_current_rooms(self):
+        self.create_more_rooms(3)
+        for room in Room.objects.exclude(pk=self.room.pk):
+            room.users.add(self.user)
+
+        with self.assertQueryBudget('statistics-dashboard'):
+            response = self.client.get('/api/statistics/dashboard/', {'date_from': '2023-01-01', 'date_to': '2023-12-31'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['current_rooms']), 4)
+        self.assertTrue(all(room['beers_count'] == 4 for room in response.json()['current_rooms']))
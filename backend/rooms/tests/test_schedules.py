@@ -0,0 +1,78 @@
+import json
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django_q.models import Schedule
+
+from core.shared.queue import get_function_module_path
+from rooms.heartbeats import INACTIVE_TIMEOUT_SECONDS
+from rooms.models import Room, UserInRoom
+from rooms.queue.schedules import INACTIVE_USERS_SWEEP_SCHEDULE_NAME, sweep_inactive_users_in_rooms
+from rooms.state import get_room_users
+from rooms.sync import get_room_delta
+
+User = get_user_model()
+
+
+class InactiveUsersSweeperTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.host = User.objects.create_user(username='Host', password='!@#$%')
+        cls.user = User.objects.create_user(username='Guest', password='!@#$%')
+        cls.other_host = User.objects.create_user(username='OtherHost', password='!@#$%')
+        cls.room = Room.objects.create(name='sweep', host=cls.host, slots=4)
+        cls.room.users.add(cls.user)
+        cls.other_room = Room.objects.create(name='other', host=cls.other_host, slots=4)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.channel_layer = get_channel_layer()
+        self.channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)('room_sweep', self.channel_name)
+        self.addCleanup(async_to_sync(self.channel_layer.flush))
+
+    def make_inactive(self, user: User) -> None:
+        UserInRoom.objects.filter(user=user).update(
+            last_active=timezone.now() - timedelta(seconds=INACTIVE_TIMEOUT_SECONDS + 1)
+        )
+
+    def test_nothing_to_sweep(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(sweep_inactive_users_in_rooms(), [])
+
+    def test_inactive_users_are_removed_and_room_notified(self):
+        # warm up the room state and the sync log, both have to be refreshed by the sweeper
+        get_room_users(self.room.name)
+        get_room_delta(self.room.name, since=None)
+        self.make_inactive(self.user)
+
+        # affected rooms, one set-based delete, users of the affected room
+        with self.assertNumQueries(3):
+            self.assertEqual(sweep_inactive_users_in_rooms(), ['sweep'])
+
+        self.assertFalse(self.room.users.filter(id=self.user.id).exists())
+        self.assertTrue(self.other_room.users.filter(id=self.other_host.id).exists())
+        self.assertEqual([user['username'] for user in get_room_users(self.room.name)], ['Host'])
+
+        message = async_to_sync(self.channel_layer.receive)(self.channel_name)
+        self.assertEqual(message['type'], 'send_synced')
+
+        content = json.loads(message['text'])
+        self.assertEqual(content['command'], 'set_users')
+        self.assertEqual([user['username'] for user in content['data']], ['Host'])
+
+        # clients which opted in to delta sync receive a patch
+        patch = json.loads(message['patch_text'])
+        self.assertEqual(patch['data']['ops'], [{'op': 'remove', 'path': '/users/1'}])
+
+    def test_sweep_is_scheduled(self):
+        sweep_schedule = Schedule.objects.get(name=INACTIVE_USERS_SWEEP_SCHEDULE_NAME)
+
+        self.assertEqual(sweep_schedule.func, get_function_module_path(sweep_inactive_users_in_rooms))
+        self.assertEqual(sweep_schedule.schedule_type, Schedule.MINUTES)
+        self.assertEqual(sweep_schedule.minutes, 1)
@@ -54,7 +54,7 @@ class BeersInRoomView(GenericAPIView):
             id__in=beers_in_room.values_list('beer_id', flat=True)
         ).order_by(
             'rooms_through__order'
-        )
+        ).prefetch_related('hops')
         return Response(
             self.serializer_list_class(instance=beers, many=True).data,
             status.HTTP_200_OK
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Any
 
-from django.db.models import QuerySet
-from django.http import FileResponse
+from django.db.models import QuerySet, Aggregate, Max, Prefetch, Sum
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets, mixins
@@ -12,12 +13,19 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from sesame.utils import get_token
 
-from core.shared.pagination import page_number_pagination_factory
+from beers.models import Beer
+from core.shared.conditional import ConditionalResponseMixin
+from core.shared.pagination import (
+    page_number_pagination_factory,
+    cursor_pagination_factory,
+    cursor_opt_in_pagination_factory,
+)
 from core.shared.renderers import FileOrJSONRenderer
 from rooms.filters.rooms import RoomsFilterSet
 from rooms.models import Room
 from rooms.permissions import IsHostOrListCreateOnly
-from rooms.reports import generate_excel_report
+from rooms.queue.tasks import enqueue_room_report
+from rooms.reports import get_or_create_excel_report
 from rooms.serializers import (
     RoomSerializer,
     DetailedRoomSerializer,
@@ -25,12 +33,16 @@ from rooms.serializers import (
 )
 from rooms.serializers.room import RoomJoinSerializer, RoomListSerializer
 
-RoomsPagination = page_number_pagination_factory(page_size=100)
+RoomsPagination = cursor_opt_in_pagination_factory(
+    page_number_pagination_factory(page_size=100),
+    cursor_pagination_factory(ordering='id', page_size=100),
+)
 
 EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
 
 class RoomsViewSet(
+    ConditionalResponseMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -39,6 +51,8 @@ class RoomsViewSet(
     """
     GET     /api/rooms/                     - list all rooms
 
+    GET     /api/rooms/?cursor=             - list with cursor pagination, follow `next` links
+
     POST    /api/rooms/                     - create new room
 
     GET     /api/rooms/<str:name>/          - retrieve room
@@ -50,6 +64,8 @@ class RoomsViewSet(
     DELETE  /api/rooms/<str:name>/leave/    - handle current user room leave the room
 
     GET     /api/rooms/<str:name>/report/   - generate excel report with results of a session
+
+    POST    /api/rooms/<str:name>/report/export/ - generate excel report in the background
     """
     permission_classes = [IsAuthenticated, IsHostOrListCreateOnly]
     pagination_class = RoomsPagination
@@ -59,10 +75,36 @@ class RoomsViewSet(
     lookup_field = 'name'
 
     def get_queryset(self) -> QuerySet[Room]:
-        if self.action in ["user_in", "user_join", "user_leave"]:
-            return Room.objects.order_by('id').prefetch_related('users')
+        if self.action in ["user_in", "user_leave"]:
+            return Room.objects.order_by('id').select_related('host')
+
+        if self.action == 'user_join':
+            return Room.objects.order_by('id').prefetch_related('users', 'beers')
 
-        return Room.objects.order_by('id').prefetch_related('users', 'beers')
+        if self.action in ['download_report', 'export_report']:
+            return Room.objects.order_by('id')
+
+        if self.action == 'list':
+            return Room.objects.with_counts().select_related('host').order_by('id')
+
+        return Room.objects.with_counts().select_related('host').order_by('id').prefetch_related(
+            'users',
+            Prefetch('beers', queryset=Beer.objects.select_related('brewery', 'style'))
+        )
+
+    def get_conditional_queryset(self) -> QuerySet[Room]:
+        return super().get_conditional_queryset().with_related_last_modified()
+
+    def get_conditional_aggregates(self) -> dict[str, Aggregate]:
+        # joining or leaving the room, adding or reordering beers do not modify the room itself,
+        # memberships and beers are aggregated per room by subqueries, instead of joining both tables
+        return {
+            **super().get_conditional_aggregates(),
+            'memberships_count': Sum('users_count'),
+            'last_joined_at': Max('users_last_joined_at'),
+            'room_beers_count': Sum('beers_count'),
+            'beers_last_modified': Max('beers_last_updated_at'),
+        }
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -169,36 +211,65 @@ class RoomsViewSet(
         permission_classes=[IsAuthenticated],
         renderer_classes=[FileOrJSONRenderer]
     )
-    def download_report(self, request: Request, *args: Any, **kwargs: Any) -> Response | FileResponse:
+    def download_report(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response | FileResponse | HttpResponseNotModified:
         """GET api/rooms/<str:name>/report/"""
 
         room: Room = self.get_object()
         user = self.request.user
 
-        if not room.users.filter(id=user.id).exists():
-            return Response(
-                {'message': 'User is not part of this room!'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        if error_response := self._validate_report_request(room, user):
+            return error_response
 
-        if room.state != Room.State.FINISHED:
-            return Response(
-                {'message': 'Room is not in FINISHED state! Cannot generate report!'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # results of finished rooms do not change, report is generated once and served from storage
+        report = get_or_create_excel_report(room, user)
 
-        file_buffer = generate_excel_report(room.name, user)
+        if not_modified := get_conditional_response(request, etag=report.etag):
+            return not_modified
 
         today = datetime.today().strftime('%d_%m_%Y')
         file_name = f"beerdegu_degustacja_{today}.xlsx"
 
         response = FileResponse(
-            file_buffer,
+            report.file.open('rb'),
             status=status.HTTP_200_OK,
             content_type=EXCEL_CONTENT_TYPE,
             headers={
                 'Content-Disposition': f'attachment; filename="{file_name}"',
-                'Content-Length': file_buffer.getbuffer().nbytes,
+                'Content-Length': report.size,
+                'ETag': report.etag,
+                'Cache-Control': 'private, no-cache',
             }
         )
         return response
+
+    @action(detail=True, methods=['POST'], url_path='report/export', permission_classes=[IsAuthenticated])
+    def export_report(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """POST api/rooms/<str:name>/report/export/"""
+
+        room: Room = self.get_object()
+        user = self.request.user
+
+        if error_response := self._validate_report_request(room, user):
+            return error_response
+
+        # `report_ready` command is sent to user's websocket, once the report is generated
+        task_id = enqueue_room_report(room, user)
+        return Response({'task_id': task_id}, status=status.HTTP_202_ACCEPTED)
+
+    @staticmethod
+    def _validate_report_request(room: Room, user) -> Response | None:
+        if not room.users.filter(id=user.id).exists():
+            return Response(
+                {'message': 'User is not part of this room!'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if room.state != Room.State.FINISHED:
+            return Response(
+                {'message': 'Room is not in FINISHED state! Cannot generate report!'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return None
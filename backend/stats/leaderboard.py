@@ -0,0 +1,173 @@
+"""
+Global statistics (leaderboard) of all users.
+
+Every section is computed with a single grouped query over ratings of the period,
+results are kept in the cache and refreshed by a django-q schedule (see `stats.queue.schedules`).
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, QuerySet
+from django.utils import timezone
+
+from ratings.models import Rating
+
+GLOBAL_STATISTICS_CACHE_PREFIX = 'stats:global'
+
+# fallback only, cached statistics are overwritten by the scheduled refresh
+GLOBAL_STATISTICS_CACHE_TIMEOUT_SECONDS = 2 * 60 * 60
+
+GLOBAL_STATISTICS_PERIODS = {
+    'week': datetime.timedelta(days=7),
+    'month': datetime.timedelta(days=30),
+    'year': datetime.timedelta(days=365),
+    'all': None,
+}
+
+LEADERBOARD_SIZE = 10
+
+# beers rated only a few times would dominate the top rated beers
+TOP_RATED_BEERS_MIN_RATINGS = 3
+
+
+def get_global_statistics_cache_key(period: str) -> str:
+    return f'{GLOBAL_STATISTICS_CACHE_PREFIX}:{period}'
+
+
+def get_period_ratings(period: str) -> QuerySet[Rating]:
+    ratings = Rating.objects.all()
+
+    if (period_length := GLOBAL_STATISTICS_PERIODS[period]) is not None:
+        ratings = ratings.filter(created_at__gte=timezone.now() - period_length)
+
+    return ratings.order_by()
+
+
+def get_totals(ratings: QuerySet[Rating]) -> dict:
+    return ratings.aggregate(
+        ratings_count=Count('id'),
+        tasters_count=Count('added_by', distinct=True),
+        beers_count=Count('beer', distinct=True),
+        average_rating=Avg('note'),
+    )
+
+
+def get_top_rated_beers(ratings: QuerySet[Rating]) -> list[dict]:
+    return list(
+        ratings.filter(note__isnull=False).values(
+            'beer_id', 'beer__name', 'beer__brewery__name'
+        ).annotate(
+            ratings_count=Count('id'),
+            average_rating=Avg('note'),
+        ).filter(
+            ratings_count__gte=TOP_RATED_BEERS_MIN_RATINGS
+        ).order_by('-average_rating', '-ratings_count', 'beer_id')[:LEADERBOARD_SIZE]
+    )
+
+
+def get_most_active_tasters(ratings: QuerySet[Rating]) -> list[dict]:
+    return list(
+        ratings.filter(added_by__isnull=False).values(
+            'added_by_id', 'added_by__username'
+        ).annotate(
+            ratings_count=Count('id'),
+            beers_count=Count('beer', distinct=True),
+            rooms_count=Count('room', distinct=True),
+        ).order_by('-ratings_count', 'added_by_id')[:LEADERBOARD_SIZE]
+    )
+
+
+def get_busiest_breweries(ratings: QuerySet[Rating]) -> list[dict]:
+    return list(
+        ratings.filter(beer__brewery__isnull=False).values(
+            'beer__brewery_id', 'beer__brewery__name'
+        ).annotate(
+            ratings_count=Count('id'),
+            beers_count=Count('beer', distinct=True),
+            average_rating=Avg('note'),
+        ).order_by('-ratings_count', 'beer__brewery_id')[:LEADERBOARD_SIZE]
+    )
+
+
+def get_busiest_styles(ratings: QuerySet[Rating]) -> list[dict]:
+    return list(
+        ratings.filter(beer__style__isnull=False).values(
+            'beer__style_id', 'beer__style__name'
+        ).annotate(
+            ratings_count=Count('id'),
+            beers_count=Count('beer', distinct=True),
+            average_rating=Avg('note'),
+        ).order_by('-ratings_count', 'beer__style_id')[:LEADERBOARD_SIZE]
+    )
+
+
+def compute_global_statistics(period: str) -> dict:
+    ratings = get_period_ratings(period)
+
+    return {
+        'period': period,
+        'computed_at': timezone.now(),
+        'totals': get_totals(ratings),
+        'top_rated_beers': [
+            {
+                'id': row['beer_id'],
+                'name': row['beer__name'],
+                'brewery': row['beer__brewery__name'],
+                'ratings_count': row['ratings_count'],
+                'average_rating': row['average_rating'],
+            }
+            for row in get_top_rated_beers(ratings)
+        ],
+        'most_active_tasters': [
+            {
+                'id': row['added_by_id'],
+                'username': row['added_by__username'],
+                'ratings_count': row['ratings_count'],
+                'beers_count': row['beers_count'],
+                'rooms_count': row['rooms_count'],
+            }
+            for row in get_most_active_tasters(ratings)
+        ],
+        'busiest_breweries': [
+            {
+                'id': row['beer__brewery_id'],
+                'name': row['beer__brewery__name'],
+                'ratings_count': row['ratings_count'],
+                'beers_count': row['beers_count'],
+                'average_rating': row['average_rating'],
+            }
+            for row in get_busiest_breweries(ratings)
+        ],
+        'busiest_styles': [
+            {
+                'id': row['beer__style_id'],
+                'name': row['beer__style__name'],
+                'ratings_count': row['ratings_count'],
+                'beers_count': row['beers_count'],
+                'average_rating': row['average_rating'],
+            }
+            for row in get_busiest_styles(ratings)
+        ],
+    }
+
+
+def refresh_global_statistics() -> list[str]:
+    """Computes statistics of every period and stores them in the cache. Returns refreshed periods."""
+
+    for period in GLOBAL_STATISTICS_PERIODS:
+        cache.set(
+            get_global_statistics_cache_key(period),
+            compute_global_statistics(period),
+            timeout=GLOBAL_STATISTICS_CACHE_TIMEOUT_SECONDS
+        )
+    return list(GLOBAL_STATISTICS_PERIODS)
+
+
+def get_global_statistics(period: str) -> dict:
+    """Returns cached statistics of the period, computing them if the scheduled refresh has not run yet."""
+
+    key = get_global_statistics_cache_key(period)
+    if (statistics := cache.get(key)) is None:
+        statistics = compute_global_statistics(period)
+        cache.set(key, statistics, timeout=GLOBAL_STATISTICS_CACHE_TIMEOUT_SECONDS)
+    return statistics
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.4 on 2026-10-18 15:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDailyStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('ratings_count', models.PositiveIntegerField(default=0)),
+                ('notes_count', models.PositiveIntegerField(default=0, help_text='Number of ratings with a note')),
+                ('notes_sum', models.PositiveIntegerField(default=0)),
+                ('beer_ids', models.JSONField(blank=True, default=list, help_text='Distinct beers rated in the day')),
+                ('room_ids', models.JSONField(blank=True, default=list, help_text='Distinct rooms in which ratings were added in the day')),
+                ('rooms_hosted_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_statistics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User Daily Statistics',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userdailystatistics',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_user_daily_statistics'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_user_daily_statistics(apps, schema_editor):
+    Rating = apps.get_model('ratings', 'Rating')
+    Room = apps.get_model('rooms', 'Room')
+    UserDailyStatistics = apps.get_model('stats', 'UserDailyStatistics')
+
+    statistics = {}
+
+    def get_day(user_id, date):
+        return statistics.setdefault((user_id, date), {
+            'ratings_count': 0, 'notes_count': 0, 'notes_sum': 0,
+            'beer_ids': set(), 'room_ids': set(), 'rooms_hosted_count': 0,
+        })
+
+    ratings = Rating.objects.filter(
+        added_by__isnull=False
+    ).annotate(
+        date=TruncDate('created_at')
+    ).values_list('added_by_id', 'date', 'beer_id', 'room_id', 'note')
+
+    for user_id, date, beer_id, room_id, note in ratings.iterator():
+        day = get_day(user_id, date)
+        day['ratings_count'] += 1
+        day['beer_ids'].add(beer_id)
+        if room_id is not None:
+            day['room_ids'].add(room_id)
+        if note is not None:
+            day['notes_count'] += 1
+            day['notes_sum'] += note
+
+    rooms_hosted = Room.objects.filter(
+        host__isnull=False
+    ).annotate(
+        date=TruncDate('created_at')
+    ).values('host_id', 'date').annotate(count=Count('id')).order_by()
+
+    for row in rooms_hosted:
+        get_day(row['host_id'], row['date'])['rooms_hosted_count'] = row['count']
+
+    UserDailyStatistics.objects.bulk_create(
+        [
+            UserDailyStatistics(
+                user_id=user_id,
+                date=date,
+                **{**values, 'beer_ids': sorted(values['beer_ids']), 'room_ids': sorted(values['room_ids'])}
+            )
+            for (user_id, date), values in statistics.items()
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0004_rating_added_by_created_idx'),
+        ('rooms', '0006_room_results_frozen_at'),
+        ('stats', '0001_user_daily_statistics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_daily_statistics, migrations.RunPython.noop),
+    ]
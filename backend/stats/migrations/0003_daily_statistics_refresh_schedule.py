@@ -0,0 +1,33 @@
+from django.db import migrations
+
+SCHEDULE_NAME = 'Refresh daily statistics of users'
+
+
+def create_daily_statistics_refresh_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            'func': 'stats.rollups.refresh_daily_statistics',
+            'schedule_type': 'I',  # Schedule.MINUTES
+            'minutes': 5,
+            'repeats': -1,
+        }
+    )
+
+
+def delete_daily_statistics_refresh_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_q', '0017_task_cluster_alter'),
+        ('stats', '0002_backfill_user_daily_statistics'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_daily_statistics_refresh_schedule, delete_daily_statistics_refresh_schedule),
+    ]
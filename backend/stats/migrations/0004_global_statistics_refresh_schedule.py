@@ -0,0 +1,32 @@
+from django.db import migrations
+
+SCHEDULE_NAME = 'Refresh global statistics'
+
+
+def create_global_statistics_refresh_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            'func': 'stats.leaderboard.refresh_global_statistics',
+            'schedule_type': 'H',  # Schedule.HOURLY
+            'repeats': -1,
+        }
+    )
+
+
+def delete_global_statistics_refresh_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_q', '0017_task_cluster_alter'),
+        ('stats', '0003_daily_statistics_refresh_schedule'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_global_statistics_refresh_schedule, delete_global_statistics_refresh_schedule),
+    ]
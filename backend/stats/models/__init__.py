@@ -0,0 +1,2 @@
+from .rollup_watermark import RollupWatermark
+from .user_daily_statistics import UserDailyStatistics
@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class RollupWatermark(models.Model):
+    """Moment up to which rollups were refreshed by an incremental task, see `stats.rollups`."""
+
+    name = models.CharField(max_length=64, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.name} - {self.value}"
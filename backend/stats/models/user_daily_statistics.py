@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import models
+
+
+class UserDailyStatistics(models.Model):
+    """Rollup of ratings and hosted rooms of a user in a single day, see `stats.rollups`."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='daily_statistics',
+        on_delete=models.CASCADE
+    )
+    date = models.DateField()
+    ratings_count = models.PositiveIntegerField(default=0)
+    notes_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of ratings with a note'
+    )
+    notes_sum = models.PositiveIntegerField(default=0)
+    beer_ids = models.JSONField(
+        default=list, blank=True,
+        help_text='Distinct beers rated in the day'
+    )
+    room_ids = models.JSONField(
+        default=list, blank=True,
+        help_text='Distinct rooms in which ratings were added in the day'
+    )
+    rooms_hosted_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'User Daily Statistics'
+        constraints = [
+            models.UniqueConstraint(fields=('user', 'date'), name='unique_user_daily_statistics'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user.username} - {self.date}"
@@ -0,0 +1,33 @@
+from django_q.models import Schedule
+from django_q.tasks import schedule
+
+from core.shared.queue import get_function_module_path
+from stats.leaderboard import refresh_global_statistics
+from stats.rollups import refresh_daily_statistics
+
+DAILY_STATISTICS_REFRESH_MINUTES = 5
+DAILY_STATISTICS_REFRESH_SCHEDULE_NAME = 'Refresh daily statistics of users'
+GLOBAL_STATISTICS_REFRESH_SCHEDULE_NAME = 'Refresh global statistics'
+
+
+def schedule_daily_statistics_refresh(*args, **kwargs) -> Schedule:
+    return schedule(
+        get_function_module_path(refresh_daily_statistics),
+        *args,
+        name=DAILY_STATISTICS_REFRESH_SCHEDULE_NAME,
+        schedule_type=Schedule.MINUTES,
+        minutes=DAILY_STATISTICS_REFRESH_MINUTES,
+        repeats=-1,
+        **kwargs
+    )
+
+
+def schedule_global_statistics_refresh(*args, **kwargs) -> Schedule:
+    return schedule(
+        get_function_module_path(refresh_global_statistics),
+        *args,
+        name=GLOBAL_STATISTICS_REFRESH_SCHEDULE_NAME,
+        schedule_type=Schedule.HOURLY,
+        repeats=-1,
+        **kwargs
+    )
@@ -0,0 +1,180 @@
+"""
+Daily statistics rollups.
+
+`UserDailyStatistics` rows summarize ratings and hosted rooms of a user per day,
+dashboard sums rows of the requested range instead of scanning raw ratings and rooms.
+
+Rows are refreshed incrementally by a django-q task (see `stats.queue.schedules`):
+only days of ratings and rooms modified since the previous run (the watermark kept in the database,
+so that it survives cache eviction) are recomputed. Deleted ratings and rooms are handled right away by signals.
+Without a watermark (first run) all rows are rebuilt.
+"""
+import datetime
+from collections.abc import Iterable
+
+from django.db.models import QuerySet, Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ratings.models import Rating
+from rooms.models import Room
+from stats.models import RollupWatermark, UserDailyStatistics
+from users.models import User
+
+DAILY_STATISTICS_WATERMARK_NAME = 'daily_statistics'
+
+# rows saved in transactions committed while the task was running are picked up by the next run
+DAILY_STATISTICS_WATERMARK_OVERLAP = datetime.timedelta(minutes=1)
+
+DayKey = tuple[int, datetime.date]
+
+ROLLUP_FIELDS = (
+    'ratings_count', 'notes_count', 'notes_sum',
+    'beer_ids', 'room_ids', 'rooms_hosted_count',
+)
+
+
+def get_dirty_days(since: datetime.datetime | None) -> set[DayKey]:
+    """Returns (user id, date) pairs with ratings or hosted rooms modified since the given moment."""
+
+    ratings = Rating.objects.filter(added_by__isnull=False)
+    rooms = Room.objects.filter(host__isnull=False)
+
+    if since is not None:
+        ratings = ratings.filter(updated_at__gte=since)
+        rooms = rooms.filter(updated_at__gte=since)
+
+    dirty_days = set(
+        ratings.annotate(date=TruncDate('created_at')).values_list('added_by_id', 'date').distinct()
+    )
+    dirty_days.update(
+        rooms.annotate(date=TruncDate('created_at')).values_list('host_id', 'date').distinct()
+    )
+    return dirty_days
+
+
+def compute_daily_statistics(days: Iterable[DayKey]) -> dict[DayKey, dict]:
+    """Computes rollup fields of given (user id, date) pairs from raw ratings and rooms."""
+
+    days = set(days)
+    user_ids = {user_id for user_id, _ in days}
+    dates = {date for _, date in days}
+
+    statistics = {
+        day: {
+            'ratings_count': 0, 'notes_count': 0, 'notes_sum': 0,
+            'beer_ids': set(), 'room_ids': set(), 'rooms_hosted_count': 0,
+        }
+        for day in days
+    }
+
+    ratings = Rating.objects.annotate(
+        date=TruncDate('created_at')
+    ).filter(
+        added_by_id__in=user_ids, date__in=dates
+    ).values_list('added_by_id', 'date', 'beer_id', 'room_id', 'note')
+
+    for user_id, date, beer_id, room_id, note in ratings:
+        if (day := statistics.get((user_id, date))) is None:
+            continue
+
+        day['ratings_count'] += 1
+        day['beer_ids'].add(beer_id)
+        if room_id is not None:
+            day['room_ids'].add(room_id)
+        if note is not None:
+            day['notes_count'] += 1
+            day['notes_sum'] += note
+
+    rooms_hosted = Room.objects.annotate(
+        date=TruncDate('created_at')
+    ).filter(
+        host_id__in=user_ids, date__in=dates
+    ).values('host_id', 'date').annotate(count=Count('id')).order_by()
+
+    for row in rooms_hosted:
+        if (day := statistics.get((row['host_id'], row['date']))) is not None:
+            day['rooms_hosted_count'] = row['count']
+
+    for day in statistics.values():
+        day['beer_ids'] = sorted(day['beer_ids'])
+        day['room_ids'] = sorted(day['room_ids'])
+
+    return statistics
+
+
+def refresh_daily_statistics_for_days(days: Iterable[DayKey]) -> int:
+    """Recomputes rollups of given days, removing empty ones. Returns number of saved rows."""
+
+    statistics = compute_daily_statistics(days)
+    if not statistics:
+        return 0
+
+    rows = []
+    for (user_id, date), values in statistics.items():
+        if values['ratings_count'] or values['rooms_hosted_count']:
+            rows.append(UserDailyStatistics(user_id=user_id, date=date, **values))
+        else:
+            UserDailyStatistics.objects.filter(user_id=user_id, date=date).delete()
+
+    UserDailyStatistics.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=[*ROLLUP_FIELDS, 'updated_at'],
+    )
+    return len(rows)
+
+
+def get_day_key(user_id: int | None, created_at: datetime.datetime) -> DayKey | None:
+    if user_id is None:
+        return None
+    # same day as the one computed by `TruncDate` in the current timezone
+    return user_id, timezone.localdate(created_at)
+
+
+def refresh_daily_statistics() -> int:
+    """Incrementally refreshes rollups of days modified since the previous run. Returns number of saved rows."""
+
+    started_at = timezone.now()
+    watermark = RollupWatermark.objects.filter(
+        name=DAILY_STATISTICS_WATERMARK_NAME
+    ).values_list('value', flat=True).first()
+
+    saved = refresh_daily_statistics_for_days(get_dirty_days(since=watermark))
+
+    RollupWatermark.objects.update_or_create(
+        name=DAILY_STATISTICS_WATERMARK_NAME,
+        defaults={'value': started_at - DAILY_STATISTICS_WATERMARK_OVERLAP}
+    )
+    return saved
+
+
+def get_daily_statistics_for_users(
+    users: QuerySet[User],
+    date_from: datetime.date,
+    date_to: datetime.date
+) -> dict:
+    """Sums rollups of users in the given range of days (inclusive)."""
+
+    rollups = UserDailyStatistics.objects.filter(
+        user__in=users,
+        date__range=(date_from, date_to)
+    ).values_list(*ROLLUP_FIELDS)
+
+    notes_count = notes_sum = rooms_hosted_count = 0
+    beer_ids, room_ids = set(), set()
+    for _, day_notes_count, day_notes_sum, day_beer_ids, day_room_ids, day_rooms_hosted_count in rollups:
+        notes_count += day_notes_count
+        notes_sum += day_notes_sum
+        beer_ids.update(day_beer_ids)
+        room_ids.update(day_room_ids)
+        rooms_hosted_count += day_rooms_hosted_count
+
+    return {
+        'consumed_beers_count': len(beer_ids),
+        'average_rating': notes_sum / notes_count if notes_count else None,
+        'rooms_joined_count': len(room_ids),
+        'rooms_created_count': rooms_hosted_count,
+    }
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from stats.leaderboard import GLOBAL_STATISTICS_PERIODS
+
+
+class GlobalStatisticsQueryParamsSerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=list(GLOBAL_STATISTICS_PERIODS), default='month')
+
+
+class GlobalStatisticsTotalsSerializer(serializers.Serializer):
+    ratings_count = serializers.IntegerField()
+    tasters_count = serializers.IntegerField()
+    beers_count = serializers.IntegerField()
+    average_rating = serializers.FloatField(allow_null=True)
+
+
+class TopRatedBeerSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    brewery = serializers.CharField(allow_null=True)
+    ratings_count = serializers.IntegerField()
+    average_rating = serializers.FloatField()
+
+
+class ActiveTasterSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    username = serializers.CharField()
+    ratings_count = serializers.IntegerField()
+    beers_count = serializers.IntegerField()
+    rooms_count = serializers.IntegerField()
+
+
+class BusiestGroupSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    ratings_count = serializers.IntegerField()
+    beers_count = serializers.IntegerField()
+    average_rating = serializers.FloatField(allow_null=True)
+
+
+class GlobalStatisticsSerializer(serializers.Serializer):
+    # solely for the purpose of documentation
+    period = serializers.CharField()
+    computed_at = serializers.DateTimeField()
+    totals = GlobalStatisticsTotalsSerializer()
+    top_rated_beers = TopRatedBeerSerializer(many=True)
+    most_active_tasters = ActiveTasterSerializer(many=True)
+    busiest_breweries = BusiestGroupSerializer(many=True)
+    busiest_styles = BusiestGroupSerializer(many=True)
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import pre_delete, post_delete
+from django.dispatch import receiver
+
+from ratings.models import Rating
+from rooms.models import Room
+from stats.rollups import get_day_key, refresh_daily_statistics_for_days
+
+
+@receiver(post_delete, sender=Rating)
+def refresh_daily_statistics_on_rating_delete(sender, instance: Rating, **kwargs):
+    # deleted rows are not visible to the incremental refresh task
+    if day := get_day_key(instance.added_by_id, instance.created_at):
+        transaction.on_commit(lambda: refresh_daily_statistics_for_days([day]))
+
+
+@receiver(pre_delete, sender=Room)
+def refresh_daily_statistics_on_room_delete(sender, instance: Room, **kwargs):
+    # ratings lose their room before `post_delete`, affected days are collected beforehand
+    days = {
+        get_day_key(user_id, created_at)
+        for user_id, created_at in instance.ratings.filter(
+            added_by__isnull=False
+        ).values_list('added_by_id', 'created_at')
+    }
+    if day := get_day_key(instance.host_id, instance.created_at):
+        days.add(day)
+
+    if days:
+        transaction.on_commit(lambda: refresh_daily_statistics_for_days(days))
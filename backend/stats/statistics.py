@@ -0,0 +1,34 @@
+"""
+Statistics engine of the dashboard.
+
+Figures are summed from daily rollups (see `stats.rollups`) instead of scanning raw ratings and rooms,
+current rooms are listed in a single query with annotated counts (`RoomQuerySet.with_counts`).
+"""
+import datetime
+
+from django.db.models import QuerySet
+
+from rooms.models import Room
+from rooms.serializers.room import RoomListSerializer
+from stats.rollups import get_daily_statistics_for_users
+from users.models import User
+
+
+def get_current_rooms(users: QuerySet[User]) -> list[dict]:
+    rooms = Room.objects.filter(
+        id__in=Room.users.through.objects.filter(user__in=users).values('room_id')
+    ).select_related('host').with_counts().order_by('id')
+    return RoomListSerializer(rooms, many=True).data
+
+
+def get_statistics_for_users(
+    users: QuerySet[User],
+    date_from: datetime.date,
+    date_to: datetime.date
+) -> dict:
+    # todo: highest/lowest rating and recently consumed beers are not computed,
+    #  until frontend is ready to display them
+    return {
+        **get_daily_statistics_for_users(users, date_from, date_to),
+        'current_rooms': get_current_rooms(users),
+    }
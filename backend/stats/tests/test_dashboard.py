@@ -0,0 +1,83 @@
+import datetime
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from beers.models import Beer
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+from rooms.models import Room
+from stats.rollups import refresh_daily_statistics
+from users.models import User
+
+
+class DashboardStatisticsAPIViewTests(APITestCase):
+    url = reverse('statistics-dashboard')
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_user = User.objects.create_user(username='Other', password='!@#$%')
+        cls.room = Room.objects.create(name='dash', host=cls.user, slots=4)
+        cls.other_room = Room.objects.create(name='other', host=cls.other_user, slots=4)
+        cls.other_room.users.add(cls.user)
+
+        beers = Beer.objects.bulk_create([
+            Beer(name=f'Beer {index}', percentage=5, volume_ml=500)
+            for index in range(3)
+        ])
+        Rating.objects.bulk_create([
+            Rating(added_by=cls.user, room=cls.room, beer=beers[0], note=6),
+            Rating(added_by=cls.user, room=cls.other_room, beer=beers[0], note=8),
+            Rating(added_by=cls.user, room=None, beer=beers[1], note=10),
+            Rating(added_by=cls.other_user, room=cls.other_room, beer=beers[2], note=1),
+        ])
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        refresh_daily_statistics()
+
+    def get_params(self) -> dict:
+        today = timezone.now().date()
+        return {
+            'date_from': today - datetime.timedelta(days=1),
+            'date_to': today + datetime.timedelta(days=1),
+        }
+
+    def test_dashboard_statistics(self):
+        self._require_login_and_auth()
+
+        response = self.client.get(self.url, self.get_params())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['consumed_beers_count'], 2)
+        self.assertEqual(response.data['average_rating'], 8)
+        self.assertEqual(response.data['rooms_joined_count'], 2)
+        self.assertEqual(response.data['rooms_created_count'], 1)
+        self.assertEqual(
+            [(room['name'], room['users_count'], room['host']['username']) for room in response.data['current_rooms']],
+            [('dash', 1, 'Test'), ('other', 2, 'Other')]
+        )
+
+    def test_dashboard_statistics_empty_range(self):
+        self._require_login_and_auth()
+
+        response = self.client.get(self.url, {'date_from': '2000-01-01', 'date_to': '2000-01-02'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['consumed_beers_count'], 0)
+        self.assertIsNone(response.data['average_rating'])
+        self.assertEqual(response.data['rooms_created_count'], 0)
+
+    def test_dashboard_statistics_query_budget(self):
+        self._require_login_and_auth()
+        Room.objects.create(name='more', host=self.other_user, slots=4).users.add(self.user)
+
+        # daily rollups, current rooms
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, self.get_params())
+
+        self.assertEqual(len(response.data['current_rooms']), 3)
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.urls import reverse
+from django_q.models import Schedule
+from rest_framework import status
+
+from beers.models import Beer, Brewery
+from core.shared.queue import get_function_module_path
+from core.shared.unit_tests import APITestCase
+from ratings.models import Rating
+from stats.leaderboard import refresh_global_statistics, GLOBAL_STATISTICS_PERIODS
+from stats.queue.schedules import GLOBAL_STATISTICS_REFRESH_SCHEDULE_NAME
+from users.models import User
+
+
+class GlobalStatisticsAPIViewTests(APITestCase):
+    url = reverse('statistics-global')
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        tasters = [cls.user] + [
+            User.objects.create_user(username=f'Taster{index}', password='!@#$%')
+            for index in range(3)
+        ]
+        brewery = Brewery.objects.create(name='Pinta')
+        cls.best_beer = Beer.objects.create(name='Atak Chmielu', brewery=brewery, percentage=6, volume_ml=500)
+        cls.other_beer = Beer.objects.create(name='Grodziskie', percentage=3, volume_ml=500)
+
+        Rating.objects.bulk_create([
+            *[Rating(added_by=taster, beer=cls.best_beer, note=9) for taster in tasters],
+            *[Rating(added_by=taster, beer=cls.other_beer, note=5) for taster in tasters[:3]],
+            Rating(added_by=cls.user, beer=cls.other_beer, note=None),
+        ])
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_global_statistics(self):
+        self._require_login_and_auth()
+
+        response = self.client.get(self.url, {'period': 'week'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['period'], 'week')
+        self.assertEqual(response.data['totals'], {
+            'ratings_count': 8,
+            'tasters_count': 4,
+            'beers_count': 2,
+            'average_rating': 51 / 7,
+        })
+        self.assertEqual(
+            [(beer['name'], beer['ratings_count'], beer['average_rating']) for beer in response.data['top_rated_beers']],
+            [('Atak Chmielu', 4, 9), ('Grodziskie', 3, 5)]
+        )
+        self.assertEqual(
+            [(taster['username'], taster['ratings_count']) for taster in response.data['most_active_tasters']],
+            [('Test', 3), ('Taster0', 2), ('Taster1', 2), ('Taster2', 1)]
+        )
+        self.assertEqual(
+            [(brewery['name'], brewery['ratings_count']) for brewery in response.data['busiest_breweries']],
+            [('Pinta', 4)]
+        )
+        self.assertEqual(response.data['busiest_styles'], [])
+
+    def test_global_statistics_invalid_period(self):
+        self._require_login_and_auth()
+
+        response = self.client.get(self.url, {'period': 'decade'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_global_statistics_are_served_from_cache(self):
+        self._require_login_and_auth()
+
+        # totals and four leaderboards per period, independent of the number of users
+        with self.assertNumQueries(5 * len(GLOBAL_STATISTICS_PERIODS)):
+            refresh_global_statistics()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['period'], 'month')
+
+    def test_refresh_is_scheduled(self):
+        refresh_schedule = Schedule.objects.get(name=GLOBAL_STATISTICS_REFRESH_SCHEDULE_NAME)
+
+        self.assertEqual(refresh_schedule.func, get_function_module_path(refresh_global_statistics))
+        self.assertEqual(refresh_schedule.schedule_type, Schedule.HOURLY)
@@ -0,0 +1,135 @@
+import datetime
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django_q.models import Schedule
+
+from beers.models import Beer
+from core.shared.queue import get_function_module_path
+from ratings.models import Rating
+from rooms.async_db import save_user_form
+from rooms.models import Room
+from stats.models import RollupWatermark, UserDailyStatistics
+from stats.queue.schedules import DAILY_STATISTICS_REFRESH_MINUTES, DAILY_STATISTICS_REFRESH_SCHEDULE_NAME
+from stats.rollups import (
+    DAILY_STATISTICS_WATERMARK_NAME,
+    refresh_daily_statistics,
+    get_daily_statistics_for_users
+)
+from users.models import User
+
+
+class DailyStatisticsRollupsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username='Taster', password='!@#$%')
+        cls.room = Room.objects.create(name='rollup', host=cls.user, slots=4)
+        cls.beers = Beer.objects.bulk_create([
+            Beer(name=f'Beer {index}', percentage=5, volume_ml=500)
+            for index in range(3)
+        ])
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def get_statistics(self) -> dict:
+        return get_daily_statistics_for_users(
+            User.objects.filter(id=self.user.id),
+            date_from=self.today - datetime.timedelta(days=7),
+            date_to=self.today
+        )
+
+    def test_rollups_are_built(self):
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beers[0], note=6)
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beers[0], note=8)
+        Rating.objects.create(added_by=self.user, beer=self.beers[1])
+
+        self.assertEqual(refresh_daily_statistics(), 1)
+
+        rollup = UserDailyStatistics.objects.get(user=self.user, date=self.today)
+        self.assertEqual(rollup.ratings_count, 3)
+        self.assertEqual((rollup.notes_count, rollup.notes_sum), (2, 14))
+        self.assertEqual(rollup.beer_ids, [self.beers[0].id, self.beers[1].id])
+        self.assertEqual(rollup.room_ids, [self.room.id])
+        self.assertEqual(rollup.rooms_hosted_count, 1)
+
+        self.assertEqual(self.get_statistics(), {
+            'consumed_beers_count': 2,
+            'average_rating': 7,
+            'rooms_joined_count': 1,
+            'rooms_created_count': 1,
+        })
+
+    def test_distinct_beers_across_days(self):
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        old_rating = Rating.objects.create(added_by=self.user, beer=self.beers[0], note=4)
+        Rating.objects.filter(id=old_rating.id).update(created_at=yesterday)
+        Rating.objects.create(added_by=self.user, beer=self.beers[0], note=6)
+
+        refresh_daily_statistics()
+
+        self.assertEqual(UserDailyStatistics.objects.filter(user=self.user).count(), 2)
+        statistics = self.get_statistics()
+        self.assertEqual(statistics['consumed_beers_count'], 1)
+        self.assertEqual(statistics['average_rating'], 5)
+
+    def test_refresh_is_incremental(self):
+        refresh_daily_statistics()
+        # skip the overlap with the previous run
+        RollupWatermark.objects.filter(name=DAILY_STATISTICS_WATERMARK_NAME).update(value=timezone.now())
+
+        # nothing was modified since the previous run
+        with mock.patch('stats.rollups.compute_daily_statistics', return_value={}) as compute:
+            refresh_daily_statistics()
+        compute.assert_called_once_with(set())
+
+        save_user_form(self.room.name, self.user, str(self.beers[2].id), {'note': 9})
+        save_user_form(self.room.name, self.user, str(self.beers[2].id), {'note': 3})
+        refresh_daily_statistics()
+
+        self.assertEqual(self.get_statistics()['average_rating'], 3)
+
+    def test_watermark_survives_cache_clear(self):
+        refresh_daily_statistics()
+        RollupWatermark.objects.filter(name=DAILY_STATISTICS_WATERMARK_NAME).update(value=timezone.now())
+        cache.clear()
+
+        with mock.patch('stats.rollups.compute_daily_statistics', return_value={}) as compute:
+            refresh_daily_statistics()
+        compute.assert_called_once_with(set())
+
+    def test_rollups_are_refreshed_on_delete(self):
+        rating = Rating.objects.create(added_by=self.user, room=self.room, beer=self.beers[0], note=6)
+        refresh_daily_statistics()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rating.delete()
+        self.assertEqual(self.get_statistics()['consumed_beers_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+        self.assertFalse(UserDailyStatistics.objects.exists())
+
+    def test_rollups_are_backfilled_by_migration(self):
+        Rating.objects.create(added_by=self.user, room=self.room, beer=self.beers[0], note=6)
+        Rating.objects.create(added_by=self.user, beer=self.beers[1], note=8)
+        refresh_daily_statistics()
+        expected_statistics = self.get_statistics()
+        UserDailyStatistics.objects.all().delete()
+
+        migration = import_module('stats.migrations.0002_backfill_user_daily_statistics')
+        migration.backfill_user_daily_statistics(apps, None)
+
+        self.assertEqual(self.get_statistics(), expected_statistics)
+
+    def test_refresh_is_scheduled(self):
+        refresh_schedule = Schedule.objects.get(name=DAILY_STATISTICS_REFRESH_SCHEDULE_NAME)
+
+        self.assertEqual(refresh_schedule.func, get_function_module_path(refresh_daily_statistics))
+        self.assertEqual(refresh_schedule.schedule_type, Schedule.MINUTES)
+        self.assertEqual(refresh_schedule.minutes, DAILY_STATISTICS_REFRESH_MINUTES)
@@ -1,7 +1,9 @@
 from django.urls import path
 
-from .views import DashboardStatisticsAPIView
+from .views import DashboardStatisticsAPIView, GlobalStatisticsAPIView, CacheMetricsAPIView
 
 urlpatterns = [
     path('statistics/dashboard/', DashboardStatisticsAPIView.as_view(), name='statistics-dashboard'),
+    path('statistics/global/', GlobalStatisticsAPIView.as_view(), name='statistics-global'),
+    path('statistics/cache/', CacheMetricsAPIView.as_view(), name='statistics-cache'),
 ]
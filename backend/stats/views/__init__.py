@@ -1 +1,3 @@
 from .dashboard import DashboardStatisticsAPIView
+from .global_statistics import GlobalStatisticsAPIView
+from .cache import CacheMetricsAPIView
@@ -0,0 +1,26 @@
+from typing import Any
+
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from beers.cache import CATALOGUE_CACHE_NAMESPACE
+from core.shared.cache import get_cache_metrics
+from rooms.autosave import rating_autosave_counters
+
+
+class CacheMetricsAPIView(APIView):
+    """
+    GET     /api/statistics/cache       - returns hit/miss counters of response caches
+                                          and rating form autosave counters of the serving process
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        metrics = {
+            CATALOGUE_CACHE_NAMESPACE: get_cache_metrics(CATALOGUE_CACHE_NAMESPACE),
+            'rating_autosave': rating_autosave_counters.as_dict(),
+        }
+        return Response(metrics, status=status.HTTP_200_OK)
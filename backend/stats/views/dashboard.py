@@ -1,7 +1,6 @@
 import datetime
 from typing import Any
 
-from django.db.models import QuerySet, Avg
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -9,13 +8,8 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from beers.models import Beer
-from beers.serializers import SimplifiedBeerSerializer
-from ratings.models import Rating
-from ratings.serializers.rating import RatingWithSimplifiedBeerSerializer
-from rooms.models import Room
-from rooms.serializers.room import RoomListSerializer
 from stats.serializers.dashboard import StatisticsQueryParamsSerializer, DashboardStatisticsSerializer
+from stats.statistics import get_statistics_for_users
 from users.models import User
 
 
@@ -53,60 +47,3 @@ class DashboardStatisticsAPIView(APIView):
         )
         return Response(statistics, status=status.HTTP_200_OK)
 
-
-def get_statistics_for_users(
-    users: QuerySet[User],
-    date_from: datetime.date,
-    date_to: datetime.date
-) -> dict:
-    consumed_beers = Beer.objects.filter(
-        ratings__added_by__in=users,
-        ratings__created_at__range=(date_from, date_to)
-    ).order_by('-ratings__note').select_related('brewery', 'style').distinct()
-    consumed_beers_count = consumed_beers.count()
-
-    ratings = Rating.objects.filter(
-        added_by__in=users,
-        created_at__range=(date_from, date_to)
-    ).order_by('-note')
-
-    average_rating = ratings.aggregate(Avg('note'))['note__avg']
-    highest_rating = ratings.first()
-    lowest_rating = ratings.last()
-
-    rooms_joined = Room.objects.filter(
-        ratings__added_by__in=users,
-        ratings__created_at__range=(date_from, date_to)
-    ).distinct()
-    rooms_joined_count = rooms_joined.count()
-
-    rooms_created = Room.objects.filter(
-        host__in=users,
-        created_at__range=(date_from, date_to)
-    ).distinct()
-    rooms_created_count = rooms_created.count()
-
-    if highest_rating:
-        highest_rating = RatingWithSimplifiedBeerSerializer(highest_rating).data
-
-    if lowest_rating:
-        lowest_rating = RatingWithSimplifiedBeerSerializer(lowest_rating).data
-
-    recently_consumed_beers = consumed_beers[:5]
-    recently_consumed_beers = SimplifiedBeerSerializer(recently_consumed_beers, many=True).data
-
-    rooms_with_users = Room.objects.filter(users__in=users)
-    current_rooms = RoomListSerializer(rooms_with_users, many=True).data
-
-    aggregated_data = {
-        'consumed_beers_count': consumed_beers_count,
-        'average_rating': average_rating,
-        'rooms_joined_count': rooms_joined_count,
-        'rooms_created_count': rooms_created_count,
-        'current_rooms': current_rooms,
-        # todo: uncomment when frontend is ready to display this data
-        # 'highest_rating': highest_rating,
-        # 'lowest_rating': lowest_rating,
-        # 'recently_consumed_beers': recently_consumed_beers
-    }
-    return aggregated_data
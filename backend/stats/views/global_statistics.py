@@ -0,0 +1,36 @@
+from typing import Any
+
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from stats.leaderboard import get_global_statistics
+from stats.serializers.global_statistics import GlobalStatisticsQueryParamsSerializer, GlobalStatisticsSerializer
+
+
+class GlobalStatisticsAPIView(APIView):
+    """
+    GET     /api/statistics/global      - returns leaderboards of all users
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[GlobalStatisticsQueryParamsSerializer],
+        responses=GlobalStatisticsSerializer
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Collects top rated beers, most active tasters, busiest breweries and styles.
+        Statistics are served from the cache, which is refreshed on schedule.
+
+        Query parameters:
+            - `period`    - one of: week, month (default), year, all
+        """
+        serializer = GlobalStatisticsQueryParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        statistics = get_global_statistics(serializer.validated_data['period'])
+        return Response(statistics, status=status.HTTP_200_OK)
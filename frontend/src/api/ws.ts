@@ -49,9 +49,19 @@ export interface UserRatingsObject {
   note: number
 }
 
+export interface SessionSnapshotObject {
+  room: any,
+  users: UserObject[],
+  beers: BeerObject[],
+  ratings: any[],
+  version: number,
+}
+
 export interface WebsocketMessage {
-  data: any | UserObject[],
+  data: any | UserObject[] | SessionSnapshotObject,
   extra?: any,
+  user?: UserObject,
+  seq?: number,
   command: CommandType,
 }
 
@@ -59,7 +69,8 @@ export type CommandType =
   'set_new_message' | 'set_users' |
   'set_beers' | 'set_form_data' |
   'set_room_state' | 'set_final_results' |
-  'set_user_results'
+  'set_user_results' | 'session_snapshot' |
+  'user_join'
   ;
 
 export interface ChatMessageObject {
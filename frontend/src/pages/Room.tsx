@@ -9,6 +9,7 @@ import {
   BeerObject,
   ChatMessageObject,
   RatingsObject,
+  SessionSnapshotObject,
   UserObject,
   WebsocketConnectionState,
   WebsocketMessage
@@ -43,6 +44,8 @@ type Action =
   | { type: 'set_room_state', payload: RoomStateType }
   | { type: 'set_final_results', payload: RatingsObject[] }
   | { type: 'set_user_results', payload: any[] }
+  | { type: 'session_snapshot', payload: SessionSnapshotObject }
+  | { type: 'user_join', payload: UserObject | null }
   | { type: string, payload: any } // handles any other case which will not affect state
 
 const initialState: State = {
@@ -86,6 +89,22 @@ const roomReducer = (state = initialState, action: Action): State => {
         ...state,
         userResults: [...action.payload]
       };
+    case "session_snapshot":
+      // everything is sent to the joining socket at once, instead of set_users, set_room_state etc.
+      return {
+        ...state,
+        users: [...action.payload.users],
+        beers: [...action.payload.beers],
+        roomState: action.payload.room?.state ?? state.roomState,
+        userResults: [...action.payload.ratings],
+      };
+    case "user_join":
+      // others are notified with the joining user only
+      if (!action.payload) return state;
+      return {
+        ...state,
+        users: [...state.users.filter((user) => user.id !== action.payload.id), action.payload]
+      };
     default:
       return state;
   }
@@ -134,7 +153,8 @@ const Room: FC = () => {
       const parsed: WebsocketMessage = JSON.parse(event.data);
       dispatch({
         type: parsed.command,
-        payload: parsed.data
+        // user_join carries username in data and the whole user object next to it
+        payload: parsed.command === 'user_join' ? parsed.user ?? null : parsed.data
       });
     },
     reconnectAttempts: TRY_RECONNECT_TIMES,